@@ -0,0 +1,165 @@
+"""
+Lag of the event loop while many words are looked up at once in a slow dictionary API.
+A local stub of the Merriam-Webster API, run in a process of its own, answers every
+lookup after `--delay` seconds, with the suggestions it returns for unknown words.
+Every lookup is of a word not looked up before, as in games. A probe sleeping for 10ms
+in a loop measures how late the loop wakes it up.
+
+The `blocking` mode sends the requests of the pooled async client with a synchronous
+client, as the words were looked up before, to show the stall it caused. The persisted
+tier of the word cache is bypassed, so the benchmark needs no database.
+
+Usage, from the `backend` directory:
+    python -m benchmarks.event_loop_lag --lookups 500 --concurrency 100 --delay 0.1
+"""
+
+import os
+import socket
+
+if __name__ == '__main__':
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        STUB_PORT = free_socket.getsockname()[1]
+    # Set before the config is loaded
+    os.environ.pop('DICTIONARY_INDEX_PATH', None)
+    os.environ.update(
+        DICTIONARY_API_URL=f'http://127.0.0.1:{STUB_PORT}/{{word}}?key={{api_key}}',
+        DICTIONARY_HEDGE_DELAY='10',  # Not to double the lookups of the slow stub
+    )
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import multiprocessing  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # noqa: E402
+from typing import Any  # noqa: E402
+
+import httpx  # noqa: E402
+
+import src.schemas.domain as d  # noqa: E402
+from src.game.utils import check_word_correctness  # noqa: E402
+from src.game.word_cache import word_cache  # noqa: E402
+
+PROBE_INTERVAL = 0.01  # seconds
+
+
+def serve_stub(port: int, delay: float) -> None:
+    """Answer every lookup as Merriam-Webster does for unknown words, after a delay."""
+    body = json.dumps(['suggestion']).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive
+
+        def do_GET(self) -> None:  # noqa: N802
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, message_format: str, *args: Any) -> None:
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 1024  # Not to refuse the connections opened at once
+
+    Server(('127.0.0.1', port), Handler).serve_forever()
+
+
+async def probe_lag(lags: list[float], stopped: asyncio.Event) -> None:
+    while not stopped.is_set():
+        started_on = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started_on - PROBE_INTERVAL)
+
+
+def use_blocking_client() -> None:
+    """Send the requests with a synchronous client, blocking the loop meanwhile."""
+    client = httpx.Client()
+
+    async def send(
+        self: httpx.AsyncClient, request: httpx.Request, **kwargs: Any
+    ) -> httpx.Response:
+        return client.send(request)
+
+    httpx.AsyncClient.send = send  # type: ignore[method-assign]
+
+
+async def run_lookups(args: argparse.Namespace, mode: str) -> None:
+    if mode == 'blocking':
+        use_blocking_client()
+    slots = asyncio.Semaphore(args.concurrency)
+    results = dict(looked_up=0, failed=0)
+    lags: list[float] = []
+    stopped = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(lags, stopped))
+
+    async def look_up(word: str) -> None:
+        async with slots:
+            try:
+                await check_word_correctness(word)
+            except Exception:
+                results['failed'] += 1
+            else:
+                results['looked_up'] += 1
+
+    started_on = time.perf_counter()
+    await asyncio.gather(*(look_up(f'{mode}{idx}') for idx in range(args.lookups)))
+    elapsed = time.perf_counter() - started_on
+    stopped.set()
+    await probe
+
+    lags.sort()
+    print(
+        f'{mode:>8}: lag {statistics.median(lags) * 1e3:7.1f}ms p50, '
+        f'{lags[int(len(lags) * 0.99)] * 1e3:7.1f}ms p99, '
+        f'{lags[-1] * 1e3:7.1f}ms max, '
+        f'{results["looked_up"] / elapsed:7.1f} lookups/s '
+        f'({results["looked_up"]} looked up, {results["failed"]} failed '
+        f'in {elapsed:.2f}s)'
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    async def get_persisted(word: str) -> None:
+        return None
+
+    async def persist(fetched_on: Any, word: d.Word) -> None:
+        pass
+
+    word_cache._get_persisted = get_persisted  # type: ignore[method-assign]
+    word_cache._persist = persist  # type: ignore[method-assign]
+    for mode in args.modes:
+        await run_lookups(args, mode)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.event_loop_lag')
+    parser.add_argument('--lookups', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--delay', type=float, default=0.1, help='seconds per lookup')
+    parser.add_argument(
+        '--modes',
+        nargs='+',
+        choices=['async', 'blocking'],
+        default=['async', 'blocking'],
+    )
+    args = parser.parse_args()
+
+    stub = multiprocessing.Process(
+        target=serve_stub, args=(STUB_PORT, args.delay), daemon=True
+    )
+    stub.start()
+    try:
+        time.sleep(0.5)  # Let the stub bind its port
+        asyncio.run(run(args))
+    finally:
+        stub.terminate()
+
+
+if __name__ == '__main__':
+    main()
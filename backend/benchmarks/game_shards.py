@@ -0,0 +1,155 @@
+"""
+Games finished per second, with the games run in the current process and on a pool of
+worker processes. Bots answer every turn right away with a word missing from a local
+word index, so the benchmark measures the game engine, encoding of the game states and
+the IPC of the workers, not the players or the dictionary API.
+
+Usage, from the `backend` directory:
+    python -m benchmarks.game_shards --games 2000 --concurrency 1000 --workers 2 4
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+if __name__ == '__main__':  # Not in the worker processes, they inherit the environment
+    # Set before the config is loaded
+    os.environ.update(
+        GAME_START_DELAY='0',
+        TURN_START_DELAY='0',
+        DICTIONARY_INDEX_PATH=str(Path(tempfile.mkdtemp()) / 'dictionary.bin'),
+    )
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import time  # noqa: E402
+from typing import Awaitable, Callable  # noqa: E402
+from uuid import UUID, uuid4  # noqa: E402
+
+import src.schemas.domain as d  # noqa: E402
+import src.schemas.validation as v  # noqa: E402
+from src.game.dictionary import Dictionary  # noqa: E402
+from src.game.game import LocalGames, create_game  # noqa: E402
+from src.game.shards import ShardPool  # noqa: E402
+
+Submit = Callable[[UUID, v.WordInput], Awaitable[None]]
+
+
+class _BotOutput:
+    """Plays the game for its players, counting what it emitted."""
+
+    def __init__(
+        self,
+        game_id: int,
+        players: list[d.GameParticipant],
+        submit: Submit,
+        slots: asyncio.Semaphore,
+        results: dict[str, int],
+    ) -> None:
+        self.game_id = game_id
+        self.player_ids = {player.name: player.id_ for player in players}
+        self.submit = submit
+        self.slots = slots
+        self.results = results
+        self._turn_order: list[UUID] = []
+
+    async def send_state(self, frame: str) -> None:
+        self.results['states'] += 1
+        state = json.loads(frame)['payload']
+        if state['state'] == d.GameStateEnum.STARTED:
+            self._turn_order = [
+                self.player_ids[player['name']] for player in state['players']
+            ]
+        elif state['state'] == d.GameStateEnum.STARTED_TURN:
+            player_id = self._turn_order[state['current_turn']['player_idx']]
+            word_input = v.WordInput(
+                input_type='word_input', game_id=self.game_id, word='missing'
+            )
+            await self.submit(player_id, word_input)
+
+    async def send_events(self, events: list[d.GameEvent]) -> None:
+        pass
+
+    async def finish(self, turn_rows: list[dict]) -> None:
+        self.results['finished'] += 1
+        self.results['turns'] += len(turn_rows)
+        self.slots.release()
+
+    async def fail(self, reason: str) -> None:
+        self.results['failed'] += 1
+        self.slots.release()
+
+
+async def run_games(args: argparse.Namespace, workers: int) -> None:
+    rules = d.DeathmatchRules(
+        round_time=10, start_score=args.turns, penalty=-1, reward=1
+    )
+    local_games, shards = LocalGames(), ShardPool(workers) if workers else None
+    if shards is not None:
+        shards.start()
+        await asyncio.sleep(args.warmup)  # Let the workers spawn
+
+    async def submit(player_id: UUID, word_input: v.WordInput) -> None:
+        if shards is None:
+            await local_games.submit_input(player_id, word_input)
+        else:
+            shards.submit_input(player_id, word_input)
+
+    slots = asyncio.Semaphore(args.concurrency)
+    results = dict(finished=0, failed=0, turns=0, states=0)
+    started_on = time.perf_counter()
+    for game_id in range(args.games):
+        await slots.acquire()
+        players = [
+            d.GameParticipant(id_=uuid4(), name=str(player_idx))
+            for player_idx in range(args.players)
+        ]
+        output = _BotOutput(game_id, players, submit, slots, results)
+        if shards is None:
+            local_games.start(create_game(game_id, game_id, rules, players), output)
+        else:
+            shards.start_game(game_id, game_id, rules, players, output)
+    for _ in range(args.concurrency):  # Wait for the games still running
+        await slots.acquire()
+    elapsed = time.perf_counter() - started_on
+
+    if shards is not None:
+        await shards.stop()
+    mode = f'{workers} workers' if workers else 'single process'
+    print(
+        f'{mode:>16}: {results["finished"] / elapsed:8.1f} games/s, '
+        f'{results["turns"] / elapsed:9.1f} turns/s, '
+        f'{results["states"] / elapsed:9.1f} states/s '
+        f'({results["finished"]} finished, {results["failed"]} failed '
+        f'in {elapsed:.2f}s)'
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    await run_games(args, workers=0)
+    for workers in args.workers:
+        await run_games(args, workers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.game_shards')
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=1000)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--turns', type=int, default=5, help='Mistakes to lose')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4])
+    parser.add_argument('--warmup', type=float, default=3, help='seconds')
+    args = parser.parse_args()
+
+    index_path = Path(os.environ['DICTIONARY_INDEX_PATH'])
+    Dictionary.build(['word'], index_path)
+    try:
+        asyncio.run(run(args))
+    finally:
+        index_path.unlink()
+        index_path.parent.rmdir()
+
+
+if __name__ == '__main__':
+    main()
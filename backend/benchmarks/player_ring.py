@@ -0,0 +1,104 @@
+"""
+Cost of iterating to the next player and eliminating players, with the players still
+in the game linked into a ring and with the list scan the ring replaced. Every round
+eliminates a random share of the players until one is left, so the late rounds iterate
+over a list of mostly eliminated players, as long games with many players do.
+
+Usage, from the `backend` directory:
+    python -m benchmarks.player_ring --players 10 100 1000 --games 20
+"""
+
+import argparse
+import random
+import time
+from uuid import uuid4
+
+import src.schemas.domain as d
+from src.game.deathmatch import OrderedPlayers
+
+
+class _ListPlayers(list):
+    """Players as they were iterated before the ring, scanning the list."""
+
+    def __init__(self, players: list[d.GamePlayer]) -> None:
+        super().__init__(players)
+        random.shuffle(self)
+        self.current_idx = 0
+        self.current_place = len(self)
+
+    @property
+    def current(self) -> d.GamePlayer:
+        return self[self.current_idx]
+
+    def next(self) -> None:
+        start_idx = self.current_idx
+        while True:
+            self.current_idx = (self.current_idx + 1) % len(self)
+            if self.current_idx == start_idx:
+                raise ValueError('All but one player are out of the game')
+            if self.current.in_game:
+                break
+            if all(not player.in_game for player in self):
+                raise ValueError('All players are out of the game')
+
+    def remove_current(self) -> None:
+        self.current.in_game = False
+        self.current.place = self.current_place
+        self.current_place -= 1
+
+
+def play(
+    players: OrderedPlayers | _ListPlayers,
+    size: int,
+    rng: random.Random,
+    elimination: float,
+) -> int:
+    """Play the turns until one player is left, returns the number of turns."""
+    turns, players_in_game = 0, size
+    while players_in_game > 1:
+        if rng.random() < elimination:
+            players.remove_current()
+            players_in_game -= 1
+        players.next()
+        turns += 1
+    return turns
+
+
+def run(args: argparse.Namespace) -> None:
+    for size in args.players:
+        players_classes: list[tuple[str, type[OrderedPlayers | _ListPlayers]]] = [
+            ('ring', OrderedPlayers),
+            ('list', _ListPlayers),
+        ]
+        for label, players_cls in players_classes:
+            rng = random.Random(args.seed)
+            turns, elapsed = 0, 0.0
+            for _ in range(args.games):
+                players = players_cls(
+                    [
+                        d.GamePlayer(id_=uuid4(), name=str(idx), score=0)
+                        for idx in range(size)
+                    ]
+                )
+                started_on = time.perf_counter()
+                turns += play(players, size, rng, args.elimination)
+                elapsed += time.perf_counter() - started_on
+            print(
+                f'{size:>6} players, {label}: {elapsed / turns * 1e6:8.2f}us per turn '
+                f'({turns} turns in {elapsed:.2f}s)'
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.player_ring')
+    parser.add_argument('--players', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument(
+        '--elimination', type=float, default=0.1, help='Chance of a turn to eliminate'
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Accuracy of the turn timers with many games running at once. Every game waits for a
+word that never comes, so each of its turns ends with the timeout, and measures how
+late the timeout fired. The timers are run on the timing wheel, as the games run them,
+and on the event loop with `asyncio.wait_for`, as they were run before.
+
+Usage, from the `backend` directory:
+    python -m benchmarks.timer_accuracy --games 10000 --duration 20 --tick 0.01
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from config import get_config
+from src.game.scheduler import TimingWheel
+
+
+async def play_turns(
+    wait_for: TimingWheel | None,
+    rng: random.Random,
+    args: argparse.Namespace,
+    stopped_on: float,
+    lateness: list[float],
+) -> None:
+    """Time out turns until the run ends, recording how late each timeout was."""
+    await asyncio.sleep(rng.uniform(0, args.max_turn))  # Not to start all at once
+    loop = asyncio.get_running_loop()
+    while time.monotonic() < stopped_on:
+        timeout = rng.uniform(args.min_turn, args.max_turn)
+        word_input = loop.create_future()  # Never submitted
+        started_on = time.monotonic()
+        try:
+            if wait_for is None:
+                await asyncio.wait_for(word_input, timeout)
+            else:
+                await wait_for.wait_for(word_input, timeout)
+        except asyncio.TimeoutError:
+            lateness.append(time.monotonic() - started_on - timeout)
+
+
+async def run_timers(args: argparse.Namespace, mode: str) -> None:
+    wheel = TimingWheel(args.tick) if mode == 'wheel' else None
+    rng = random.Random(args.seed)
+    lateness: list[float] = []
+    stopped_on = time.monotonic() + args.duration
+
+    started_on, cpu_started_on = time.monotonic(), time.process_time()
+    await asyncio.gather(
+        *(play_turns(wheel, rng, args, stopped_on, lateness) for _ in range(args.games))
+    )
+    cpu_time = time.process_time() - cpu_started_on
+    elapsed = time.monotonic() - started_on
+    if wheel is not None:
+        await wheel.stop()
+
+    lateness.sort()
+    deviation = get_config().MAX_TURN_TIME_DEVIATION
+    too_late = sum(late > deviation for late in lateness)
+    print(
+        f'{mode:>8}: {len(lateness)} timeouts, late by '
+        f'{statistics.median(lateness) * 1e3:6.1f}ms p50, '
+        f'{lateness[int(len(lateness) * 0.99)] * 1e3:6.1f}ms p99, '
+        f'{lateness[-1] * 1e3:6.1f}ms max, {too_late} over {deviation}s, '
+        f'{cpu_time / elapsed:5.1%} CPU'
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    for mode in args.modes:
+        await run_timers(args, mode)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.timer_accuracy')
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--duration', type=float, default=20, help='seconds')
+    parser.add_argument('--min-turn', type=float, default=1, help='seconds')
+    parser.add_argument('--max-turn', type=float, default=5, help='seconds')
+    parser.add_argument(
+        '--tick', type=float, default=get_config().SCHEDULER_TICK, help='seconds'
+    )
+    parser.add_argument(
+        '--modes', nargs='+', choices=['wheel', 'asyncio'], default=['wheel', 'asyncio']
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
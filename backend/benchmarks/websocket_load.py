@@ -0,0 +1,195 @@
+"""
+Many idle websockets on a running server, with a few of them chatting in the lobby.
+Every chat message is broadcast to all the connected players, so the run measures the
+fan-out of the frames, the inbound handling of the messages and their write-behind to
+the database, while the connections share a small database pool.
+
+Start the server with a small pool first, e.g.
+    DB_POOL_SIZE=5 DB_MAX_OVERFLOW=0 uvicorn word_chain_game:app --port 8000
+
+Usage, from the `backend` directory:
+    python -m benchmarks.websocket_load --url http://localhost:8000 --sockets 10000
+
+The server logs its pool waits and timeouts, outgoing queue depths and message writer
+stats every `RUNTIME_STATS_INTERVAL`, they're the other half of the results.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import string
+import time
+from dataclasses import dataclass, field
+
+import httpx
+import websockets
+
+
+@dataclass
+class LoadStats:
+    created: int = 0
+    connected: int = 0
+    failed: int = 0  # Players not created, or websockets not accepted
+    disconnected: int = 0  # Closed by the server while the load ran
+    frames: int = 0
+    connect_times: list[float] = field(default_factory=list)  # seconds
+    chat_latencies: list[float] = field(default_factory=list)  # seconds
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def create_player(
+    client: httpx.AsyncClient, name: str, stats: LoadStats
+) -> str | None:
+    try:
+        response = await client.post('/api/players', json={'name': name})
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f'Player {name} could not be created: {e!r}')
+        stats.failed += 1
+        return None
+    stats.created += 1
+    return response.json()['id']
+
+
+async def hold_socket(
+    ws_url: str,
+    player_id: str,
+    name: str,
+    slots: asyncio.Semaphore,
+    sockets: list[tuple[str, websockets.WebSocketClientProtocol]],
+    stats: LoadStats,
+) -> None:
+    """Connect the player and read the frames until the socket is closed."""
+    async with slots:
+        started_on = time.perf_counter()
+        try:
+            websocket = await websockets.connect(
+                ws_url,
+                extra_headers={'Cookie': f'player_id={player_id}'},
+                max_size=None,
+            )
+        except (OSError, websockets.WebSocketException) as e:
+            print(f'Player {name} could not connect: {e!r}')
+            stats.failed += 1
+            return
+        stats.connect_times.append(time.perf_counter() - started_on)
+        stats.connected += 1
+        sockets.append((name, websocket))
+
+    try:
+        async for frame in websocket:
+            stats.frames += 1
+            payload = json.loads(frame)['payload']
+            if payload.get('type_') == 'chat' and payload['player_name'] == name:
+                sent_on = float(payload['content'].split()[-1])
+                stats.chat_latencies.append(time.perf_counter() - sent_on)
+    except websockets.ConnectionClosedError:
+        pass
+    if websocket.close_code != 1000:
+        stats.disconnected += 1
+
+
+async def chat(
+    sockets: list[tuple[str, websockets.WebSocketClientProtocol]],
+    rate: float,
+    duration: float,
+) -> None:
+    """Send `rate` lobby messages per second, from randomly picked players."""
+    stopped_on = time.perf_counter() + duration
+    while time.perf_counter() < stopped_on:
+        name, websocket = random.choice(sockets)
+        message = {
+            'payload': {
+                'type_': 'chat',
+                'content': f'load {time.perf_counter():.6f}',
+                'player_name': name,
+                'room_id': 1,
+            }
+        }
+        try:
+            await websocket.send(json.dumps(message))
+        except websockets.ConnectionClosed:
+            pass
+        await asyncio.sleep(1 / rate)
+
+
+async def run(args: argparse.Namespace) -> None:
+    stats = LoadStats()
+    prefix = ''.join(random.choices(string.ascii_lowercase, k=3))
+    names = [f'{prefix}{idx}' for idx in range(args.sockets)]
+    ws_url = args.url.replace('http', 'ws', 1) + '/api/connect'
+
+    slots = asyncio.Semaphore(args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+
+        async def create(name: str) -> str | None:
+            async with slots:
+                return await create_player(client, name, stats)
+
+        player_ids = await asyncio.gather(*(create(name) for name in names))
+
+    sockets: list[tuple[str, websockets.WebSocketClientProtocol]] = []
+    started_on = time.perf_counter()
+    readers = [
+        asyncio.create_task(hold_socket(ws_url, player_id, name, slots, sockets, stats))
+        for name, player_id in zip(names, player_ids)
+        if player_id is not None
+    ]
+    while stats.connected + stats.failed < len(readers):
+        await asyncio.sleep(0.1)
+    ramp_up = time.perf_counter() - started_on
+
+    frames_before = stats.frames
+    if sockets:
+        await chat(sockets, args.chat_rate, args.duration)
+    await asyncio.sleep(args.drain)  # Let the last broadcasts arrive
+    frames_per_second = (stats.frames - frames_before) / (args.duration + args.drain)
+
+    await asyncio.gather(*(websocket.close() for _, websocket in sockets))
+    await asyncio.gather(*readers)
+
+    print(
+        f'{stats.created} players created, {stats.connected} connected in '
+        f'{ramp_up:.1f}s, {stats.failed} failed, {stats.disconnected} disconnected'
+    )
+    print(
+        f'connect: {percentile(stats.connect_times, 0.5) * 1e3:.0f}ms p50, '
+        f'{percentile(stats.connect_times, 0.99) * 1e3:.0f}ms p99'
+    )
+    if stats.chat_latencies:
+        print(
+            f'chat broadcast: {len(stats.chat_latencies)} messages, '
+            f'{statistics.median(stats.chat_latencies) * 1e3:.0f}ms p50, '
+            f'{percentile(stats.chat_latencies, 0.99) * 1e3:.0f}ms p99, '
+            f'{max(stats.chat_latencies) * 1e3:.0f}ms max'
+        )
+    print(f'frames received: {frames_per_second:.0f}/s')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.websocket_load')
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--sockets', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=200, help='Connects at once')
+    parser.add_argument('--chat-rate', type=float, default=2, help='messages/s')
+    parser.add_argument('--duration', type=float, default=60, help='seconds')
+    parser.add_argument('--drain', type=float, default=5, help='seconds')
+    args = parser.parse_args()
+
+    # A socket takes a file descriptor
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard_limit, hard_limit))
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Hit ratio and lookup cost of the word cache, replaying a stream of words drawn from a
+Zipf distribution, as the words played in games are. Every miss stands for a call to
+the dictionary API. The stream is replayed once more with an empty in-memory tier, as
+after a restart, to show what the persisted tier saves.
+
+The `word_definitions` table is stood in for by a dict, with `--persisted-latency`
+added to its reads and writes, so the benchmark needs no database.
+
+Usage, from the `backend` directory:
+    python -m benchmarks.word_cache --lookups 200000 --vocabulary 50000 --sizes 1000 10000
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from datetime import datetime
+
+import src.schemas.domain as d
+from src.game.word_cache import WordCache
+
+NONWORD_EVERY = 5  # Every fifth word of the vocabulary doesn't exist
+
+
+class _DictBackedCache(WordCache):
+    """Word cache persisting its entries into a dict shared by its instances."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        store: dict[str, tuple[datetime, d.Word]],
+        latency: float,
+    ) -> None:
+        super().__init__(maxsize, ttl=86400, negative_ttl=86400)
+        self.store = store
+        self.latency = latency
+
+    async def _get_persisted(self, word: str) -> tuple[datetime, d.Word] | None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.store.get(word)
+
+    async def _persist(self, fetched_on: datetime, word: d.Word) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.store[word.content] = (fetched_on, word)
+
+
+def zipf_stream(args: argparse.Namespace) -> list[str]:
+    rng = random.Random(args.seed)
+    weights = [1 / rank**args.exponent for rank in range(1, args.vocabulary + 1)]
+    cum_weights = list(itertools.accumulate(weights))
+    ranks = rng.choices(range(args.vocabulary), cum_weights=cum_weights, k=args.lookups)
+    return [f'word{rank}' for rank in ranks]
+
+
+async def replay(cache: WordCache, stream: list[str]) -> float:
+    """Look the words up, putting the missed ones in, returns the elapsed seconds."""
+    started_on = time.perf_counter()
+    for word in stream:
+        if await cache.get(word) is None:
+            # Dictionary API call
+            is_correct = int(word[4:]) % NONWORD_EVERY != NONWORD_EVERY - 1
+            cache.put(d.Word(content=word, is_correct=is_correct))
+            await asyncio.sleep(0)  # Let the write start, before the next lookup
+    await asyncio.gather(*cache._pending_writes)
+    return time.perf_counter() - started_on
+
+
+def report(label: str, cache: WordCache, elapsed: float, lookups: int) -> None:
+    stats = cache.stats
+    print(
+        f'{label:>22}: {stats.hit_ratio:6.1%} hits ({stats.hits} in memory, '
+        f'{stats.persisted_hits} persisted), {stats.misses} API calls, '
+        f'{stats.evictions} evictions, {lookups / elapsed:9.0f} lookups/s'
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    stream = zipf_stream(args)
+    print(
+        f'{args.lookups} lookups of {len(set(stream))} distinct words '
+        f'(vocabulary of {args.vocabulary}, exponent {args.exponent})'
+    )
+    for size in args.sizes:
+        store: dict[str, tuple[datetime, d.Word]] = {}
+        cache = _DictBackedCache(size, store, args.persisted_latency)
+        report(f'size {size}', cache, await replay(cache, stream), len(stream))
+
+        restarted = _DictBackedCache(size, store, args.persisted_latency)
+        elapsed = await replay(restarted, stream)
+        report(f'size {size}, restarted', restarted, elapsed, len(stream))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.word_cache')
+    parser.add_argument('--lookups', type=int, default=200000)
+    parser.add_argument('--vocabulary', type=int, default=50000)
+    parser.add_argument('--exponent', type=float, default=1.0, help='of the Zipf law')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument(
+        '--persisted-latency', type=float, default=0, help='seconds per query'
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -20,13 +20,78 @@ class Config(BaseSettings):
 
     DICTIONARY_API_KEY: str
     DICTIONARY_API_URL: str = 'https://www.dictionaryapi.com/api/v3/references/collegiate/json/{word}?key={api_key}'
+    DICTIONARY_API_CONNECT_TIMEOUT: float = 1  # seconds
+    DICTIONARY_API_READ_TIMEOUT: float = 3  # seconds
+    DICTIONARY_API_MAX_CONNECTIONS: int = 100
+    DICTIONARY_API_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    DICTIONARY_API_KEEPALIVE_EXPIRY: float = 30  # seconds
+    # Fallback API following https://dictionaryapi.dev format, e.g.
+    # 'https://api.dictionaryapi.dev/api/v2/entries/en/{word}'
+    DICTIONARY_SECONDARY_API_URL: str | None = None
+    DICTIONARY_HEDGE_DELAY: float = 0.5  # seconds, Fire another attempt after that
+    DICTIONARY_MAX_ATTEMPTS: int = 2  # per provider
+    DICTIONARY_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive failures
+    DICTIONARY_BREAKER_RESET_TIMEOUT: float = 30  # seconds
+    MIN_WORD_VALIDATION_TIME: float = 1  # seconds, Lower bound of the lookup deadline
+    # Turn outcome if no dictionary provider could verify the word before the deadline
+    WORD_UNVERIFIED_POLICY: Literal['accept', 'reject'] = 'accept'
+    # Local word index built with `python -m src.commands build-dictionary`. If set,
+    # word correctness is decided locally and the API is used only for definitions.
+    DICTIONARY_INDEX_PATH: Path | None = None
+
+    WORD_CACHE_SIZE: int = 10000  # words kept in the in-memory LRU
+    WORD_CACHE_TTL: int = 2592000  # seconds, 30 days
+    WORD_CACHE_NEGATIVE_TTL: int = 86400  # seconds, TTL for non-existing words
+    CACHE_SIZE: int = 1024  # results kept by the memoization cache of the endpoints
+    CACHE_TTL: int = 60  # seconds, default TTL of the memoized results
 
     GAME_START_DELAY: int = 1  # seconds, Delay game start to prime the players
     TURN_START_DELAY: int = 1  # seconds, Delay each turn start to prime the players
     MAX_TURN_TIME_DEVIATION: float = 0.1  # seconds
+    SCHEDULER_TICK: float = 0.01  # seconds, Resolution of the game timers
+    GAME_WORKERS: int = 0  # Worker processes hosting games, 0 runs them in-process
 
     ROOM_DELETION_INTERVAL: int = 60  # seconds
     ROOM_DELETION_DELAY: int = 180  # seconds
+    RUNTIME_STATS_INTERVAL: int = 60  # seconds, Logging of the pool, queue, cache stats
+
+    # Wrap outgoing websocket messages into an extra JSON string, for clients that
+    # still decode them twice
+    WEBSOCKET_DOUBLE_ENCODING: bool = False
+    WEBSOCKET_QUEUE_SIZE: int = 256  # outgoing frames buffered per connection
+    WEBSOCKET_SEND_TIMEOUT: int = 10  # seconds, Clients stuck longer are disconnected
+    WEBSOCKET_MAX_FRAME_SIZE: int = 4096  # characters, Larger frames are rejected
+    LOBBY_PUBLISH_TICK: float = 0.1  # seconds, Lobby updates merged over it, 0 disables
+    STATE_LOG_SIZE: int = 64  # Latest lobby and room deltas kept for client resyncs
+
+    # Token buckets per player, action class: (tokens per second, bucket capacity)
+    RATE_LIMITS: dict[str, tuple[float, int]] = {
+        'chat': (1, 5),
+        'game_input': (5, 10),
+        'lobby': (2, 5),
+        'room': (2, 10),
+    }
+
+    # Channel shared by all the nodes (workers, containers) serving the game. 'local' is
+    # enough for a single node, 'postgres' uses LISTEN/NOTIFY of the main database
+    BACKPLANE: Literal['local', 'postgres'] = 'local'
+    BACKPLANE_CHANNEL: str = 'word_chain_game'
+
+    # Chat and system messages are broadcast right away and written in batches, once
+    # the batch is full or the interval passes
+    MESSAGE_BATCH_SIZE: int = 100
+    MESSAGE_FLUSH_INTERVAL: float = 0.5  # seconds
+    MESSAGE_QUEUE_SIZE: int = 50000  # Oldest messages are spilled to the file past it
+    MESSAGE_RETRY_MAX_DELAY: float = 30  # seconds, Cap of the backoff of failed writes
+    # Messages the database couldn't take, written once it's back or after a restart
+    MESSAGE_SPILL_PATH: Path = Path('data/message_spill.jsonl')
+    ID_BLOCK_SIZE: int = 100  # room, game and message IDs reserved at once, per node
+
+    # Connections of the database pool, per node. Websockets don't hold any, sessions
+    # live for a single request or a single websocket message
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10  # connections opened beyond the pool's size on bursts
+    DB_POOL_TIMEOUT: int = 10  # seconds, waiting for a connection before failing
 
     ENVIRONMENT: Literal['development', 'production'] = 'production'
     ROOT_ID: UUID
@@ -12,7 +12,7 @@ from fastapi import (
     WebSocketDisconnect,
     status,
 )
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.schemas.database as db
@@ -24,27 +24,32 @@ from src.dependencies import (
     get_db_session,
     get_game_manager,
     get_player,
-    get_player_db,
+    get_player_id,
+    get_websocket_player_db,
     set_auth_cookie,
 )
 from src.game.game import GameManager
 from src.helpers import (
     TagsEnum,
     accept_websocket_connection,
-    broadcast_full_lobby_state,
+    broadcast_connected_player,
     handle_player_disconnect,
     listen_for_messages,
+    load_all_time_statistics,
+    load_player_profile,
 )
-from src.misc import cache
 
 router = APIRouter(tags=[TagsEnum.MAIN])
 
 
 @router.get('/players/me', status_code=status.HTTP_200_OK)
 async def get_client_player(
-    player_db: Annotated[db.Player, Depends(get_player_db)],
+    player_id: Annotated[UUID, Depends(get_player_id)],
 ) -> v.Player:
-    return v.Player(**player_db.to_dict())
+    player = await load_player_profile(player_id)
+    if player is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail='Player not found')
+    return player
 
 
 @router.post('/players', status_code=status.HTTP_201_CREATED)
@@ -108,57 +113,28 @@ async def update_player_name(
 
 
 @router.get('/stats', status_code=status.HTTP_200_OK)
-@cache.cache(ttl=30)
-async def get_stats(
-    db_session: Annotated[AsyncSession, Depends(get_db_session)],
-) -> v.AllTimeStatistics:
-    total_games = await db_session.scalar(
-        select(func.count(db.Game.id_)).where(db.Game.status == db.GameStatusEnum.ENDED)
-    )
-
-    results = (
-        await db_session.execute(
-            select(
-                func.count(db.Turn.word),
-                func.max(db.Game.ended_on - db.Game.created_on),
-            )
-            .join(db.Turn, db.Game.id_ == db.Turn.game_id)
-            .filter(db.Game.status == db.GameStatusEnum.ENDED)
-            .group_by(db.Game.id_)
-            .order_by(func.count(db.Turn.word).desc())
-        )
-    ).first()
-    if results:
-        longest_chain, longest_game_time = results[0], results[1].seconds
-    else:
-        longest_chain, longest_game_time = 0, 0
-
-    return v.AllTimeStatistics(
-        longest_chain=longest_chain,
-        longest_game_time=longest_game_time,
-        total_games=total_games,  # type: ignore
-    )
+async def get_stats() -> v.AllTimeStatistics:
+    return await load_all_time_statistics()
 
 
 @router.websocket('/connect')
 async def connect(
-    player_db: Annotated[db.Player, Depends(get_player_db)],
+    player_db: Annotated[db.Player, Depends(get_websocket_player_db)],
     websocket: WebSocket,
-    db_session: Annotated[AsyncSession, Depends(get_db_session)],
     conn_manager: Annotated[ConnectionManager, Depends(get_connection_manager)],
     game_manager: Annotated[GameManager, Depends(get_game_manager)],
 ) -> None:
     player = d.Player(**player_db.to_dict(), room=d.LOBBY, websocket=websocket)
-    await accept_websocket_connection(player, websocket, db_session, conn_manager)
-    await broadcast_full_lobby_state(conn_manager)
+    await accept_websocket_connection(player, websocket, conn_manager)
+    await broadcast_connected_player(player, conn_manager)
 
     try:
         # Run as a separate task so blocking operations can coexist with future polling
         # operations inside this endpoint.
         listening_task = asyncio.create_task(
-            listen_for_messages(player, db_session, conn_manager, game_manager)
+            listen_for_messages(player, conn_manager, game_manager)
         )
         await asyncio.gather(listening_task)
 
     except WebSocketDisconnect:
-        await handle_player_disconnect(player, db_session, conn_manager)
+        await handle_player_disconnect(player, conn_manager)
@@ -1,4 +1,4 @@
-import asyncio
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import (
@@ -8,6 +8,7 @@ from fastapi import (
     status,
 )
 from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.schemas.database as db
@@ -21,6 +22,7 @@ from src.dependencies import (
     get_game_manager,
     get_player,
     get_room,
+    rate_limit,
 )
 from src.game.game import GameManager
 from src.helpers import (
@@ -28,11 +30,17 @@ from src.helpers import (
     broadcast_single_room_state,
     get_current_stats,
     move_player_and_broadcast_message,
-    run_game,
     save_and_broadcast_message,
+    start_room_game,
 )
+from src.id_allocator import id_allocator
+from src.rate_limiter import ActionClassEnum
 
-router = APIRouter(prefix='/rooms', tags=[TagsEnum.ROOMS])
+router = APIRouter(
+    prefix='/rooms',
+    tags=[TagsEnum.ROOMS],
+    dependencies=[Depends(rate_limit(ActionClassEnum.ROOM))],
+)
 
 
 @router.post('', status_code=status.HTTP_201_CREATED)
@@ -48,19 +56,26 @@ async def create_room(
             detail=f'Game room with name {room_in.name} already exists',
         )
 
-    room_db = db.Room(name=room_in.name)
-    db_session.add(room_db)
-    await db_session.flush([room_db])
-
     room = d.Room(
-        id_=room_db.id_,
-        name=room_db.name,
+        id_=await id_allocator.next_id(db.Room),
+        name=room_in.name,
         capacity=room_in.capacity,
-        created_on=room_db.created_on,
+        created_on=datetime.utcnow(),
         owner=player,
         rules=cast_v2d_rules(room_in.rules),
+        node_id=conn_manager.backplane.node_id,
     )  # fmt: off
-    conn_manager.pool.create_room(room)
+    db_session.add(db.Room(id_=room.id_, name=room.name, created_on=room.created_on))
+    # Committed before the room is published, so a failed insert leaves no trace of it
+    try:
+        await db_session.commit()
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f'Game room with name {room_in.name} already exists',
+        ) from None
+
+    conn_manager.create_room(room)
 
     room_out = v.RoomOut(players_no=0, owner_name=player.name, **room.to_dict())
     lobby_state = v.LobbyState(
@@ -75,7 +90,6 @@ async def modify_room(
     room_in_modify: v.RoomInModify,
     room: Annotated[d.Room, Depends(get_room)],
     player: Annotated[d.Player, Depends(get_player)],
-    db_session: Annotated[AsyncSession, Depends(get_db_session)],
     conn_manager: Annotated[ConnectionManager, Depends(get_connection_manager)],
 ) -> v.RoomOut:
     if room_in_modify.capacity < len(room.players):
@@ -84,18 +98,15 @@ async def modify_room(
             'Room capacity cannot be set below the current number of players',
         )
 
-    room.update(**room_in_modify.model_dump())
+    conn_manager.pool.update_room(room, **room_in_modify.model_dump())
 
     room_players = conn_manager.pool.get_room_players(room.id_)
     for room_player in room_players:
         room_player.ready = False
 
-    message_db = db.Message(
-        content='game settings have been changed',
-        room_id=room.id_,
-        player_id=d.ROOT.id_,
+    await save_and_broadcast_message(
+        'game settings have been changed', room.id_, conn_manager
     )
-    await save_and_broadcast_message(message_db, db_session, conn_manager)
 
     await broadcast_single_room_state(room, conn_manager)
     return v.RoomOut(
@@ -109,7 +120,6 @@ async def modify_room(
 async def join_room(
     room: Annotated[d.Room, Depends(get_room)],
     player: Annotated[d.Player, Depends(get_player)],
-    db_session: Annotated[AsyncSession, Depends(get_db_session)],
     conn_manager: Annotated[ConnectionManager, Depends(get_connection_manager)],
 ) -> v.RoomState:
     old_room_id = conn_manager.pool.get_room(player_id=player.id_).id_
@@ -120,30 +130,29 @@ async def join_room(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail='Room is not open'
         )
-    if len(room.players) >= room.capacity:
+    if room.id_ not in conn_manager.pool.get_rooms_with_free_seats():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail='Room is full'
         )
 
-    await move_player_and_broadcast_message(
-        player, old_room_id, room.id_, db_session, conn_manager
-    )
+    await move_player_and_broadcast_message(player, old_room_id, room.id_, conn_manager)
 
-    # Broadcast the info about all the players in the room, as the joining player
-    # needs that context
-    room_players = conn_manager.pool.get_room_players(room.id_)
-    players_out = {
-        player.name: v.RoomPlayerOut.model_validate(player) for player in room_players
-    }
+    # Send the whole room to the joining player only, as the others already have it,
+    # and broadcast only the info about the joining player
+    conn_manager.send_room_snapshot(player.id_)
     room_state = v.RoomState(
-        players=players_out, owner_name=room.owner.name, **room.to_dict()
+        players={player.name: v.RoomPlayerOut.model_validate(player)},
+        owner_name=room.owner.name,
+        **room.to_dict(),
     )
-    await conn_manager.broadcast_room_state(room_state.id_, room_state)
+    await conn_manager.broadcast_room_state(room.id_, room_state)
 
     # Broadcast only the info about the leaving player, as this is all the context other
     # clients need to keep their state up to date
     room_out = v.RoomOut(
-        players_no=len(players_out), owner_name=room.owner.name, **room.to_dict()
+        players_no=conn_manager.pool.count_room_players(room.id_),
+        owner_name=room.owner.name,
+        **room.to_dict(),
     )
     lobby_state = v.LobbyState(
         rooms={room.id_: room_out},
@@ -153,14 +162,21 @@ async def join_room(
     await conn_manager.broadcast_lobby_state(lobby_state)
 
     # TODO: Collect chat history and send it to the player
-    return room_state
+    room_players = conn_manager.pool.get_room_players(room.id_)
+    return v.RoomState(
+        players={
+            room_player.name: v.RoomPlayerOut.model_validate(room_player)
+            for room_player in room_players
+        },
+        owner_name=room.owner.name,
+        **room.to_dict(),
+    )
 
 
 @router.post('/{room_id}/leave', status_code=status.HTTP_200_OK)
 async def leave_room(
     room: Annotated[d.Room, Depends(get_room)],
     player: Annotated[d.Player, Depends(get_player)],
-    db_session: Annotated[AsyncSession, Depends(get_db_session)],
     conn_manager: Annotated[ConnectionManager, Depends(get_connection_manager)],
 ) -> v.LobbyState:
     # TODO: Ensure that the player terminated any active game before leaving the room
@@ -172,13 +188,13 @@ async def leave_room(
         )
 
     await move_player_and_broadcast_message(
-        player, old_room_id, d.LOBBY.id_, db_session, conn_manager
+        player, old_room_id, d.LOBBY.id_, conn_manager
     )
 
     # Ensure the room is not left by the owner in CLOSED status, as it will not be
     # accessible anymore
     if room.owner.id_ == player.id_ and room.status == d.RoomStatusEnum.CLOSED:
-        room.status = d.RoomStatusEnum.OPEN
+        conn_manager.pool.set_room_status(room, d.RoomStatusEnum.OPEN)
 
     # Broadcast only the info about the leaving player, as this is all the context other
     # clients need to keep their state up to date
@@ -192,7 +208,7 @@ async def leave_room(
     # Broadcast the info about all the players in the lobby, as the joining player
     # needs that context
     room_out = v.RoomOut(
-        players_no=len(conn_manager.pool.get_room_players(room.id_)),
+        players_no=conn_manager.pool.count_room_players(room.id_),
         owner_name=room.owner.name,
         **room.to_dict(),
     )
@@ -210,7 +226,6 @@ async def leave_room(
 async def toggle_room_status(
     room: Annotated[d.Room, Depends(get_room)],
     player: Annotated[d.Player, Depends(get_player)],
-    db_session: Annotated[AsyncSession, Depends(get_db_session)],
     conn_manager: Annotated[ConnectionManager, Depends(get_connection_manager)],
 ):
     """Toggle room status between OPEN and CLOSED."""
@@ -227,13 +242,13 @@ async def toggle_room_status(
         raise HTTPException(
             status.HTTP_400_BAD_REQUEST, 'Room status must be either OPEN or CLOSED'
         )
-    room.status = new_status
+    conn_manager.pool.set_room_status(room, new_status)
 
     room_state = v.RoomState(**room.to_dict(), owner_name=room.owner.name, players={})
     await conn_manager.broadcast_room_state(room.id_, room_state)
 
     room_out = v.RoomOut(
-        players_no=len(conn_manager.pool.get_room_players(room.id_)),
+        players_no=conn_manager.pool.count_room_players(room.id_),
         owner_name=room.owner.name,
         **room.to_dict(),
     )
@@ -283,7 +298,6 @@ async def kick_player(
     player_name: str,
     room: Annotated[d.Room, Depends(get_room)],
     player: Annotated[d.Player, Depends(get_player)],
-    db_session: Annotated[AsyncSession, Depends(get_db_session)],
     conn_manager: Annotated[ConnectionManager, Depends(get_connection_manager)],
 ) -> None:
     if room.owner.id_ != player.id_:
@@ -291,15 +305,11 @@ async def kick_player(
             status_code=status.HTTP_403_FORBIDDEN, detail='Player is not the owner'
         )
 
-    player_to_kick = next(
-        (
-            room_player
-            for room_player in room.players.values()
-            if room_player.name == player_name
-        ),
-        None,
-    )
-    if player_to_kick is None:
+    try:
+        player_to_kick = conn_manager.pool.get_player_by_name(player_name)
+    except KeyError:
+        player_to_kick = None
+    if player_to_kick is None or player_to_kick.room.id_ != room.id_:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='Player to kick is not in the room',
@@ -310,7 +320,6 @@ async def kick_player(
         player_to_kick,
         room.id_,
         d.LOBBY.id_,
-        db_session,
         conn_manager,
         leave_message=f'{player_to_kick.name} got kicked from the room',
     )
@@ -327,7 +336,7 @@ async def kick_player(
     # Broadcast the info about all the players in the room, as the joining player
     # needs that context
     room_out = v.RoomOut(
-        players_no=len(conn_manager.pool.get_room_players(room.id_)),
+        players_no=conn_manager.pool.count_room_players(room.id_),
         owner_name=room.owner.name,
         **room.to_dict(),
     )
@@ -361,28 +370,41 @@ async def start_game(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail='Not all players are ready'
         )
+    if room.status == d.RoomStatusEnum.IN_PROGRESS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail='Game is already running'
+        )
 
-    room.status = d.RoomStatusEnum.IN_PROGRESS
-    # Create game placeholder in the database to assign the ID
-    game_db = db.Game(
-        status=db.GameStatusEnum.STARTED,
-        rules=room.rules.to_dict(),
-        room_id=room.id_,
-    )
-    db_session.add(game_db)
-    await db_session.flush([game_db])
-    await db_session.execute(
-        insert(db.players_games_table).values(
-            [
-                {'game_id': game_db.id_, 'player_id': room_player.id_}
-                for room_player in room.players.values()
-            ]
+    # Status is claimed before any await, so concurrent requests don't start another game
+    previous_status = room.status
+    conn_manager.pool.set_room_status(room, d.RoomStatusEnum.IN_PROGRESS)
+    room_players = list(room.players.values())
+    try:
+        # Game is persisted before it starts, so it can be finalized once it ends
+        game_id = await id_allocator.next_id(db.Game)
+        await db_session.execute(
+            insert(db.Game).values(
+                id_=game_id,
+                status=db.GameStatusEnum.STARTED,
+                rules=room.rules.to_dict(),
+                room_id=room.id_,
+            )
         )
-    )
-    await broadcast_single_room_state(room, conn_manager)
+        await db_session.execute(
+            insert(db.players_games_table).values(
+                [
+                    {'game_id': game_id, 'player_id': room_player.id_}
+                    for room_player in room_players
+                ]
+            )
+        )
+        await db_session.commit()
+    except Exception:
+        conn_manager.pool.set_room_status(room, previous_status)
+        raise
 
-    game = game_manager.create(game_db.id_, room.id_, room.rules, room.players.values())
-    asyncio.create_task(run_game(game, room, conn_manager))
+    await broadcast_single_room_state(room, conn_manager)
+    start_room_game(game_id, room, conn_manager, game_manager)
 
     players_out = {}
     for player in room.players.values():
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import suppress
+from logging import getLogger
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+import asyncpg  # type: ignore[import-untyped]
+from sqlalchemy.engine import make_url
+
+from config import get_config
+
+BackplaneHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class Backplane(ABC):
+    """
+    Channel connecting the nodes (workers, containers) serving the game, each holding
+    its own set of websocket connections. Messages published by a node are delivered
+    to handlers of all the other nodes, in the order they were published.
+
+    Every message is a JSON-serializable dict with a `kind`, selecting its handler, and
+    an optional `target` node, if it's meant for a single node only. Once the channel
+    is restored after messages might have been lost, the node receives a message of
+    the `reconnected` kind from itself.
+    """
+
+    def __init__(self) -> None:
+        self.node_id = uuid4().hex
+        self._handlers: dict[str, BackplaneHandler] = {}
+        self._incoming: asyncio.Queue[str] = asyncio.Queue()
+        self._dispatcher: asyncio.Task | None = None
+
+    @property
+    def is_distributed(self) -> bool:
+        """Check if there can be other nodes to publish messages to."""
+        return True
+
+    def subscribe(self, kind: str, handler: BackplaneHandler) -> None:
+        self._handlers[kind] = handler
+
+    def publish(self, kind: str, target: str | None = None, **fields: Any) -> None:
+        """Queue the message for the other nodes, returns without waiting for them."""
+        if self.is_distributed:
+            message = {'kind': kind, 'origin': self.node_id, 'target': target, **fields}
+            self._send(json.dumps(message, separators=(',', ':'), default=str))
+
+    async def start(self) -> None:
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._dispatcher
+
+    @abstractmethod
+    def _send(self, data: str) -> None:
+        """Deliver the serialized message to the other nodes."""
+
+    def _receive(self, data: str) -> None:
+        self._incoming.put_nowait(data)
+
+    def _reconnected(self) -> None:
+        self._receive(
+            json.dumps({'kind': 'reconnected', 'origin': None, 'target': None})
+        )
+
+    async def _dispatch(self) -> None:
+        while True:
+            message = json.loads(await self._incoming.get())
+            if message['origin'] == self.node_id:
+                continue
+            if message['target'] not in (None, self.node_id):
+                continue
+
+            handler = self._handlers.get(message['kind'])
+            if handler is None:
+                continue
+            try:
+                await handler(message)
+            except Exception:
+                getLogger('uvicorn').exception(
+                    f'Backplane message "{message["kind"]}" could not be handled'
+                )
+
+
+class LocalHub:
+    """Delivers messages between the `LocalBackplane`s of a single process."""
+
+    def __init__(self) -> None:
+        self.backplanes: list['LocalBackplane'] = []
+
+
+class LocalBackplane(Backplane):
+    """
+    Backplane of nodes running in a single process. With the default, private hub, the
+    node is alone, so nothing is published at all.
+    """
+
+    def __init__(self, hub: LocalHub | None = None) -> None:
+        super().__init__()
+        self.hub = hub or LocalHub()
+        self.hub.backplanes.append(self)
+
+    @property
+    def is_distributed(self) -> bool:
+        return len(self.hub.backplanes) > 1
+
+    def _send(self, data: str) -> None:
+        for backplane in self.hub.backplanes:
+            if backplane is not self:
+                backplane._receive(data)
+
+
+class PostgresBackplane(Backplane):
+    """
+    Backplane over Postgres LISTEN/NOTIFY, so the nodes need nothing but the database
+    they already share. Messages are split into parts fitting the NOTIFY payload limit.
+
+    Lost connections are reestablished. Notifications sent while the listening
+    connection was down are lost, along with the messages they were parts of.
+    """
+
+    MAX_PAYLOAD = 7900  # bytes, Postgres rejects payloads of 8000 bytes and more
+    PARTS_TIMEOUT = 10  # seconds, Incomplete messages are dropped after it
+    HEALTH_CHECK_INTERVAL = 10  # seconds, Detects connections dropped silently
+    RECONNECT_MAX_DELAY = 30  # seconds, Cap of the backoff of reconnect attempts
+
+    def __init__(self, dsn: str, channel: str) -> None:
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+
+        self._listen_conn: asyncpg.Connection | None = None
+        self._notify_conn: asyncpg.Connection | None = None
+        self._outgoing: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+        self._message_no = 0
+        # Parts received so far with the time of the first one, oldest messages first
+        self._parts: OrderedDict[tuple[str, int], tuple[float, list[str]]] = (
+            OrderedDict()
+        )
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._listen_conn = await self._listen()
+        self._notify_conn = await asyncpg.connect(self.dsn)
+        self._tasks = [
+            asyncio.create_task(self._send_notifications()),
+            asyncio.create_task(self._check_health()),
+        ]
+        await super().start()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        await super().stop()
+        for task in self._tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks.clear()
+        for conn in (self._listen_conn, self._notify_conn):
+            if conn is not None:
+                await conn.close()
+
+    def _send(self, data: str) -> None:
+        # Node ID and the message number identify the parts of the message
+        self._message_no += 1
+        chunk_size = self.MAX_PAYLOAD // 4 - 64  # Leave room for multi-byte characters
+        chunks = [
+            data[start : start + chunk_size]
+            for start in range(0, len(data), chunk_size)
+        ]
+        for part_no, chunk in enumerate(chunks, start=1):
+            self._outgoing.put_nowait(
+                f'{self.node_id}:{self._message_no}:{part_no}:{len(chunks)}:{chunk}'
+            )
+
+    async def _listen(self) -> asyncpg.Connection:
+        conn = await asyncpg.connect(self.dsn)
+        try:
+            await conn.add_listener(self.channel, self._on_notification)
+        except BaseException:
+            conn.terminate()
+            raise
+        conn.add_termination_listener(self._on_listen_conn_lost)
+        return conn
+
+    def _on_listen_conn_lost(self, conn: asyncpg.Connection) -> None:
+        if self._stopping or conn is not self._listen_conn:
+            return
+        getLogger('uvicorn').error('BACKPLANE: Listening connection lost, reconnecting')
+        self._tasks = [task for task in self._tasks if not task.done()]
+        self._tasks.append(asyncio.create_task(self._relisten()))
+
+    async def _relisten(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                self._listen_conn = await self._listen()
+                break
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                attempt += 1
+                getLogger('uvicorn').error(f'BACKPLANE: Reconnect failed: {e!r}')
+                await asyncio.sleep(self._retry_delay(attempt))
+
+        getLogger('uvicorn').info('BACKPLANE: Listening again')
+        self._parts.clear()  # Their remaining parts might have been sent meanwhile
+        self._reconnected()
+
+    async def _check_health(self) -> None:
+        while True:
+            await asyncio.sleep(self.HEALTH_CHECK_INTERVAL)
+            conn = self._listen_conn
+            if conn is None or conn.is_closed():
+                continue  # Being reconnected
+            try:
+                await conn.execute('SELECT 1', timeout=self.HEALTH_CHECK_INTERVAL)
+            except Exception:
+                conn.terminate()  # Reconnected by the termination listener
+
+    async def _send_notifications(self) -> None:
+        while True:
+            payload = await self._outgoing.get()
+            attempt = 0
+            while True:
+                try:
+                    if self._notify_conn is None or self._notify_conn.is_closed():
+                        self._notify_conn = await asyncpg.connect(self.dsn)
+                    await self._notify_conn.execute(
+                        'SELECT pg_notify($1, $2)', self.channel, payload
+                    )
+                    break
+                except Exception:
+                    if self._notify_conn is not None and (
+                        not self._notify_conn.is_closed()
+                    ):
+                        # Connection is fine, it's the notification which was rejected
+                        getLogger('uvicorn').exception(
+                            'BACKPLANE: Notification was not sent'
+                        )
+                        break
+                    attempt += 1
+                    getLogger('uvicorn').error(
+                        'BACKPLANE: Notifying connection lost, reconnecting'
+                    )
+                    await asyncio.sleep(self._retry_delay(attempt))
+
+    def _on_notification(
+        self, conn: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        node_id, message_no, part_no, parts, chunk = payload.split(':', 4)
+        if node_id == self.node_id:
+            return  # Skip own messages early, without reassembling them
+
+        now = time.monotonic()
+        self._expire_parts(now)
+        if parts == '1':
+            self._receive(chunk)
+            return
+
+        key = (node_id, int(message_no))
+        if part_no == '1':
+            self._parts[key] = (now, [])
+        elif key not in self._parts or int(part_no) != len(self._parts[key][1]) + 1:
+            # Some of the previous parts were lost, the message can't be reassembled
+            self._parts.pop(key, None)
+            getLogger('uvicorn').warning(f'BACKPLANE: Message {key} lost its parts')
+            return
+
+        self._parts[key][1].append(chunk)
+        if part_no == parts:
+            self._receive(''.join(self._parts.pop(key)[1]))
+
+    def _expire_parts(self, now: float) -> None:
+        while self._parts:
+            key, (first_part_on, _) = next(iter(self._parts.items()))
+            if now - first_part_on < self.PARTS_TIMEOUT:
+                return
+            del self._parts[key]
+            getLogger('uvicorn').warning(f'BACKPLANE: Message {key} is incomplete')
+
+    def _retry_delay(self, attempt: int) -> float:
+        return min(0.5 * 2 ** (attempt - 1), self.RECONNECT_MAX_DELAY)
+
+
+def create_backplane() -> Backplane:
+    config = get_config()
+    if config.BACKPLANE == 'postgres':
+        # asyncpg takes a plain DSN, without the SQLAlchemy's driver suffix
+        dsn = make_url(config.DATABASE_URI).set(drivername='postgresql')
+        return PostgresBackplane(
+            dsn.render_as_string(hide_password=False), config.BACKPLANE_CHANNEL
+        )
+    return LocalBackplane()
+
+
+backplane = create_backplane()
@@ -0,0 +1,165 @@
+"""
+Maintenance commands, run from the `backend` directory.
+
+Usage:
+    python -m src.commands build-dictionary words.txt dictionary.bin
+    python -m src.commands backfill-stats
+    python -m src.commands create-indexes
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from sqlalchemy import Select, Update, func, select, text, update
+from sqlalchemy.schema import CreateIndex
+
+import src.schemas.database as db
+import src.schemas.validation as v
+from src.database import create_missing_tables, engine, init_db_session
+from src.game.dictionary import Dictionary
+
+
+def build_dictionary(args: argparse.Namespace) -> None:
+    with open(args.word_list, encoding='utf-8') as f:
+        words_no = Dictionary.build(f, args.output)
+    print(f'Indexed {words_no} words into "{args.output}"')
+
+
+def mark_legacy_failed_games() -> Update:
+    """
+    Failed games were marked as ENDED before they got a status of their own. They're
+    the only ended games without any turns, as a game ends after a turn.
+    """
+    return (
+        update(db.Game)
+        .where(
+            db.Game.status == db.GameStatusEnum.ENDED,
+            ~select(db.Turn.id_).where(db.Turn.game_id == db.Game.id_).exists(),
+        )
+        .values(status=db.GameStatusEnum.FAILED)
+    )
+
+
+def select_ended_games_stats() -> Select:
+    """Select the number of ended games, their longest chain and longest game time."""
+    ended_games = (
+        select(
+            func.count(db.Turn.word).label('chain_length'),
+            (db.Game.ended_on - db.Game.created_on).label('game_time'),
+        )
+        .outerjoin(db.Turn, db.Game.id_ == db.Turn.game_id)
+        .where(db.Game.status == db.GameStatusEnum.ENDED)
+        .group_by(db.Game.id_)
+        .subquery()
+    )
+    return select(
+        func.count(),
+        func.max(ended_games.c.chain_length),
+        func.max(ended_games.c.game_time),
+    )
+
+
+async def _backfill_stats() -> v.AllTimeStatistics:
+    await create_missing_tables()
+    async with init_db_session() as db_session:
+        # Games ending meanwhile wait for the lock, and are counted in after it's released
+        await db_session.execute(
+            text(f'LOCK TABLE {db.AllTimeStatistics.__tablename__} IN EXCLUSIVE MODE')
+        )
+
+        await db_session.execute(mark_legacy_failed_games())
+        total_games, longest_chain, longest_game_time = (
+            await db_session.execute(select_ended_games_stats())
+        ).one()
+
+        stats_db = await db_session.get(
+            db.AllTimeStatistics, db.AllTimeStatistics.ROW_ID
+        ) or db.AllTimeStatistics(id_=db.AllTimeStatistics.ROW_ID)
+        stats_db.total_games = total_games
+        stats_db.longest_chain = longest_chain or 0
+        stats_db.longest_game_time = (
+            int(longest_game_time.total_seconds()) if longest_game_time else 0
+        )
+        db_session.add(stats_db)
+        stats = v.AllTimeStatistics.model_validate(stats_db)
+    await engine.dispose()
+    return stats
+
+
+def backfill_stats(args: argparse.Namespace) -> None:
+    stats = asyncio.run(_backfill_stats())
+    print(
+        f'Counted in {stats.total_games} games, the longest chain has '
+        f'{stats.longest_chain} words and the longest game took '
+        f'{stats.longest_game_time}s'
+    )
+
+
+async def _create_indexes() -> list[str]:
+    """
+    Create the indexes missing in the database, without locking their tables against
+    writes. Indexes left invalid by an interrupted build are rebuilt.
+    """
+    await create_missing_tables()
+    created = []
+    async with engine.connect() as conn:
+        # Indexes can't be built concurrently inside a transaction
+        conn = await conn.execution_options(isolation_level='AUTOCOMMIT')
+        for table in db.Base.metadata.sorted_tables:
+            for index in sorted(table.indexes, key=lambda index: str(index.name)):
+                is_valid = await conn.scalar(
+                    text(
+                        'SELECT indisvalid FROM pg_index '
+                        'JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+                        'WHERE pg_class.relname = :name'
+                    ),
+                    {'name': index.name},
+                )
+                if is_valid:
+                    continue
+                if is_valid is False:
+                    await conn.execute(text(f'DROP INDEX CONCURRENTLY {index.name}'))
+
+                index.dialect_options['postgresql']['concurrently'] = True
+                await conn.execute(CreateIndex(index, if_not_exists=True))
+                created.append(str(index.name))
+    await engine.dispose()
+    return created
+
+
+def create_indexes(args: argparse.Namespace) -> None:
+    created = asyncio.run(_create_indexes())
+    print(f'Created {len(created)} indexes: {", ".join(created) or "-"}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m src.commands')
+    subparsers = parser.add_subparsers(required=True)
+
+    build_parser = subparsers.add_parser(
+        'build-dictionary',
+        help='Compile a newline-separated word list into a memory-mappable index',
+    )
+    build_parser.add_argument('word_list', type=Path)
+    build_parser.add_argument('output', type=Path)
+    build_parser.set_defaults(func=build_dictionary)
+
+    backfill_parser = subparsers.add_parser(
+        'backfill-stats',
+        help='Recompute the all-time statistics from the games played so far',
+    )
+    backfill_parser.set_defaults(func=backfill_stats)
+
+    indexes_parser = subparsers.add_parser(
+        'create-indexes',
+        help='Create the missing indexes concurrently, with no downtime',
+    )
+    indexes_parser.set_defaults(func=create_indexes)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
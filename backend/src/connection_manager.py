@@ -1,17 +1,281 @@
 import asyncio
+import json
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Callable, Iterable
 from uuid import UUID
 
-from fastapi import WebSocket
+from fastapi import WebSocket, status
 
 import src.schemas.domain as d
 import src.schemas.validation as v
+from config import get_config
+from src.backplane import Backplane, LocalBackplane
+from src.game.scheduler import TimerHandle, scheduler
+from src.lobby import LobbyViews
 from src.misc import PlayerAlreadyConnectedError
 from src.player_room_manager import PlayerRoomPool
+from src.replication import (
+    apply_room_state,
+    player_from_replica,
+    player_to_replica,
+    room_from_replica,
+    room_to_replica,
+)
+from src.state_log import StateLog
+
+
+def encode_message(payload: Any) -> str:
+    """
+    Wrap the payload into a `WebSocketMessage` and serialize it into a text frame,
+    ready to be sent as-is to any number of websockets.
+    """
+    message_json = v.WebSocketMessage(payload=payload).model_dump_json(by_alias=True)
+    if get_config().WEBSOCKET_DOUBLE_ENCODING:
+        # Legacy clients expect the message JSON wrapped in yet another JSON string
+        return json.dumps(message_json, separators=(',', ':'), ensure_ascii=False)
+    return message_json
+
+
+def merge_states(
+    older: v.LobbyState | v.RoomState, newer: v.LobbyState | v.RoomState
+) -> v.LobbyState | v.RoomState:
+    """
+    Merge two consecutive state deltas into one, equivalent to applying both of them
+    in order. Entries of the newer delta win, removals (`None`) included.
+    """
+    update: dict[str, Any] = {}
+    if not newer.full_view:  # Full views replace the entries instead of updating them
+        for name in ('rooms', 'players'):
+            older_entries = getattr(older, name, None)
+            newer_entries = getattr(newer, name, None)
+            if older_entries is not None or newer_entries is not None:
+                update[name] = {**(older_entries or {}), **(newer_entries or {})}
+    if isinstance(newer, v.LobbyState) and newer.stats is None:
+        update['stats'] = older.stats  # type: ignore
+    update['full_view'] = older.full_view or newer.full_view
+    if older.version is not None and newer.version is not None:
+        update['prev_version'] = older.prev_version  # Covers both versions
+
+    return newer.model_copy(update=update)
+
+
+@dataclass
+class OutboundStats:
+    frames_sent: int = 0
+    frames_coalesced: int = 0  # State deltas merged into a later one on queue overflow
+    consumers_evicted: int = 0  # Connections closed for not keeping up
+
+
+@dataclass(slots=True)
+class _Frame:
+    text: str
+    # Lobby and room state deltas are kept along, so they can be merged on overflow
+    state: v.LobbyState | v.RoomState | None = None
+
+
+class Outbox:
+    """
+    Bounded queue of frames outgoing to a single websocket, drained by its own writer
+    task, so a slow client never holds up the broadcasting code nor other clients.
+
+    When the queue is full, the stale state deltas waiting in it are merged with the
+    new one. If there is nothing to merge, or a single frame takes longer than
+    `send_timeout` to be written, the client is deemed too slow and disconnected.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        maxsize: int,
+        send_timeout: float,
+        stats: OutboundStats,
+    ) -> None:
+        self.websocket = websocket
+        self.maxsize = maxsize
+        self.send_timeout = send_timeout
+        self.stats = stats
+
+        self._frames: deque[_Frame] = deque()
+        self._has_frames = asyncio.Event()
+        self._evicted = False
+        self._writer: asyncio.Task | None = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames)
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._write())
+
+    async def close(self) -> None:
+        """Stop the writer, discarding the frames which were not sent yet."""
+        self._frames.clear()
+        if self._writer is not None:
+            self._writer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._writer
+
+    def put(self, text: str, state: v.LobbyState | v.RoomState | None = None) -> None:
+        if self._evicted:
+            return
+
+        if len(self._frames) < self.maxsize:
+            self._frames.append(_Frame(text, state))
+            self._has_frames.set()
+        elif state is None or not self._coalesce(state):
+            self._evict()
+
+    def _coalesce(self, state: v.LobbyState | v.RoomState) -> bool:
+        """Replace the queued deltas of the same state with a single, merged one."""
+        stale = [
+            frame
+            for frame in self._frames
+            if type(frame.state) is type(state)
+            and getattr(frame.state, 'id_', None) == getattr(state, 'id_', None)
+        ]
+        if not stale:
+            return False
+
+        merged = stale[0].state
+        for frame in stale[1:]:
+            merged = merge_states(merged, frame.state)  # type: ignore
+        merged = merge_states(merged, state)  # type: ignore
+
+        # Merged delta takes the place of the first one, so the frames stay in order
+        stale[0].text, stale[0].state = encode_message(merged), merged
+        stale_ids = {id(frame) for frame in stale[1:]}
+        self._frames = deque(
+            frame for frame in self._frames if id(frame) not in stale_ids
+        )
+        self.stats.frames_coalesced += len(stale)
+        return True
+
+    def _evict(self) -> None:
+        self._evicted = True
+        self._frames.clear()
+        self._has_frames.set()  # Wake up the writer, so it closes the connection
+        self.stats.consumers_evicted += 1
+
+    async def _write(self) -> None:
+        while True:
+            await self._has_frames.wait()
+            if self._evicted:
+                break
+            frame = self._frames.popleft()
+            if not self._frames:
+                self._has_frames.clear()
+
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_text(frame.text), self.send_timeout
+                )
+            except asyncio.TimeoutError:
+                self.stats.consumers_evicted += 1
+                break
+            except Exception:
+                # Connection is already gone, the disconnect is handled by its listener
+                self._evicted = True
+                self._frames.clear()
+                return
+            self.stats.frames_sent += 1
+
+        getLogger('uvicorn').warning('Disconnecting a client too slow to keep up')
+        self._evicted = True
+        # Closing unblocks the client's listener, which then handles the disconnect
+        with suppress(Exception):
+            await asyncio.wait_for(
+                self.websocket.close(
+                    status.WS_1008_POLICY_VIOLATION, 'Client is too slow'
+                ),
+                self.send_timeout,
+            )
+
+
+class LobbyPublisher:
+    """
+    Collect `LobbyState` deltas published within a tick and emit them as a single,
+    merged delta at its end. A single action usually touches the lobby several times,
+    so this saves most of the frames sent to the lobby players when it's busy.
+    """
+
+    def __init__(self, tick: float, emit: Callable[[v.LobbyState], None]) -> None:
+        self.tick = tick
+        self.emit = emit
+
+        self._pending: v.LobbyState | None = None
+        self._flush_handle: TimerHandle | None = None
+
+    def publish(self, lobby_state: v.LobbyState) -> None:
+        if self.tick <= 0:
+            self.emit(lobby_state)
+            return
+
+        if self._pending is None:
+            self._pending = lobby_state
+            self._flush_handle = scheduler.call_later(self.tick, self.flush)
+        else:
+            self._pending = merge_states(self._pending, lobby_state)  # type: ignore
+
+    def flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending is not None:
+            lobby_state, self._pending = self._pending, None
+            self.emit(lobby_state)
 
 
 class ConnectionManager:
-    def __init__(self, pool: PlayerRoomPool) -> None:
+    """
+    Delivers messages to the players, both to the ones connected to this node and,
+    through the `backplane`, to the ones connected to the other nodes. Players and rooms
+    of the other nodes are replicated into the `pool`, so every node sees all of them.
+    """
+
+    def __init__(
+        self, pool: PlayerRoomPool, backplane: Backplane | None = None
+    ) -> None:
         self.pool = pool
+        self.backplane = backplane or LocalBackplane()
+        self.outbound_stats = OutboundStats()
+        self._outboxes: dict[UUID, Outbox] = {}
+        self.lobby_views = LobbyViews()
+        self.lobby_publisher = LobbyPublisher(
+            get_config().LOBBY_PUBLISH_TICK, self._emit_lobby_state
+        )
+        # Versioned deltas of the lobby and the rooms, as sent by this node
+        self.lobby_log: StateLog[v.LobbyState] = StateLog(
+            self.backplane.node_id, get_config().STATE_LOG_SIZE
+        )
+        self._room_logs: dict[int, StateLog[v.RoomState]] = {}
+
+        handlers = {
+            'frame': self._on_frame,
+            'player_frame': self._on_player_frame,
+            'room_state': self._on_room_state,
+            'lobby_state': self._on_lobby_state,
+            'player_connected': self._on_player_connected,
+            'player_disconnected': self._on_player_disconnected,
+            'player_moved': self._on_player_moved,
+            'room_created': self._on_room_created,
+            'room_removed': self._on_room_removed,
+            'sync_request': self._on_sync_request,
+            'sync': self._on_sync,
+            'reconnected': self._on_reconnected,
+        }
+        for kind, handler in handlers.items():
+            self.backplane.subscribe(kind, handler)
+
+    def owns(self, room: d.Room) -> bool:
+        """Check if the room's games run on this node."""
+        return room.node_id in (None, self.backplane.node_id)
+
+    def request_sync(self) -> None:
+        """Ask the other nodes for their players and rooms, e.g. when joining them."""
+        self.backplane.publish('sync_request')
 
     def connect(self, player: d.Player, room_id: int) -> None:
         try:  # If successfully gets the player, it means the player is already connected
@@ -24,22 +288,45 @@ class ConnectionManager:
 
         self.pool.add_player(player, room_id)
 
-    def disconnect(self, player_id: UUID):
+        outbox = Outbox(
+            player.websocket,  # type: ignore
+            get_config().WEBSOCKET_QUEUE_SIZE,
+            get_config().WEBSOCKET_SEND_TIMEOUT,
+            self.outbound_stats,
+        )
+        outbox.start()
+        self._outboxes[player.id_] = outbox
+        self.backplane.publish('player_connected', player=player_to_replica(player))
+
+    async def disconnect(self, player_id: UUID):
         if not self.pool.get_player(player_id):
             raise ValueError('Player is not connected')
         self.pool.remove_player(player_id)
+        self.lobby_views.unsubscribe(player_id)
+        await self._outboxes.pop(player_id).close()
+        self.backplane.publish('player_disconnected', player_id=str(player_id))
+
+    def create_room(self, room: d.Room) -> None:
+        self.pool.create_room(room)
+        self.backplane.publish('room_created', room=room_to_replica(room))
+
+    def remove_room(self, room_id: int) -> None:
+        self.pool.remove_room(room_id)
+        self._room_logs.pop(room_id, None)
+        self.backplane.publish('room_removed', room_id=room_id)
+
+    def queue_depths(self) -> dict[UUID, int]:
+        """Get the number of frames waiting to be sent, per connected player."""
+        return {player_id: outbox.depth for player_id, outbox in self._outboxes.items()}
 
     async def broadcast_chat_message(self, message: v.Message) -> None:
         room_players = self.pool.get_room_players(message.room_id)
         if room_players is None:
             raise ValueError('Room does not exist')
 
-        websocket_message = v.WebSocketMessage(payload=message)
-        message_json = websocket_message.model_dump_json(by_alias=True)
-        send_messages = [
-            player.websocket.send_json(message_json) for player in room_players
-        ]
-        await asyncio.gather(*send_messages)
+        frame = encode_message(message)
+        self._broadcast(room_players, frame)
+        self.backplane.publish('frame', room_id=message.room_id, frame=frame)
 
     async def send_chat_message(
         self,
@@ -50,25 +337,105 @@ class ConnectionManager:
         if player is None:
             raise ValueError('Player is not connected')
 
-        websocket_message = v.WebSocketMessage(payload=message)
-        await player.websocket.send_json(
-            websocket_message.model_dump_json(by_alias=True)
-        )
+        self._send(player.id_, encode_message(message))
 
     async def broadcast_lobby_state(self, lobby_state: v.LobbyState) -> None:
         """
         Send the lobby state to all players in the lobby. Message contains only the data
         that is due to be updated/removed (if set to None) - data which is not included
         in the message MUST stay the same on the client side.
+
+        Deltas are merged by the `lobby_publisher` and sent once per its tick. Players
+        subscribed to a lobby view receive only the changes of the rooms inside of it.
         """
-        lobby_players = self.pool.get_room_players(d.LOBBY.id_)
+        self.lobby_publisher.publish(lobby_state)
+        self.backplane.publish('lobby_state', state=lobby_state.model_dump(mode='json'))
 
-        websocket_message = v.WebSocketMessage(payload=lobby_state)
-        message_json = websocket_message.model_dump_json(by_alias=True)
-        send_messages = [
-            player.websocket.send_json(message_json) for player in lobby_players
-        ]
-        await asyncio.gather(*send_messages)
+    def subscribe_to_lobby(
+        self, player_id: UUID, subscription: v.LobbySubscription
+    ) -> None:
+        """Subscribe the player to a lobby view, and send all of its rooms."""
+        if self.pool.get_room(player_id=player_id).id_ != d.LOBBY.id_:
+            raise ValueError('Player is not in the lobby')
+
+        self.lobby_views.subscribe(player_id, subscription, self.lobby_log.version)
+        self.send_lobby_snapshot(player_id)
+
+    def send_lobby_snapshot(self, player_id: UUID) -> None:
+        """
+        Send the whole lobby, or the player's lobby view, to the player alone. Players
+        entering the lobby get it instead of a full lobby broadcast to everyone.
+        """
+        view = self.lobby_views.get(player_id)
+        if view is None:
+            rooms, version = self.lobby_views.index.rooms, self.lobby_log.version
+        else:
+            rooms, version = view.visible, view.version
+
+        lobby_state = v.LobbyState(
+            rooms=dict(rooms),
+            players={
+                player.name: v.LobbyPlayerOut.model_validate(player)
+                for player in self.pool.get_room_players(d.LOBBY.id_)
+            },
+            stats=v.CurrentStatistics(
+                active_players=self.pool.active_players,
+                active_rooms=self.pool.active_rooms,
+                open_rooms=self.pool.open_rooms,
+            ),
+            full_view=True,
+            epoch=self.lobby_log.epoch,
+            version=version,
+        )
+        self._send(player_id, encode_message(lobby_state), lobby_state)
+
+    def send_room_snapshot(self, player_id: UUID) -> None:
+        """Send the whole state of the player's room to the player alone."""
+        room = self.pool.get_room(player_id=player_id)
+        log = self._room_log(room.id_)
+        room_state = v.RoomState(
+            **room.to_dict(),
+            owner_name=room.owner.name,
+            players={
+                player.name: v.RoomPlayerOut.model_validate(player)
+                for player in room.players.values()
+            },
+            full_view=True,
+            epoch=log.epoch,
+            version=log.version,
+        )
+        self._send(player_id, encode_message(room_state), room_state)
+
+    def resync(self, player_id: UUID, resync: v.StateResync) -> None:
+        """
+        Send the player the deltas following the version it has, merged into a single
+        one, or a snapshot of the whole state if they are not kept anymore.
+        """
+        room = self.pool.get_room(player_id=player_id)
+        deltas: list[v.LobbyState] | list[v.RoomState] | None
+        if resync.stream == v.StateStreamEnum.LOBBY:
+            if room.id_ != d.LOBBY.id_:
+                raise ValueError('Player is not in the lobby')
+            # Views skip the deltas not affecting them, so they can't be replayed
+            deltas = None
+            if not self.lobby_views.is_subscribed(player_id):
+                deltas = self.lobby_log.since(resync.epoch, resync.version)
+            if deltas is None:
+                self.send_lobby_snapshot(player_id)
+                return
+        else:
+            if room.id_ != resync.room_id:
+                raise ValueError('Player is not in the room')
+            deltas = self._room_log(room.id_).since(resync.epoch, resync.version)
+            if deltas is None:
+                self.send_room_snapshot(player_id)
+                return
+
+        if deltas:
+            state: v.LobbyState | v.RoomState = deltas[0]
+            for delta in deltas[1:]:
+                state = merge_states(state, delta)
+            self._send(player_id, encode_message(state), state)
 
     async def send_lobby_state(
         self, player_id: UUID, lobby_state: v.LobbyState
@@ -82,10 +449,7 @@ class ConnectionManager:
         if player is None:
             raise ValueError('Player is not connected')
 
-        websocket_message = v.WebSocketMessage(payload=lobby_state)
-        await player.websocket.send_json(
-            websocket_message.model_dump_json(by_alias=True)
-        )
+        self._send(player.id_, encode_message(lobby_state), lobby_state)
 
     async def broadcast_room_state(self, room_id: int, room_state: v.RoomState) -> None:
         """
@@ -97,12 +461,12 @@ class ConnectionManager:
         if room_players is None:
             raise ValueError('Room does not exist')
 
-        websocket_message = v.WebSocketMessage(payload=room_state)
-        message_json = websocket_message.model_dump_json(by_alias=True)
-        send_messages = [
-            player.websocket.send_json(message_json) for player in room_players
-        ]
-        await asyncio.gather(*send_messages)
+        self._broadcast_room_state(room_id, room_state)
+        # Other nodes update their replica of the room with the state, as well, and
+        # version it on their own
+        self.backplane.publish(
+            'room_state', room_id=room_id, state=room_state.model_dump(mode='json')
+        )
 
     async def broadcast_game_state(self, room_id: int, game_state: v.GameState) -> None:
         """Send the game state to all players in the room."""
@@ -110,12 +474,12 @@ class ConnectionManager:
         if room_players is None:
             raise ValueError('Room does not exist')
 
-        websocket_message = v.WebSocketMessage(payload=game_state)
-        message_json = websocket_message.model_dump_json(by_alias=True)
-        send_messages = [
-            player.websocket.send_json(message_json) for player in room_players
-        ]
-        await asyncio.gather(*send_messages)
+        await self.broadcast_encoded(room_id, encode_message(game_state))
+
+    async def broadcast_encoded(self, room_id: int, frame: str) -> None:
+        """Send a message already encoded with `encode_message` to all players in the room."""
+        self._broadcast(self.pool.get_room_players(room_id), frame)
+        self.backplane.publish('frame', room_id=room_id, frame=frame)
 
     async def send_connection_state(
         self, code: v.CustomWebsocketCodeEnum, reason: str, websocket: WebSocket
@@ -126,8 +490,13 @@ class ConnectionManager:
         which has inaccessible `code` and `reason` attributes to the browser.
         """
         connection_state = v.ConnectionState(code=code, reason=reason)
-        websocket_message = v.WebSocketMessage(payload=connection_state)
-        await websocket.send_json(websocket_message.model_dump_json(by_alias=True))
+        await websocket.send_text(encode_message(connection_state))
+
+    async def send_player_connection_state(
+        self, player_id: UUID, connection_state: v.ConnectionState
+    ) -> None:
+        """Send a connection state message to an already connected player."""
+        self._send(player_id, encode_message(connection_state))
 
     def move_player(self, player_id: UUID, from_room_id: int, to_room_id: int) -> None:
         """Move a player's websocket connection from one room to another."""
@@ -136,18 +505,182 @@ class ConnectionManager:
         if not self.pool.does_room_exist(to_room_id):
             raise ValueError('Room to move the player to does not exist')
 
+        self._move_player(player_id, to_room_id)
+        self.backplane.publish(
+            'player_moved', player_id=str(player_id), room_id=to_room_id
+        )
+
+    async def send_action(self, action: v.Action, player_id: UUID) -> None:
+        player = self.pool.get_player(player_id)
+        if player is None:
+            raise ValueError('Player is not connected')
+
+        self._send(player.id_, encode_message(action))
+
+    def _move_player(self, player_id: UUID, to_room_id: int) -> None:
         player = self.pool.get_player(player_id)
         self.pool.remove_player(player_id)
+        # Lobby views are valid in the lobby only
+        self.lobby_views.unsubscribe(player_id)
         player.ready = False
         player.in_game = False
         self.pool.add_player(player, to_room_id)
 
-    async def send_action(self, action: v.Action, player_id: UUID) -> None:
-        player = self.pool.get_player(player_id)
-        if player is None:
-            raise ValueError('Player is not connected')
+    def _emit_lobby_state(self, lobby_state: v.LobbyState) -> None:
+        lobby_state = self.lobby_log.append(lobby_state)
+        changes = self.lobby_views.index.apply(lobby_state.rooms or {})
+
+        lobby_players = self.pool.get_room_players(d.LOBBY.id_)
+        unsubscribed_players = [
+            player
+            for player in lobby_players
+            if not self.lobby_views.is_subscribed(player.id_)
+        ]
+        self._broadcast(unsubscribed_players, encode_message(lobby_state), lobby_state)
+
+        for view in self.lobby_views:
+            rooms = view.refresh(self.lobby_views.index, changes)
+            if not rooms and lobby_state.players is None and lobby_state.stats is None:
+                continue
+
+            view_state = lobby_state.model_copy(
+                update={'rooms': rooms or None, 'prev_version': view.version}
+            )
+            view.version = lobby_state.version  # type: ignore
+            frame = encode_message(view_state)
+            for player_id in view.player_ids:
+                self._outboxes[player_id].put(frame, view_state)
+
+    def _broadcast_room_state(self, room_id: int, room_state: v.RoomState) -> None:
+        room_state = self._room_log(room_id).append(room_state)
+        room_players = self.pool.get_room_players(room_id)
+        self._broadcast(room_players, encode_message(room_state), room_state)
+
+    def _room_log(self, room_id: int) -> StateLog[v.RoomState]:
+        if room_id not in self._room_logs:
+            self._room_logs[room_id] = StateLog(
+                self.backplane.node_id, get_config().STATE_LOG_SIZE
+            )
+        return self._room_logs[room_id]
+
+    def _send(
+        self,
+        player_id: UUID,
+        frame: str,
+        state: v.LobbyState | v.RoomState | None = None,
+    ) -> None:
+        """Queue the frame for a single player, wherever it's connected."""
+        if player_id in self._outboxes:
+            self._outboxes[player_id].put(frame, state)
+        else:
+            self.backplane.publish(
+                'player_frame', player_id=str(player_id), frame=frame
+            )
+
+    def _broadcast(
+        self,
+        players: Iterable[d.Player],
+        frame: str,
+        state: v.LobbyState | v.RoomState | None = None,
+    ) -> None:
+        """
+        Queue the same, already encoded frame for the players connected to this node.
+        The frames are written by each connection's writer task.
+        """
+        for player in players:
+            if outbox := self._outboxes.get(player.id_):
+                outbox.put(frame, state)
+
+    # ------------------------------------------------------------------ Backplane
+
+    async def _on_frame(self, message: dict[str, Any]) -> None:
+        if self.pool.does_room_exist(message['room_id']):
+            room_players = self.pool.get_room_players(message['room_id'])
+            self._broadcast(room_players, message['frame'])
+
+    async def _on_player_frame(self, message: dict[str, Any]) -> None:
+        if outbox := self._outboxes.get(UUID(message['player_id'])):
+            outbox.put(message['frame'])
 
-        websocket_message = v.WebSocketMessage(payload=action)
-        await player.websocket.send_json(
-            websocket_message.model_dump_json(by_alias=True)
+    async def _on_room_state(self, message: dict[str, Any]) -> None:
+        if not self.pool.does_room_exist(message['room_id']):
+            return
+
+        room_state = v.RoomState.model_validate(message['state'])
+        room = self.pool.get_room(room_id=message['room_id'])
+        apply_room_state(room, room_state, self.pool)
+        self._broadcast_room_state(room.id_, room_state)
+
+    async def _on_lobby_state(self, message: dict[str, Any]) -> None:
+        self.lobby_publisher.publish(v.LobbyState.model_validate(message['state']))
+
+    async def _on_player_connected(self, message: dict[str, Any]) -> None:
+        with suppress(KeyError):
+            self.pool.get_player(UUID(message['player']['id']))
+            return  # Already known, e.g. from the sync with another node
+
+        player = player_from_replica(message['player'], self.pool)
+        room_id = message['player']['room_id']
+        if not self.pool.does_room_exist(room_id):
+            room_id = d.LOBBY.id_
+        self.pool.add_player(player, room_id)
+
+    async def _on_player_disconnected(self, message: dict[str, Any]) -> None:
+        with suppress(KeyError):
+            self.pool.remove_player(UUID(message['player_id']))
+
+    async def _on_player_moved(self, message: dict[str, Any]) -> None:
+        player_id = UUID(message['player_id'])
+        with suppress(KeyError):
+            self._move_player(player_id, message['room_id'])
+
+    async def _on_room_created(self, message: dict[str, Any]) -> None:
+        room = room_from_replica(message['room'], self.pool)
+        if not self.pool.does_room_exist(room.id_):
+            self.pool.create_room(room)
+
+    async def _on_room_removed(self, message: dict[str, Any]) -> None:
+        with suppress(KeyError, ValueError):
+            self.pool.remove_room(message['room_id'])
+            self._room_logs.pop(message['room_id'], None)
+
+    async def _on_sync_request(self, message: dict[str, Any]) -> None:
+        """Send the rooms owned by this node and the players connected to it."""
+        owned_rooms = [
+            room_to_replica(room)
+            for room in self.pool.get_rooms()
+            if room.node_id == self.backplane.node_id
+        ]
+        players = [
+            player_to_replica(self.pool.get_player(player_id))
+            for player_id in self._outboxes
+        ]
+        self.backplane.publish(
+            'sync', target=message['origin'], rooms=owned_rooms, players=players
         )
+
+    async def _on_reconnected(self, message: dict[str, Any]) -> None:
+        # Rooms and players of the messages lost meanwhile are sent again
+        self.request_sync()
+
+    async def _on_sync(self, message: dict[str, Any]) -> None:
+        for room_data in message['rooms']:
+            await self._on_room_created({'room': room_data})
+            for player_data in room_data['players']:
+                await self._on_player_connected({'player': player_data})
+        for player_data in message['players']:
+            await self._on_player_connected({'player': player_data})
+
+        # Rooms were published to the lobby before this node joined, so they're
+        # missing from its lobby index and views
+        rooms: dict[int, v.RoomOut | None] = {}
+        for room_data in message['rooms']:
+            with suppress(KeyError):
+                room = self.pool.get_room(room_id=room_data['id'])
+                rooms[room.id_] = v.RoomOut(
+                    players_no=self.pool.count_room_players(room.id_),
+                    owner_name=room.owner.name,
+                    **room.to_dict(),
+                )
+        if rooms:
+            self.lobby_publisher.publish(v.LobbyState(rooms=rooms))
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import AsyncGenerator
 
-from sqlalchemy import select
+from sqlalchemy import exc, select, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -13,16 +15,65 @@ from sqlalchemy.ext.asyncio import (
 import src.schemas.database as db
 from config import get_config
 
-engine = create_async_engine(get_config().DATABASE_URI)
+engine = create_async_engine(
+    get_config().DATABASE_URI,
+    pool_size=get_config().DB_POOL_SIZE,
+    max_overflow=get_config().DB_MAX_OVERFLOW,
+    pool_timeout=get_config().DB_POOL_TIMEOUT,
+)
 async_session = async_sessionmaker(bind=engine, autocommit=False, autoflush=True)
 
 
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0  # Checkouts which gave up waiting after `DB_POOL_TIMEOUT`
+    total_wait: float = 0.0  # seconds
+    max_wait: float = 0.0  # seconds
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+    @property
+    def checked_out(self) -> int:
+        """Get the number of connections currently in use."""
+        return engine.pool.checkedout()  # type: ignore
+
+    @property
+    def overflow(self) -> int:
+        """Get the number of connections open beyond the pool's size."""
+        return max(0, engine.pool.overflow())  # type: ignore
+
+
+pool_stats = PoolStats()
+
+
+async def begin_session(session: AsyncSession) -> None:
+    """
+    Begin the session's transaction, checking out its connection right away, so the
+    time spent waiting for the pool is measured.
+    """
+    await session.begin()
+    started_on = time.perf_counter()
+    try:
+        await session.connection()
+    except exc.TimeoutError:
+        pool_stats.timeouts += 1
+        raise
+
+    elapsed = time.perf_counter() - started_on
+    pool_stats.checkouts += 1
+    pool_stats.total_wait += elapsed
+    pool_stats.max_wait = max(pool_stats.max_wait, elapsed)
+
+
 @asynccontextmanager
 async def init_db_session() -> AsyncGenerator[AsyncSession, None]:
     """A `get_db` dependency clone, but can be used as a stand-alone async context manager."""  # noqa: D401
     async with async_session() as session:
         try:
-            await session.begin()
+            await begin_session(session)
             yield session
             await session.commit()
         except Exception:
@@ -36,6 +87,20 @@ async def recreate_database():
         await conn.run_sync(db.Base.metadata.create_all)
 
 
+async def create_missing_tables():
+    """Create tables introduced after the database was initialized, leaving existing ones intact."""
+    async with engine.begin() as conn:
+        await conn.run_sync(db.Base.metadata.create_all, checkfirst=True)
+        # Enum values introduced after their types were created
+        game_status_type = db.Game.__table__.c.status.type.name  # type: ignore
+        await conn.execute(
+            text(
+                f'ALTER TYPE {game_status_type} ADD VALUE IF NOT EXISTS '
+                f"'{db.GameStatusEnum.FAILED.name}'"
+            )
+        )
+
+
 async def create_root_objects():
     """Create a db representations of a lobby chat and the it's necessary owner on server startup."""
     async with init_db_session() as db_session:
@@ -1,6 +1,7 @@
 from datetime import datetime
 from functools import lru_cache
-from typing import Annotated, AsyncGenerator, Literal, cast
+from math import ceil
+from typing import Annotated, AsyncGenerator, Callable, Coroutine, Literal, cast
 from uuid import UUID
 
 from fastapi import (
@@ -16,10 +17,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import src.schemas.database as db
 import src.schemas.domain as d
 from config import Config, get_config
+from src.backplane import backplane
 from src.connection_manager import ConnectionManager
-from src.database import async_session
+from src.database import async_session, begin_session, init_db_session
 from src.game.game import GameManager
 from src.player_room_manager import player_room_pool
+from src.rate_limiter import ActionClassEnum, rate_limiter
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -31,7 +34,7 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     async with async_session() as session:
         try:
-            await session.begin()
+            await begin_session(session)
             yield session
             await session.commit()
         except Exception:
@@ -42,13 +45,25 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
 @lru_cache
 def get_connection_manager() -> ConnectionManager:
     """FastAPI dependency injection function to pass a ConnectionManager instance into endpoints."""
-    return ConnectionManager(pool=player_room_pool)
+    return ConnectionManager(pool=player_room_pool, backplane=backplane)
 
 
 @lru_cache
 def get_game_manager() -> GameManager:
     """FastAPI dependency injection function to pass a GameManager instance into endpoints."""
-    return GameManager()
+    return GameManager(workers=get_config().GAME_WORKERS)
+
+
+async def get_player_id(
+    player_id: Annotated[UUID | Literal[''] | None, Cookie()] = None,
+) -> UUID:
+    """Get ID of the player from auth cookie, without loading the player."""
+    if not player_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Player is not authenticated',
+        )
+    return player_id
 
 
 async def get_player_db(
@@ -71,6 +86,20 @@ async def get_player_db(
     return player_db
 
 
+async def get_websocket_player_db(
+    player_id: Annotated[UUID | Literal[''] | None, Cookie()] = None,
+) -> db.Player:
+    """
+    `get_player_db` for websockets, which live much longer than requests. The player
+    is loaded in a session of its own, released before the connection is accepted,
+    so the connections don't hold on to the database pool.
+    """
+    async with init_db_session() as db_session:
+        player_db = await get_player_db(db_session, player_id)
+        db_session.expunge(player_db)  # Keeps the loaded attributes after the commit
+    return player_db
+
+
 async def get_player(
     response: Response,
     conn_manager: Annotated[ConnectionManager, Depends(get_connection_manager)],
@@ -97,6 +126,23 @@ async def get_player(
     return player
 
 
+def rate_limit(action: ActionClassEnum) -> Callable[..., Coroutine]:
+    """Create a FastAPI dependency rejecting requests of players exceeding the limit."""
+
+    async def check_rate_limit(
+        player: Annotated[d.Player, Depends(get_player)],
+    ) -> None:
+        if not rate_limiter.allow(player.id_, action):
+            retry_after = rate_limiter.retry_after(player.id_, action)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f'Too many {action.value} requests',
+                headers={'Retry-After': str(ceil(retry_after))},
+            )
+
+    return check_rate_limit
+
+
 async def get_room(
     room_id: int,
     player: Annotated[d.Player, Depends(get_player)],
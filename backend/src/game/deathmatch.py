@@ -1,24 +1,37 @@
+import asyncio
 import random
-from datetime import datetime
 from typing import Any, Iterable, cast
 
 import src.schemas.domain as d
 import src.schemas.validation as v
 from config import get_config
-from src.game.utils import check_word_correctness
+from src.game.turn_log import TurnLog
+from src.game.utils import check_word_correctness, fetch_definitions
+from src.misc import DictionaryUnavailableError
 
 
 class OrderedPlayers(list):
-    """Augmented list class which mimics circular singly-linked list. Randomizes the order of players upon instantiation and keeps track of the current player."""
+    """
+    Augmented list class which mimics circular doubly-linked list. Randomizes the order
+    of players upon instantiation and keeps track of the current player.
+
+    The list itself keeps all the players in their original order (it's referenced by
+    `player_idx` and final placings), while the players still in the game are linked
+    into a ring by their list indexes - iterating to the next player, eliminating
+    the current one and counting the remaining ones are all O(1).
+    """
 
     def __init__(self, players: list[d.GamePlayer]) -> None:
         super().__init__(players)
         random.shuffle(self)
 
-        self._current_idx = -1 if len(self) == 0 else 0
-        self.current_place = len(
-            self
-        )  # Place for which players are currently competing
+        size = len(self)
+        self._next_idx = [(idx + 1) % size for idx in range(size)]
+        self._prev_idx = [(idx - 1) % size for idx in range(size)]
+
+        self._current_idx = -1 if size == 0 else 0
+        self.players_in_game = size
+        self.current_place = size  # Place for which players are currently competing
 
     @property
     def current_idx(self) -> int:
@@ -33,29 +46,30 @@ class OrderedPlayers(list):
         return self[self._current_idx]
 
     def next(self) -> None:
-        """Iterate to the next player in the circular manner."""
+        """Iterate to the next player still in the game, in the circular manner."""
         if len(self) == 0:
             raise ValueError('Next player cannot be iterated to for an empty list')
+        if self.players_in_game == 0:
+            raise ValueError('All players are out of the game')
 
-        start_idx = self._current_idx
-        while True:
-            # TODO: This is just wrong, figure out a better way
-            # 1. Might fall into infinite loop
-            # Ugly, weird, needs to handle 1 player / multiplayer game separately
-            self._current_idx = (self._current_idx + 1) % len(self)
-
-            if len(self) != 1 and self._current_idx == start_idx:
-                raise ValueError('All but one player are out of the game')
-            if self.current.in_game:
-                break
-            if all(not player.in_game for player in self):
-                raise ValueError('All players are out of the game')
+        # Eliminated player keeps the link to its successor, so iteration can continue
+        next_idx = self._next_idx[self._current_idx]
+        if len(self) != 1 and next_idx == self._current_idx:
+            raise ValueError('All but one player are out of the game')
+        self._current_idx = next_idx
 
     def remove_current(self) -> None:
         """Remove current player from the game and set his final ranking."""
         self.current.in_game = False
         self.current.place = self.current_place
         self.current_place -= 1
+        self.players_in_game -= 1
+
+        # Unlink the player from the ring of players still in the game
+        prev_idx = self._prev_idx[self._current_idx]
+        next_idx = self._next_idx[self._current_idx]
+        self._next_idx[prev_idx] = next_idx
+        self._prev_idx[next_idx] = prev_idx
 
 
 class Deathmatch:
@@ -63,7 +77,7 @@ class Deathmatch:
         self,
         id_: int,
         room_id: int,
-        players: Iterable[d.Player],
+        players: Iterable[d.GameParticipant],
         rules: d.DeathmatchRules,
     ) -> None:
         self.id_ = id_
@@ -77,14 +91,14 @@ class Deathmatch:
         ]
         self.players = OrderedPlayers(game_players)
 
-        self._turns: list[d.Turn] = []
+        self._turns = TurnLog([player.id_ for player in self.players])
         self._current_turn: d.Turn | None = None
 
         self.words: set[str] = set()  # Quick lookup for used words
         self.events: list[d.GameEvent] = []  # Must be emptied after each turn
 
     @property
-    def turns(self) -> list[d.Turn]:
+    def turns(self) -> TurnLog:
         return self._turns
 
     @turns.setter
@@ -102,7 +116,7 @@ class Deathmatch:
     @property
     def time_left_in_turn(self) -> float:
         current_turn = cast(d.Turn, self.current_turn)
-        time_elapsed = datetime.utcnow() - current_turn.started_on
+        time_elapsed = self._turns.now() - current_turn.started_on
         return self.rules.round_time - time_elapsed.total_seconds()
 
     def start(self) -> v.StartGameState:
@@ -130,7 +144,7 @@ class Deathmatch:
             self.players.next()
 
         current_turn = d.Turn(
-            started_on=datetime.utcnow(), player_id=self.players.current.id_
+            started_on=self._turns.now(), player_id=self.players.current.id_
         )
         self._current_turn = current_turn
 
@@ -140,24 +154,21 @@ class Deathmatch:
             ),
         )
 
-    def end_turn_in_time(self, word: str) -> v.EndTurnState:
+    async def end_turn_in_time(self, word: str) -> v.EndTurnState:
         if self.state != d.GameStateEnum.STARTED_TURN:
             raise ValueError(f'Turn cannot be ended in the {self.state} game state')
         self.state = d.GameStateEnum.ENDED_TURN
 
         current_turn = cast(d.Turn, self.current_turn)
-        current_turn.ended_on = datetime.utcnow()
-        current_turn.word, current_turn.info = self._validate_word(word)
+        current_turn.ended_on = self._turns.now()
+        current_turn.word, current_turn.info = await self._validate_word(word)
 
         self._evaluate_turn()
-        self._turns.append(current_turn)
+        self._turns.append(current_turn, self.players.current_idx)
 
         return v.EndTurnState(
             players=self.players,
-            current_turn=v.TurnOut(
-                player_idx=self.players.current_idx,
-                **current_turn.to_dict(),
-            ),
+            current_turn=self._turns.to_turn_out(len(self._turns) - 1),
         )
 
     def end_turn_timed_out(self) -> v.EndTurnState:
@@ -166,7 +177,7 @@ class Deathmatch:
         self.state = d.GameStateEnum.ENDED_TURN
 
         current_turn = cast(d.Turn, self.current_turn)
-        current_turn.ended_on = datetime.utcnow()
+        current_turn.ended_on = self._turns.now()
         current_turn.word = None
         current_turn.info = 'Turn time exceeded'
 
@@ -177,16 +188,30 @@ class Deathmatch:
         )
 
         self._evaluate_turn()
-        self.turns.append(current_turn)
+        self._turns.append(current_turn, self.players.current_idx)
 
         return v.EndTurnState(
             players=self.players,
-            current_turn=v.TurnOut(
-                player_idx=self.players.current_idx,
-                **current_turn.to_dict(),
-            ),
+            current_turn=self._turns.to_turn_out(len(self._turns) - 1),
         )
 
+    async def define_word(self, turn_idx: int) -> v.DefinedWordState | None:
+        """
+        Fetch definitions of the correct word passed in the given turn. Meant to run in
+        the background, after the turn has already ended.
+        """
+        word = self._turns.get_word(turn_idx)
+        if word is None or not word.is_correct or word.definitions is not None:
+            return None
+
+        definitions = await fetch_definitions(word.content)
+        if definitions is None:
+            return None
+
+        self._turns.set_definitions(turn_idx, definitions)
+        word.definitions = definitions  # A copy, the log stores the words columnar
+        return v.DefinedWordState(turn_idx=turn_idx, word=word)
+
     def end(self) -> v.EndGameState:
         if self.state != d.GameStateEnum.ENDED_TURN:
             raise ValueError(f'Game cannot be ended in the {self.state} game state')
@@ -204,17 +229,13 @@ class Deathmatch:
 
     def is_finished(self) -> bool:
         # Handle case with just 1 player playing
-        if len(self.players) == 1 and not self.players.current.in_game:
-            return True
+        if len(self.players) == 1:
+            return self.players.players_in_game == 0
 
         # Handle case with more than 1 player playing
-        players_in_game = len([player for player in self.players if player.in_game])
-        if len(self.players) > 1 and players_in_game == 1:
-            return True
-
-        return False
+        return self.players.players_in_game == 1
 
-    def _validate_word(self, word: str) -> tuple[d.Word, str]:
+    async def _validate_word(self, word: str) -> tuple[d.Word, str]:
         word = word.lower()
         if not self._is_compatible_with_previous_word(word):
             return (
@@ -222,33 +243,38 @@ class Deathmatch:
                 'Word does not start with the last letter of the previous word',
             )
 
-        word_obj = check_word_correctness(word)
+        # Bound the lookup by the time the player would have had left in the turn
+        validation_time = max(
+            self.time_left_in_turn, get_config().MIN_WORD_VALIDATION_TIME
+        )
+        deadline = asyncio.get_running_loop().time() + validation_time
+        try:
+            word_obj = await check_word_correctness(word, deadline)
+            is_verified = True
+        except DictionaryUnavailableError:
+            is_correct = get_config().WORD_UNVERIFIED_POLICY == 'accept'
+            word_obj = d.Word(content=word, is_correct=is_correct)
+            is_verified = False
+
         if not word_obj.is_correct:
+            if not is_verified:
+                return word_obj, 'Word could not be verified'
             return word_obj, 'Word does not exist'
 
         if word in self.words:
             return d.Word(content=word, is_correct=False), 'Word has already been used'
 
         self.words.add(word)
+        if not is_verified:
+            return word_obj, 'Word could not be verified, but has been accepted'
         return word_obj, 'Word is correct'
 
     def _is_compatible_with_previous_word(self, word: str) -> bool:
         """Check if the word is valid with the previous word (it starts with the last letter of the previous word)."""
-        if len(self.turns) == 0:
+        previous_word = self._turns.last_word
+        if previous_word is None:
             return True
-
-        # Find the last turn in which the word was passed
-        for i in range(len(self.turns) - 1, -1, -1):
-            turn = self.turns[i]
-            if not turn.word:
-                continue
-
-            previous_word = turn.word.content
-            if word.startswith(previous_word[-1]):
-                return True
-            break
-
-        return False
+        return word.startswith(previous_word[-1])
 
     def _evaluate_turn(self) -> None:
         current_turn = cast(d.Turn, self._current_turn)
@@ -0,0 +1,92 @@
+import mmap
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from config import get_config
+
+# Compact, read-only word index format (all integers are little-endian uint32):
+#   MAGIC | VERSION | word count (n) | n + 1 offsets into the blob | blob
+# The blob holds lowercased, UTF-8 encoded words sorted bytewise and concatenated
+# without separators - word `i` spans `blob[offsets[i]:offsets[i + 1]]`.
+MAGIC = b'WCGD'
+VERSION = 1
+_uint32 = struct.Struct('<I')
+_header = struct.Struct('<4sII')
+
+
+class Dictionary:
+    """
+    Word index memory-mapped from a file built with `Dictionary.build`. Membership test
+    is a binary search over the mapping, so it is O(log n) and never touches network.
+
+    The file is mapped read-only, so all the uvicorn workers on the host share the same
+    physical pages from the OS page cache instead of each loading its own copy.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self._size = _header.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f'File "{path}" is not a valid word index')
+
+        self._offsets_start = _header.size
+        self._blob_start = self._offsets_start + (self._size + 1) * _uint32.size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        target = word.lower().encode()
+
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            current = self._word_at(middle)
+            if current == target:
+                return True
+            if current < target:
+                low = middle + 1
+            else:
+                high = middle
+        return False
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def _word_at(self, idx: int) -> bytes:
+        offset_pos = self._offsets_start + idx * _uint32.size
+        (start,) = _uint32.unpack_from(self._mmap, offset_pos)
+        (end,) = _uint32.unpack_from(self._mmap, offset_pos + _uint32.size)
+        return self._mmap[self._blob_start + start : self._blob_start + end]
+
+    @staticmethod
+    def build(words: Iterable[str], path: Path | str) -> int:
+        """Compile the words into an index file. Returns the number of indexed words."""
+        encoded_words = sorted(
+            {word.strip().lower().encode() for word in words if word.strip()}
+        )
+
+        offsets, position = [0], 0
+        for encoded_word in encoded_words:
+            position += len(encoded_word)
+            offsets.append(position)
+
+        with open(path, 'wb') as f:
+            f.write(_header.pack(MAGIC, VERSION, len(encoded_words)))
+            f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+            f.writelines(encoded_words)
+        return len(encoded_words)
+
+
+@lru_cache
+def get_dictionary() -> Dictionary | None:
+    """Return the local word index, or None if it's not configured."""
+    path = get_config().DICTIONARY_INDEX_PATH
+    return Dictionary(path) if path else None
@@ -1,51 +1,162 @@
-from typing import Iterable
+import asyncio
+from typing import Iterable, Protocol
+from uuid import UUID
 
 import src.schemas.domain as d
+import src.schemas.validation as v
+from config import get_config
+from src.connection_manager import encode_message
 from src.game.deathmatch import Deathmatch
+from src.game.scheduler import scheduler
+from src.game.shards import ShardPool
+from src.misc import run_in_background
+
+
+class GameOutput(Protocol):
+    """Receiver of everything a running game emits, e.g. the room hosting the game."""
+
+    async def send_state(self, frame: str) -> None:
+        """Publish a `GameState` websocket message, encoded with `encode_message`."""
+        ...
+
+    async def send_events(self, events: list[d.GameEvent]) -> None: ...
+
+    async def finish(self, turn_rows: list[dict]) -> None:
+        """Finalize the game, given its turns exported as `db.Turn` rows."""
+        ...
+
+    async def fail(self, reason: str) -> None:
+        """Abandon the game, which crashed before it could finish."""
+        ...
+
+
+async def run_game(
+    game: Deathmatch, input_buffer: d.WordInputBuffer, output: GameOutput
+) -> None:
+    await output.send_state(encode_message(game.start()))
+
+    await output.send_state(encode_message(game.wait()))
+    await scheduler.sleep(get_config().GAME_START_DELAY)
+
+    while True:
+        await output.send_state(encode_message(game.start_turn()))
+
+        try:
+            word_input = await scheduler.wait_for(
+                input_buffer.get(), game.time_left_in_turn
+            )
+        except asyncio.TimeoutError:
+            end_turn_state = game.end_turn_timed_out()
+        else:
+            end_turn_state = await game.end_turn_in_time(word_input.word)
+        await output.send_state(encode_message(end_turn_state))
+        # Definitions are not necessary to end the turn, send them as a follow-up
+        run_in_background(send_word_definitions(game, len(game.turns) - 1, output))
+        await output.send_events(list(game.events))
+
+        if game.is_finished():
+            break
+
+        await output.send_state(encode_message(game.wait()))
+        await scheduler.sleep(get_config().TURN_START_DELAY)
+
+    end_game_state = game.end()
+    await output.send_events(list(game.events))
+    await output.send_state(encode_message(end_game_state))
+
+    await output.finish(game.turns.to_db_dicts(game.id_))
+
+
+async def send_word_definitions(
+    game: Deathmatch, turn_idx: int, output: GameOutput
+) -> None:
+    """Send definitions of the word passed in the turn, once they are fetched."""
+    defined_word_state = await game.define_word(turn_idx)
+    if defined_word_state is not None:
+        await output.send_state(encode_message(defined_word_state))
+
+
+def create_game(
+    game_id: int,
+    room_id: int,
+    rules: d.DeathmatchRules,
+    players: Iterable[d.GameParticipant],
+) -> Deathmatch:
+    if rules.type_ == d.GameTypeEnum.DEATHMATCH:
+        return Deathmatch(game_id, room_id, players, rules)
+    else:
+        raise NotImplementedError('Unsupported game type')
+
+
+class LocalGames:
+    """Games running as tasks in the current process."""
+
+    def __init__(self) -> None:
+        self.games: dict[int, tuple[Deathmatch, d.WordInputBuffer]] = {}
+
+    def start(self, game: Deathmatch, output: GameOutput) -> asyncio.Task:
+        input_buffer = d.WordInputBuffer()
+        self.games[game.id_] = (game, input_buffer)
+        task = run_in_background(run_game(game, input_buffer, output))
+
+        def _on_done(task: asyncio.Task) -> None:
+            self.games.pop(game.id_, None)
+            if not task.cancelled() and (exc := task.exception()):
+                run_in_background(output.fail(repr(exc)))
+
+        task.add_done_callback(_on_done)
+        return task
+
+    async def submit_input(self, player_id: UUID, word_input: v.WordInput) -> None:
+        if word_input.game_id not in self.games:
+            return
+        game, input_buffer = self.games[word_input.game_id]
+        if game.players.current.id_ != player_id:
+            return  # TODO: Handle malicious attempts to send game input
+        await input_buffer.put(word_input)
 
 
 class GameManager:
     """
-    Manages active games, storing them in memory. Upon game finalization, the game is
-    removed from the manager and returned to be persisted in DB.
+    Manages active games. Games either run in the current process, or, if `workers` is
+    set, they are placed on a pool of worker processes, sharded by room ID. Either way
+    the game's output is delivered to the `GameOutput` passed on the game start.
     """
 
-    def __init__(self) -> None:
-        self.games: dict[int, Deathmatch] = {}
+    def __init__(self, workers: int = 0) -> None:
+        self.workers = workers
+        self._local_games = LocalGames()
+        self._shards: ShardPool | None = ShardPool(workers) if workers else None
+
+    def start_workers(self) -> None:
+        if self._shards is not None:
+            self._shards.start()
 
-    def get(self, game_id: int) -> Deathmatch:
-        return self.games[game_id]
+    async def stop_workers(self) -> None:
+        if self._shards is not None:
+            await self._shards.stop()
 
-    def create(
+    def start(
         self,
         game_id: int,
         room_id: int,
         rules: d.DeathmatchRules,
         players: Iterable[d.Player],
-    ) -> Deathmatch:
-        if rules.type_ == d.GameTypeEnum.DEATHMATCH:
-            game = self.games[game_id] = Deathmatch(game_id, room_id, players, rules)
-            return game
+        output: GameOutput,
+    ) -> None:
+        participants = [
+            d.GameParticipant(id_=player.id_, name=player.name) for player in players
+        ]
+        if self._shards is None:
+            self._local_games.start(
+                create_game(game_id, room_id, rules, participants), output
+            )
         else:
-            raise NotImplementedError('Unsupported game type')
-
-    def end(self, game_id: int) -> Deathmatch:
-        game = self.games[game_id]
-        del self.games[game_id]
-        return game
-
+            self._shards.start_game(game_id, room_id, rules, participants, output)
 
-# TODO: Build and use abstract interface when you figure out the interface
-# class Game(Protocol):
-#     id_: int
-#     status: db.GameStatusEnum
-#     turns: list[s.Turn]
-
-#     def __init__(self, rules: s.Rules):
-#         ...
-
-#     def start_turn(self) -> s.TurnResults:
-#         ...
-
-#     def process_turn(self, word: str) -> s.TurnResults:
-#         ...
+    async def submit_input(self, player_id: UUID, word_input: v.WordInput) -> None:
+        """Pass the word input to the game, if it's the player's turn."""
+        if self._shards is None:
+            await self._local_games.submit_input(player_id, word_input)
+        else:
+            self._shards.submit_input(player_id, word_input)
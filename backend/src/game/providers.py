@@ -0,0 +1,276 @@
+import asyncio
+import time
+from typing import Any, Protocol
+
+import httpx
+from async_timeout import timeout_at
+
+import src.schemas.domain as d
+from config import get_config
+from src.misc import DictionaryUnavailableError
+
+# Shared, pooled client - keeps connections to the dictionary APIs alive between turns,
+# so consecutive lookups skip the TCP/TLS handshake
+client = httpx.AsyncClient(
+    timeout=httpx.Timeout(
+        get_config().DICTIONARY_API_READ_TIMEOUT,
+        connect=get_config().DICTIONARY_API_CONNECT_TIMEOUT,
+    ),
+    limits=httpx.Limits(
+        max_connections=get_config().DICTIONARY_API_MAX_CONNECTIONS,
+        max_keepalive_connections=get_config().DICTIONARY_API_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=get_config().DICTIONARY_API_KEEPALIVE_EXPIRY,
+    ),
+)
+
+
+async def close_dictionary_client() -> None:
+    await client.aclose()
+
+
+class DictionaryProvider(Protocol):
+    name: str
+
+    async def lookup(self, word: str) -> d.Word:
+        """Look the word up, raising `DictionaryUnavailableError` if it's not possible."""
+        ...
+
+
+class MerriamWebsterProvider:
+    name = 'merriam-webster'
+    accepted_func_labels = [
+        'noun',
+        'verb',
+        'adjective',
+        'adverb',
+    ]
+
+    def __init__(self, url: str, api_key: str) -> None:
+        self.url = url
+        self.api_key = api_key
+
+    async def lookup(self, word: str) -> d.Word:
+        data = await _get_json(self.url.format(word=word, api_key=self.api_key))
+
+        # Mirriam-Webster returns a list of similar words if the word is not found
+        if any(isinstance(elem, str) for elem in data):
+            return d.Word(content=word, is_correct=False)
+
+        filtered_definitions = []
+        for definition in data:
+            # Filter out words finds without functional labels
+            if not (
+                definition.get('fl') and definition['fl'] in self.accepted_func_labels
+            ):
+                continue
+
+            # Filter out any definitions which are not the exact match - Mirriam-Webster
+            # returns similar words (e.g 'god' -> 'god-awful'). In case multiple
+            # definitions exist, it will index them using a colon (e.g 'god:1', 'god:2')
+            if not definition['meta']['id'].lower().split(':')[0] == word:
+                continue
+
+            filtered_definitions.append(definition)
+
+        description: list[tuple[str, list[str]]] = []
+        for definition, _ in zip(filtered_definitions, range(3)):
+            shortdefs: list[str] = [
+                '- ' + shortdef if i > 0 else shortdef
+                for i, shortdef in enumerate(definition['shortdef'])
+            ]
+            part_of_speech: str = definition['fl']
+            description.append((part_of_speech, shortdefs))
+
+        return d.Word(content=word, is_correct=True, definitions=description)
+
+
+class FreeDictionaryProvider:
+    """Provider for APIs following the https://dictionaryapi.dev response format."""
+
+    name = 'free-dictionary'
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+    async def lookup(self, word: str) -> d.Word:
+        data = await _get_json(self.url.format(word=word), not_found_ok=True)
+        if data is None:
+            return d.Word(content=word, is_correct=False)
+
+        description: list[tuple[str, list[str]]] = []
+        for entry in data:
+            for meaning in entry.get('meanings', []):
+                if len(description) == 3:
+                    break
+                shortdefs = [
+                    '- ' + definition['definition']
+                    if i > 0
+                    else definition['definition']
+                    for i, definition in enumerate(meaning['definitions'][:3])
+                ]
+                description.append((meaning['partOfSpeech'], shortdefs))
+
+        return d.Word(content=word, is_correct=True, definitions=description)
+
+
+async def _get_json(url: str, not_found_ok: bool = False) -> Any:
+    try:
+        response = await client.get(url)
+    except httpx.HTTPError as e:
+        raise DictionaryUnavailableError(f'Dictionary API request failed: {e!r}') from e
+
+    if not_found_ok and response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise DictionaryUnavailableError(
+            f'Dictionary API responded with status {response.status_code}'
+        )
+
+    try:
+        return response.json()
+    except ValueError as e:
+        raise DictionaryUnavailableError('Dictionary API returned invalid JSON') from e
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency. After `failure_threshold` consecutive failures
+    the circuit opens and calls are rejected for `reset_timeout` seconds. Then a single
+    trial call is let through - its success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        self.opened_on: float | None = None
+        self._trial_in_progress = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_on is not None
+
+    def allow(self) -> bool:
+        if self.opened_on is None:
+            return True
+        if time.monotonic() - self.opened_on < self.reset_timeout:
+            return False
+        if self._trial_in_progress:
+            return False
+
+        self._trial_in_progress = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_on = None
+        self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_progress or self.failures >= self.failure_threshold:
+            self.opened_on = time.monotonic()
+        self._trial_in_progress = False
+
+    def release_trial(self) -> None:
+        """Let another trial call through, as the last one ended with no outcome."""
+        self._trial_in_progress = False
+
+
+class GuardedProvider:
+    """
+    Wraps a remote provider with a circuit breaker and hedged retries - if an attempt
+    doesn't respond within `hedge_delay`, or fails, another one is fired and the first
+    successful response wins. All attempts are bound by the lookup's deadline.
+    """
+
+    def __init__(
+        self,
+        provider: DictionaryProvider,
+        breaker: CircuitBreaker,
+        hedge_delay: float,
+        max_attempts: int,
+    ) -> None:
+        self.provider = provider
+        self.breaker = breaker
+        self.hedge_delay = hedge_delay
+        self.max_attempts = max_attempts
+
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+    async def lookup(self, word: str, deadline: float | None = None) -> d.Word:
+        if not self.breaker.allow():
+            raise DictionaryUnavailableError(f'Circuit of "{self.name}" is open')
+
+        try:
+            async with timeout_at(deadline):
+                word_obj = await self._hedged_lookup(word)
+        except (DictionaryUnavailableError, asyncio.TimeoutError) as e:
+            self.breaker.record_failure()
+            raise DictionaryUnavailableError(f'"{self.name}" lookup failed') from e
+        except BaseException:
+            # Cancelled (turn ended, hedged sibling won) or failed unexpectedly
+            self.breaker.release_trial()
+            raise
+
+        self.breaker.record_success()
+        return word_obj
+
+    async def _hedged_lookup(self, word: str) -> d.Word:
+        attempts: set[asyncio.Task] = set()
+        error: BaseException | None = None
+        try:
+            for attempt_no in range(1, self.max_attempts + 1):
+                attempts.add(asyncio.create_task(self.provider.lookup(word)))
+                is_last_attempt = attempt_no == self.max_attempts
+
+                while attempts:
+                    done, attempts = await asyncio.wait(
+                        attempts,
+                        timeout=None if is_last_attempt else self.hedge_delay,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    for attempt in done:
+                        if attempt.exception() is None:
+                            return attempt.result()
+                        error = attempt.exception()
+
+                    # Hedge delay elapsed or an attempt failed - fire another one
+                    if not is_last_attempt:
+                        break
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+        raise DictionaryUnavailableError(
+            f'All "{self.name}" lookup attempts failed'
+        ) from error
+
+
+def create_remote_providers() -> list[GuardedProvider]:
+    """Build the remote part of the provider chain, in the order of precedence."""
+    config = get_config()
+    providers: list[DictionaryProvider] = [
+        MerriamWebsterProvider(config.DICTIONARY_API_URL, config.DICTIONARY_API_KEY)
+    ]
+    if config.DICTIONARY_SECONDARY_API_URL:
+        providers.append(FreeDictionaryProvider(config.DICTIONARY_SECONDARY_API_URL))
+
+    return [
+        GuardedProvider(
+            provider,
+            CircuitBreaker(
+                config.DICTIONARY_BREAKER_FAILURE_THRESHOLD,
+                config.DICTIONARY_BREAKER_RESET_TIMEOUT,
+            ),
+            hedge_delay=config.DICTIONARY_HEDGE_DELAY,
+            max_attempts=config.DICTIONARY_MAX_ATTEMPTS,
+        )
+        for provider in providers
+    ]
+
+
+remote_providers = create_remote_providers()
@@ -0,0 +1,139 @@
+import asyncio
+import math
+import time
+from typing import Any, Awaitable, Callable
+
+from config import get_config
+
+
+class TimerHandle:
+    __slots__ = ('deadline_tick', 'callback', 'args', 'cancelled')
+
+    def __init__(self, deadline_tick: int, callback: Callable, args: tuple) -> None:
+        self.deadline_tick = deadline_tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel driving the timers of all the games from a single task.
+
+    Timers are bucketed by their deadline tick into wheels of `wheel_size` slots - the
+    first wheel spans `wheel_size` ticks, every next one `wheel_size` times more. When
+    a lower wheel completes a revolution, the timers from the next slot of the higher
+    wheel are cascaded down, so scheduling and cancelling a timer are O(1). Time is
+    measured with the monotonic clock and timers fire at most one tick late.
+    """
+
+    def __init__(self, tick: float, wheel_size: int = 256, levels: int = 4) -> None:
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.levels = levels
+
+        self._wheels: list[list[list[TimerHandle]]] = [
+            [[] for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        self._current_tick = 0
+        self._started_on = time.monotonic()
+        self._driver: asyncio.Task | None = None
+
+    def call_later(self, delay: float, callback: Callable, *args: Any) -> TimerHandle:
+        """Schedule the callback to be called after `delay` seconds."""
+        if self._driver is None:
+            self.start()
+
+        elapsed = time.monotonic() - self._started_on
+        deadline_tick = max(
+            math.ceil((elapsed + delay) / self.tick), self._current_tick + 1
+        )
+        handle = TimerHandle(deadline_tick, callback, args)
+        self._insert(handle)
+        return handle
+
+    async def sleep(self, delay: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        handle = self.call_later(delay, _resolve, future)
+        try:
+            await future
+        finally:
+            handle.cancel()
+
+    async def wait_for(self, awaitable: Awaitable, timeout: float) -> Any:
+        """`asyncio.wait_for` equivalent, timed by the wheel instead of the event loop."""
+        task = asyncio.ensure_future(awaitable)
+        timed_out = False
+
+        def _on_timeout() -> None:
+            nonlocal timed_out
+            timed_out = True
+            task.cancel()
+
+        handle = self.call_later(timeout, _on_timeout)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if timed_out:
+                raise asyncio.TimeoutError from None
+            raise
+        finally:
+            handle.cancel()
+
+    def start(self) -> None:
+        self._started_on = time.monotonic()
+        self._current_tick = 0
+        self._driver = asyncio.create_task(self._drive())
+
+    async def stop(self) -> None:
+        if self._driver is not None:
+            self._driver.cancel()
+            self._driver = None
+
+    async def _drive(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            # Catch up on all the ticks which passed, if the event loop was lagging
+            target_tick = int((time.monotonic() - self._started_on) / self.tick)
+            while self._current_tick < target_tick:
+                self._advance()
+
+    def _advance(self) -> None:
+        self._current_tick += 1
+
+        # Cascade timers from higher wheels, whenever the lower wheel completes a cycle
+        for level in range(1, self.levels):
+            span = self.wheel_size**level
+            if self._current_tick % span != 0:
+                break
+            slot = (self._current_tick // span) % self.wheel_size
+            handles, self._wheels[level][slot] = self._wheels[level][slot], []
+            for handle in handles:
+                if not handle.cancelled:
+                    self._insert(handle)
+
+        slot = self._current_tick % self.wheel_size
+        handles, self._wheels[0][slot] = self._wheels[0][slot], []
+        for handle in handles:
+            if not handle.cancelled:
+                handle.callback(*handle.args)
+
+    def _insert(self, handle: TimerHandle) -> None:
+        ticks_left = handle.deadline_tick - self._current_tick
+        for level in range(self.levels):
+            span = self.wheel_size**level
+            if ticks_left < span * self.wheel_size or level == self.levels - 1:
+                slot = (handle.deadline_tick // span) % self.wheel_size
+                self._wheels[level][slot].append(handle)
+                return
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+scheduler = TimingWheel(get_config().SCHEDULER_TICK)
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import getLogger
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import TYPE_CHECKING, Iterable
+from uuid import UUID
+
+import src.schemas.domain as d
+import src.schemas.validation as v
+from src.misc import run_in_background
+
+if TYPE_CHECKING:
+    from src.game.game import GameOutput
+
+# Opcodes of the messages exchanged with shard workers. Messages are plain tuples
+# `(opcode, game_id, *payload)`, pickled by the `Connection`. Game states cross the
+# channel already encoded as text frames, so the front process only forwards them.
+START_GAME, WORD_INPUT, STOP = 1, 2, 3  # front process -> worker
+STATE, EVENTS, FINISHED, FAILED = 11, 12, 13, 14  # worker -> front process
+
+SHUTDOWN_TIMEOUT = 5  # seconds
+RESPAWN_DELAY = 1  # seconds, Keeps a worker crashing on start from spinning
+
+
+class _PipeWriter:
+    """
+    Sends messages over a pipe from a single thread, keeping them in order. Pipe writes
+    block once the pipe is full, so they're kept off the event loop.
+    """
+
+    def __init__(self, conn: Connection, name: str) -> None:
+        self.conn = conn
+        self.name = name
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix=name)
+
+    def send(self, message: tuple) -> Future:
+        future = self._executor.submit(self.conn.send, message)
+        future.add_done_callback(self._on_sent)
+        return future
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_sent(self, future: Future) -> None:
+        if not future.cancelled() and (exc := future.exception()):
+            getLogger('uvicorn').error(
+                f'GAME SHARD: Message of {self.name} was not sent: {exc!r}'
+            )
+
+
+class _Shard:
+    def __init__(self, idx: int, process: BaseProcess, conn: Connection) -> None:
+        self.idx = idx
+        self.process = process
+        self.conn = conn
+        self.alive = True
+        self.writer = _PipeWriter(conn, process.name)
+
+    def send(self, message: tuple) -> None:
+        self.writer.send(message)
+
+    def close(self) -> None:
+        self.writer.close()
+        self.conn.close()
+
+
+class _GameChannel:
+    """Delivers messages of a single game to its output, preserving their order."""
+
+    def __init__(self, output: GameOutput) -> None:
+        self.output = output
+        self.inbox: asyncio.Queue[tuple] = asyncio.Queue()
+        self.task = run_in_background(self._deliver())
+
+    async def _deliver(self) -> None:
+        while True:
+            opcode, game_id, *payload = await self.inbox.get()
+            if opcode == STATE:
+                await self.output.send_state(payload[0])
+            elif opcode == EVENTS:
+                await self.output.send_events(payload[0])
+            elif opcode == FINISHED:
+                await self.output.finish(payload[0])
+                return
+            elif opcode == FAILED:
+                getLogger('uvicorn').error(
+                    f'GAME SHARD: Game {game_id} failed: {payload[0]}'
+                )
+                await self.output.fail(payload[0])
+                return
+
+
+class ShardPool:
+    """
+    Front process side of the pool of worker processes running the games. Games are
+    placed on workers by their room ID, word inputs are forwarded to the worker hosting
+    the game and the game's output is relayed back to the `GameOutput` of the game.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._shards: list[_Shard] = []
+        self._game_shards: dict[int, _Shard] = {}
+        self._channels: dict[int, _GameChannel] = {}
+        self._respawns: dict[int, asyncio.TimerHandle] = {}
+
+    def start(self) -> None:
+        self._shards = [self._spawn(shard_idx) for shard_idx in range(self.workers)]
+
+    async def stop(self) -> None:
+        for respawn in self._respawns.values():
+            respawn.cancel()
+        self._respawns.clear()
+        await asyncio.gather(*(self._stop_shard(shard) for shard in self._shards))
+        self._shards.clear()
+
+    def start_game(
+        self,
+        game_id: int,
+        room_id: int,
+        rules: d.DeathmatchRules,
+        players: Iterable[d.GameParticipant],
+        output: GameOutput,
+    ) -> None:
+        channel = self._channels[game_id] = _GameChannel(output)
+        channel.task.add_done_callback(lambda _: self._forget_game(game_id))
+
+        shard = self._place(room_id)
+        if shard is None:
+            channel.inbox.put_nowait((FAILED, game_id, 'No game worker is running'))
+            return
+        self._game_shards[game_id] = shard
+        shard.send((START_GAME, game_id, room_id, rules, list(players)))
+
+    def submit_input(self, player_id: UUID, word_input: v.WordInput) -> None:
+        shard = self._game_shards.get(word_input.game_id)
+        if shard is not None and shard.alive:
+            shard.send((WORD_INPUT, word_input.game_id, player_id, word_input.word))
+
+    def _spawn(self, shard_idx: int) -> _Shard:
+        context = multiprocessing.get_context('spawn')
+        conn, worker_conn = context.Pipe()
+        process = context.Process(
+            target=serve_shard,
+            args=(worker_conn,),
+            name=f'game-shard-{shard_idx}',
+            daemon=True,
+        )
+        process.start()
+        worker_conn.close()
+
+        shard = _Shard(shard_idx, process, conn)
+        asyncio.get_running_loop().add_reader(conn.fileno(), self._receive, shard)
+        return shard
+
+    def _place(self, room_id: int) -> _Shard | None:
+        """Get the shard of the room, or another one while the room's one is respawned."""
+        shard = self._shards[room_id % len(self._shards)]
+        if shard.alive:
+            return shard
+        live_shards = [shard for shard in self._shards if shard.alive]
+        return live_shards[room_id % len(live_shards)] if live_shards else None
+
+    async def _stop_shard(self, shard: _Shard) -> None:
+        if not shard.alive:
+            return  # Already closed when it exited
+        asyncio.get_running_loop().remove_reader(shard.conn.fileno())
+        shard.send((STOP, None))
+        await asyncio.to_thread(shard.process.join, SHUTDOWN_TIMEOUT)
+        if shard.process.is_alive():
+            shard.process.terminate()
+        shard.close()
+
+    def _receive(self, shard: _Shard) -> None:
+        try:
+            while shard.conn.poll():
+                message = shard.conn.recv()
+                if channel := self._channels.get(message[1]):
+                    channel.inbox.put_nowait(message)
+        except (EOFError, OSError):
+            self._on_exit(shard)
+
+    def _on_exit(self, shard: _Shard) -> None:
+        loop = asyncio.get_running_loop()
+        loop.remove_reader(shard.conn.fileno())
+        shard.alive = False
+        shard.close()
+        run_in_background(asyncio.to_thread(shard.process.join, SHUTDOWN_TIMEOUT))
+        getLogger('uvicorn').error(
+            f'GAME SHARD: {shard.process.name} exited unexpectedly, '
+            f'respawning it in {RESPAWN_DELAY}s'
+        )
+
+        # Games of the worker are lost, fail them, so their rooms are released
+        for game_id, game_shard in list(self._game_shards.items()):
+            if game_shard is shard and (channel := self._channels.get(game_id)):
+                channel.inbox.put_nowait(
+                    (FAILED, game_id, f'{shard.process.name} exited')
+                )
+
+        self._respawns[shard.idx] = loop.call_later(
+            RESPAWN_DELAY, self._respawn, shard.idx
+        )
+
+    def _respawn(self, shard_idx: int) -> None:
+        del self._respawns[shard_idx]
+        self._shards[shard_idx] = self._spawn(shard_idx)
+
+    def _forget_game(self, game_id: int) -> None:
+        self._game_shards.pop(game_id, None)
+        self._channels.pop(game_id, None)
+
+
+class ShardOutput:
+    """Worker process side `GameOutput`, relaying the game output to the front process."""
+
+    def __init__(self, writer: _PipeWriter, game_id: int) -> None:
+        self.writer = writer
+        self.game_id = game_id
+
+    async def send_state(self, frame: str) -> None:
+        await self._send((STATE, self.game_id, frame))
+
+    async def send_events(self, events: list[d.GameEvent]) -> None:
+        await self._send((EVENTS, self.game_id, events))
+
+    async def finish(self, turn_rows: list[dict]) -> None:
+        await self._send((FINISHED, self.game_id, turn_rows))
+
+    async def fail(self, reason: str) -> None:
+        await self._send((FAILED, self.game_id, reason))
+
+    async def _send(self, message: tuple) -> None:
+        # Waits for the pipe without blocking the other games of the worker
+        await asyncio.wrap_future(self.writer.send(message))
+
+
+def serve_shard(conn: Connection) -> None:
+    """Entry point of a shard worker process."""
+    asyncio.run(_serve_shard(conn))
+
+
+async def _serve_shard(conn: Connection) -> None:
+    # Imported here, as `src.game.game` depends on this module
+    from src.game.game import LocalGames, create_game
+
+    games = LocalGames()
+    writer = _PipeWriter(conn, multiprocessing.current_process().name)
+    stopped = asyncio.Event()
+
+    def _receive() -> None:
+        try:
+            while conn.poll():
+                opcode, game_id, *payload = conn.recv()
+                if opcode == START_GAME:
+                    room_id, rules, players = payload
+                    output = ShardOutput(writer, game_id)
+                    try:
+                        game = create_game(game_id, room_id, rules, players)
+                    except Exception as e:
+                        run_in_background(output.fail(repr(e)))
+                        continue
+                    games.start(game, output)
+                elif opcode == WORD_INPUT:
+                    player_id, word = payload
+                    word_input = v.WordInput(
+                        input_type='word_input', game_id=game_id, word=word
+                    )
+                    run_in_background(games.submit_input(player_id, word_input))
+                elif opcode == STOP:
+                    stopped.set()
+        except (EOFError, OSError):
+            stopped.set()  # Front process is gone
+
+    loop = asyncio.get_running_loop()
+    loop.add_reader(conn.fileno(), _receive)
+    await stopped.wait()
+    loop.remove_reader(conn.fileno())
+    writer.close()
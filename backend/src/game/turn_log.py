@@ -0,0 +1,147 @@
+import math
+import time
+from array import array
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import src.schemas.domain as d
+import src.schemas.validation as v
+
+_NONE = -1  # Placeholder for missing ids/flags in the integer columns
+
+
+class TurnLog:
+    """
+    Compact, append-only store of finished turns, kept column-wise in arrays. Words and
+    infos are interned, players are referenced by their index in `OrderedPlayers` and
+    timestamps are stored as monotonic clock offsets from the start of the game.
+
+    The tail of the word chain (the last correct word) is tracked separately, so
+    checking a new word against the previous one doesn't require scanning the turns.
+    """
+
+    def __init__(self, player_ids: list[UUID]) -> None:
+        self._player_ids = player_ids
+        self._started_on = datetime.utcnow()
+        self._started_on_monotonic = time.monotonic()
+
+        # Interned values
+        self._words: list[str] = []
+        self._word_ids: dict[str, int] = {}
+        self._definitions: list[list[tuple[str, list[str]]] | None] = []
+        self._infos: list[str] = []
+        self._info_ids: dict[str, int] = {}
+
+        # Columns, one item per turn
+        self._word_idxs = array('i')
+        self._is_correct = array('b')
+        self._info_idxs = array('i')
+        self._player_idxs = array('H')
+        self._started_on_offsets = array('d')
+        self._ended_on_offsets = array('d')  # NaN if the turn didn't end
+
+        self.last_word: str | None = None  # Last correct word - tail of the word chain
+
+    def __len__(self) -> int:
+        return len(self._player_idxs)
+
+    def now(self) -> datetime:
+        """Return current UTC time, derived from the monotonic clock to avoid wall-clock drift."""
+        return self._to_datetime(time.monotonic() - self._started_on_monotonic)
+
+    def append(self, turn: d.Turn, player_idx: int) -> None:
+        if turn.word is None:
+            self._word_idxs.append(_NONE)
+            self._is_correct.append(_NONE)
+        else:
+            self._word_idxs.append(self._intern_word(turn.word))
+            self._is_correct.append(
+                _NONE if turn.word.is_correct is None else int(turn.word.is_correct)
+            )
+            if turn.word.is_correct:
+                self.last_word = turn.word.content
+
+        self._info_idxs.append(
+            _NONE if turn.info is None else self._intern_info(turn.info)
+        )
+        self._player_idxs.append(player_idx)
+        self._started_on_offsets.append(self._to_offset(turn.started_on))
+        self._ended_on_offsets.append(
+            math.nan if turn.ended_on is None else self._to_offset(turn.ended_on)
+        )
+
+    def get_word(self, turn_idx: int) -> d.Word | None:
+        word_idx = self._word_idxs[turn_idx]
+        if word_idx == _NONE:
+            return None
+
+        is_correct = self._is_correct[turn_idx]
+        return d.Word(
+            content=self._words[word_idx],
+            is_correct=None if is_correct == _NONE else bool(is_correct),
+            # Definitions are shared by all turns with the word, even incorrect ones
+            definitions=self._definitions[word_idx] if is_correct == 1 else None,
+        )
+
+    def set_definitions(
+        self, turn_idx: int, definitions: list[tuple[str, list[str]]]
+    ) -> None:
+        self._definitions[self._word_idxs[turn_idx]] = definitions
+
+    def to_turn_out(self, turn_idx: int) -> v.TurnOut:
+        ended_on_offset = self._ended_on_offsets[turn_idx]
+        info_idx = self._info_idxs[turn_idx]
+        return v.TurnOut(
+            word=self.get_word(turn_idx),
+            started_on=self._to_datetime(self._started_on_offsets[turn_idx]),
+            ended_on=None
+            if math.isnan(ended_on_offset)
+            else self._to_datetime(ended_on_offset),
+            info=None if info_idx == _NONE else self._infos[info_idx],
+            player_idx=self._player_idxs[turn_idx],
+        )
+
+    def to_db_dicts(self, game_id: int) -> list[dict]:
+        """Export the turns as `db.Turn` column dicts, ready for a bulk insert."""
+        return [
+            dict(
+                word=None if word_idx == _NONE else self._words[word_idx],
+                is_correct=None if is_correct == _NONE else bool(is_correct),
+                started_on=self._to_datetime(started_on_offset),
+                ended_on=None
+                if math.isnan(ended_on_offset)
+                else self._to_datetime(ended_on_offset),
+                player_id=self._player_ids[player_idx],
+                game_id=game_id,
+            )
+            for word_idx, is_correct, player_idx, started_on_offset, ended_on_offset in zip(
+                self._word_idxs,
+                self._is_correct,
+                self._player_idxs,
+                self._started_on_offsets,
+                self._ended_on_offsets,
+            )
+        ]
+
+    def _intern_word(self, word: d.Word) -> int:
+        word_idx = self._word_ids.get(word.content)
+        if word_idx is None:
+            word_idx = self._word_ids[word.content] = len(self._words)
+            self._words.append(word.content)
+            self._definitions.append(None)
+        if word.definitions is not None:
+            self._definitions[word_idx] = word.definitions
+        return word_idx
+
+    def _intern_info(self, info: str) -> int:
+        info_idx = self._info_ids.get(info)
+        if info_idx is None:
+            info_idx = self._info_ids[info] = len(self._infos)
+            self._infos.append(info)
+        return info_idx
+
+    def _to_offset(self, date: datetime) -> float:
+        return (date - self._started_on).total_seconds()
+
+    def _to_datetime(self, offset: float) -> datetime:
+        return self._started_on + timedelta(seconds=offset)
@@ -1,55 +1,75 @@
-import httpx
+import asyncio
+
+from async_timeout import timeout_at
 
 import src.schemas.domain as d
-from config import get_config
+from src.game.dictionary import Dictionary, get_dictionary
+from src.game.providers import remote_providers
+from src.game.word_cache import word_cache
+from src.misc import DictionaryUnavailableError, SingleFlight
 
-client = httpx.Client()
+# Coalesces lookups of the same word issued concurrently from different games
+in_flight_lookups = SingleFlight()
 
-accepted_func_labels = [
-    'noun',
-    'verb',
-    'adjective',
-    'adverb',
-]
 
+async def check_word_correctness(word: str, deadline: float | None = None) -> d.Word:
+    """
+    Decide if the word exists, consulting the providers in order: local index, cache,
+    Merriam-Webster and the secondary API. `deadline` is an event loop timestamp,
+    past which the lookup is abandoned and `DictionaryUnavailableError` is raised.
+    """
+    word = word.lower()
+    dictionary = get_dictionary()
+    if dictionary is not None:
+        # Definitions are not needed to end the turn, they are fetched in the background
+        # with `fetch_definitions`
+        return d.Word(content=word, is_correct=word in dictionary)
+
+    try:
+        async with timeout_at(deadline):
+            return await in_flight_lookups.do(
+                word, lambda: _lookup_word(word, None, deadline)
+            )
+    except asyncio.TimeoutError:
+        raise DictionaryUnavailableError('Word lookup missed the deadline') from None
 
-def check_word_correctness(word: str) -> d.Word:
-    response = client.get(
-        get_config().DICTIONARY_API_URL.format(
-            word=word, api_key=get_config().DICTIONARY_API_KEY
-        )
-    )
 
-    if response.status_code // 100 == 5:
-        raise Exception('Dictionary API is not available')
+async def fetch_definitions(word: str) -> list[tuple[str, list[str]]] | None:
+    """Fetch definitions of an already validated word, without any deadline."""
+    try:
+        word_obj = await in_flight_lookups.do(
+            word, lambda: _lookup_word(word, get_dictionary(), None)
+        )
+    except DictionaryUnavailableError:
+        return None
+    return word_obj.definitions
 
-    data = response.json()
 
-    # Mirriam-Webster returns a list of similar words if the word is not found
-    if any(isinstance(elem, str) for elem in data):
-        return d.Word(content=word, is_correct=False)
+async def _lookup_word(
+    word: str, dictionary: Dictionary | None, deadline: float | None
+) -> d.Word:
+    if cached_word := await word_cache.get(word):
+        return cached_word
 
-    filtered_definitions = []
-    for definition in data:
-        # Filter out words finds without functional labels
-        if not (definition.get('fl') and definition['fl'] in accepted_func_labels):
-            continue
+    loop = asyncio.get_running_loop()
+    for idx, provider in enumerate(remote_providers):
+        provider_deadline = deadline
+        if deadline is not None:
+            providers_left = len(remote_providers) - idx
+            # Split the remaining time, so a hanging provider doesn't starve fallbacks
+            provider_deadline = loop.time() + (deadline - loop.time()) / providers_left
 
-        # Filter out any definitions which are not the exact match - Mirriam-Webster returns
-        # similar words (e.g 'god' -> 'god-awful'). In case multiple definitions exist,
-        # it will index them using a colon (e.g 'god:1', 'god:2')
-        if not definition['meta']['id'].lower().split(':')[0] == word:
+        try:
+            word_obj = await provider.lookup(word, provider_deadline)
+        except DictionaryUnavailableError:
             continue
 
-        filtered_definitions.append(definition)
-
-    description: list[tuple[str, list[str]]] = []
-    for definition, _ in zip(filtered_definitions, range(3)):
-        shortdefs: list[str] = [
-            '- ' + shortdef if i > 0 else shortdef
-            for i, shortdef in enumerate(definition['shortdef'])
-        ]
-        part_of_speech: str = definition['fl']
-        description.append((part_of_speech, shortdefs))
+        if dictionary is not None:
+            # Local index is authoritative for correctness, APIs only supply definitions
+            word_obj.is_correct = True
+        word_cache.put(word_obj)
+        return word_obj
 
-    return d.Word(content=word, is_correct=True, definitions=description)
+    if dictionary is not None:
+        return d.Word(content=word, is_correct=True)
+    raise DictionaryUnavailableError('No dictionary provider is available')
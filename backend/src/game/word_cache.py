@@ -0,0 +1,122 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from logging import getLogger
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+import src.schemas.database as db
+import src.schemas.domain as d
+from config import get_config
+from src.database import init_db_session
+
+
+@dataclass
+class WordCacheStats:
+    hits: int = 0  # Served from the in-memory LRU
+    persisted_hits: int = 0  # Served from the `word_definitions` table
+    misses: int = 0  # Not cached at all, or cached entry expired
+    evictions: int = 0  # Entries pushed out of the in-memory LRU
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.persisted_hits + self.misses
+        return (self.hits + self.persisted_hits) / lookups if lookups else 0.0
+
+
+class WordCache:
+    """
+    Two-tier cache of dictionary lookups. First tier is a bounded, in-process LRU,
+    second tier is the `word_definitions` table, shared between workers and surviving
+    restarts. Non-existing words are cached as well (with a shorter TTL), as they are
+    as expensive to look up as the existing ones.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, negative_ttl: int) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = WordCacheStats()
+
+        self._entries: OrderedDict[str, tuple[datetime, d.Word]] = OrderedDict()
+        self._pending_writes: set[asyncio.Task] = set()
+
+    async def get(self, word: str) -> d.Word | None:
+        if (entry := self._entries.get(word)) and not self._is_expired(*entry):
+            self._entries.move_to_end(word)
+            self.stats.hits += 1
+            return entry[1]
+
+        entry = await self._get_persisted(word)
+        if entry and not self._is_expired(*entry):
+            self._put_in_memory(*entry)
+            self.stats.persisted_hits += 1
+            return entry[1]
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, word: d.Word) -> None:
+        """Cache the word in memory and schedule its persistence off the critical path."""
+        fetched_on = datetime.utcnow()
+        self._put_in_memory(fetched_on, word)
+
+        task = asyncio.create_task(self._persist(fetched_on, word))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    def _put_in_memory(self, fetched_on: datetime, word: d.Word) -> None:
+        self._entries[word.content] = (fetched_on, word)
+        self._entries.move_to_end(word.content)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _is_expired(self, fetched_on: datetime, word: d.Word) -> bool:
+        ttl = self.ttl if word.is_correct else self.negative_ttl
+        return (datetime.utcnow() - fetched_on).total_seconds() >= ttl
+
+    async def _get_persisted(self, word: str) -> tuple[datetime, d.Word] | None:
+        try:
+            async with init_db_session() as db_session:
+                word_db = await db_session.scalar(
+                    select(db.WordDefinition).where(db.WordDefinition.word == word)
+                )
+        except Exception as e:
+            # Persisted tier is an optimization - never fail the lookup because of it
+            getLogger('uvicorn').warning(f'WORD CACHE: Failed to read "{word}": {e}')
+            return None
+
+        if word_db is None:
+            return None
+        return word_db.fetched_on, word_db.to_domain()
+
+    async def _persist(self, fetched_on: datetime, word: d.Word) -> None:
+        values = dict(
+            word=word.content,
+            is_correct=bool(word.is_correct),
+            definitions=word.definitions,
+            fetched_on=fetched_on,
+        )
+        try:
+            async with init_db_session() as db_session:
+                await db_session.execute(
+                    insert(db.WordDefinition)
+                    .values(values)
+                    .on_conflict_do_update(
+                        index_elements=[db.WordDefinition.word], set_=values
+                    )
+                )
+        except Exception as e:
+            getLogger('uvicorn').warning(
+                f'WORD CACHE: Failed to persist "{word.content}": {e}'
+            )
+
+
+word_cache = WordCache(
+    maxsize=get_config().WORD_CACHE_SIZE,
+    ttl=get_config().WORD_CACHE_TTL,
+    negative_ttl=get_config().WORD_CACHE_NEGATIVE_TTL,
+)
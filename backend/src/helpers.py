@@ -3,9 +3,11 @@ from datetime import datetime, timedelta
 from enum import Enum
 from logging import getLogger
 from typing import Any, Callable, Iterable, Mapping, cast
+from uuid import UUID
 
-from fastapi import WebSocket, WebSocketDisconnect, WebSocketException
-from sqlalchemy import and_, insert, select
+from fastapi import WebSocket, WebSocketException
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.schemas.database as db
@@ -13,10 +15,13 @@ import src.schemas.domain as d
 import src.schemas.validation as v
 from config import get_config
 from src.connection_manager import ConnectionManager
-from src.database import init_db_session
-from src.game.deathmatch import Deathmatch
+from src.database import init_db_session, pool_stats
 from src.game.game import GameManager
-from src.misc import PlayerAlreadyConnectedError
+from src.game.word_cache import word_cache
+from src.inbound import InboundContext, inbound
+from src.message_writer import message_writer
+from src.misc import PlayerAlreadyConnectedError, cache
+from src.rate_limiter import ActionClassEnum, rate_limiter
 
 
 class TagsEnum(str, Enum):
@@ -37,39 +42,25 @@ tags_metadata = [
 
 
 async def save_and_send_message(
-    message: db.Message,
+    content: str,
+    room_id: int,
     player: d.Player,
-    db: AsyncSession,
     conn_manager: ConnectionManager,
+    author: d.Player = d.ROOT,
 ) -> None:
-    db.add(message)
-    await db.flush([message])
-    await db.refresh(message, attribute_names=['player'])
-
-    chat_message = v.Message(
-        id_=message.id_,
-        player_name=message.player.name,
-        room_id=message.room_id,
-        content=message.content,
-        created_on=message.created_on,
-    )
+    """Send the message to the player right away, it's written by `message_writer`."""
+    chat_message = await message_writer.write(content, room_id, author)
     await conn_manager.send_chat_message(chat_message, player.id_)
 
 
 async def save_and_broadcast_message(
-    message: db.Message, db: AsyncSession, conn_manager: ConnectionManager
+    content: str,
+    room_id: int,
+    conn_manager: ConnectionManager,
+    author: d.Player = d.ROOT,
 ) -> None:
-    db.add(message)
-    await db.flush([message])
-    await db.refresh(message, attribute_names=['player'])
-
-    chat_message = v.Message(
-        id_=message.id_,
-        player_name=message.player.name,
-        room_id=message.room_id,
-        content=message.content,
-        created_on=message.created_on,
-    )
+    """Send the message to the room right away, it's written by `message_writer`."""
+    chat_message = await message_writer.write(content, room_id, author)
     await conn_manager.broadcast_chat_message(chat_message)
 
 
@@ -77,7 +68,6 @@ async def move_player_and_broadcast_message(
     player: d.Player,
     from_room_id: int,
     to_room_id: int,
-    db_session: AsyncSession,
     conn_manager: ConnectionManager,
     leave_message: str | None = None,
 ) -> None:
@@ -87,19 +77,12 @@ async def move_player_and_broadcast_message(
     """
     conn_manager.move_player(player.id_, from_room_id, to_room_id)
 
-    message = db.Message(
-        content=leave_message or f'{player.name} left the room',
-        room_id=from_room_id,
-        player_id=d.ROOT.id_,
+    await save_and_broadcast_message(
+        leave_message or f'{player.name} left the room', from_room_id, conn_manager
     )
-    await save_and_broadcast_message(message, db_session, conn_manager)
-
-    message = db.Message(
-        content=f'{player.name} joined the room',
-        room_id=to_room_id,
-        player_id=d.ROOT.id_,
+    await save_and_broadcast_message(
+        f'{player.name} joined the room', to_room_id, conn_manager
     )
-    await save_and_broadcast_message(message, db_session, conn_manager)
 
     # TODO: Add RoomState websocket message as well?
     # TODO: Add LobbyState websocket message if lobby is involved?
@@ -108,7 +91,6 @@ async def move_player_and_broadcast_message(
 async def accept_websocket_connection(
     player: d.Player,
     websocket: WebSocket,
-    db_session: AsyncSession,
     conn_manager: ConnectionManager,
 ) -> None:
     await websocket.accept()
@@ -127,29 +109,25 @@ async def accept_websocket_connection(
         room_id_with_logged_player = conn_manager.pool.get_room(
             player_id=player.id_
         ).id_
-        message = db.Message(
-            content='Someone tried to log into your account from another device',
-            room_id=room_id_with_logged_player,
-            player_id=d.ROOT.id_,
+        await save_and_send_message(
+            'Someone tried to log into your account from another device',
+            room_id_with_logged_player,
+            player,
+            conn_manager,
         )
-        await save_and_send_message(message, player, db_session, conn_manager)
         raise WebSocketException(*exc_args) from None
 
-    message = db.Message(
-        content=f'{player.name} joined the room',
-        room_id=d.LOBBY.id_,
-        player_id=d.ROOT.id_,
+    await save_and_broadcast_message(
+        f'{player.name} joined the room', d.LOBBY.id_, conn_manager
     )
-    await save_and_broadcast_message(message, db_session, conn_manager)
 
 
 async def handle_player_disconnect(
-    player: d.Player,
-    db_session: AsyncSession,
-    conn_manager: ConnectionManager,
+    player: d.Player, conn_manager: ConnectionManager
 ) -> None:
     room = conn_manager.pool.get_room(player_id=player.id_)
-    conn_manager.disconnect(player.id_)
+    await conn_manager.disconnect(player.id_)
+    rate_limiter.forget(player.id_)
 
     is_player_in_lobby = room.id_ == d.LOBBY.id_
     if is_player_in_lobby:
@@ -158,12 +136,9 @@ async def handle_player_disconnect(
         )
         await conn_manager.broadcast_lobby_state(lobby_state)
 
-        message = db.Message(
-            content=f'{player.name} disconnected from the lobby',
-            room_id=room.id_,
-            player_id=d.ROOT.id_,
+        await save_and_broadcast_message(
+            f'{player.name} disconnected from the lobby', room.id_, conn_manager
         )
-        await save_and_broadcast_message(message, db_session, conn_manager)
 
     # TODO: Rewrite without db operations
     # if not active_game_with_player:
@@ -198,149 +173,221 @@ async def handle_player_disconnect(
 
 async def listen_for_messages(
     player: d.Player,
-    db_session: AsyncSession,
     conn_manager: ConnectionManager,
     game_manager: GameManager,
 ):
-    """Listen and distribute websocket messages to different handlers."""
-    while True:
-        try:
-            # TODO: Make a wrapper which deserializes the websocket message when it arrives
-            websocket_message_dict = await player.websocket.receive_json()
-            websocket_message = v.WebSocketMessage(**websocket_message_dict)
-
-            match type(websocket_message.payload):
-                case v.Message:
-                    chat_message = cast(v.Message, websocket_message.payload)
-                    message = db.Message(
-                        content=chat_message.content,
-                        room_id=chat_message.room_id,
-                        player_id=player.id_,
-                    )
-                    await save_and_broadcast_message(message, db_session, conn_manager)
-                    await db_session.commit()
-                case v.WordInput:
-                    game_input = cast(v.WordInput, websocket_message.payload)
-                    game = game_manager.get(game_input.game_id)
-
-                    if game is None or game.players.current.id_ != player.id_:
-                        continue  # TODO: Handle malicious attempts to send game input
-
-                    room_id = conn_manager.pool.get_room(player_id=player.id_).id_
-                    word_input_buffer = conn_manager.pool.get_room(
-                        room_id=room_id
-                    ).word_input_buffer
-                    await word_input_buffer.put(game_input)
-
-        except WebSocketDisconnect:
-            raise
-        except Exception as e:
-            # TODO: Figure out a proper way to handle exceptions to avoid websocket
-            # channel crashes
-            print('!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!')
-            print(e)
-
-
-async def run_game(
-    game: Deathmatch, room: d.Room, conn_manager: ConnectionManager
-) -> None:
-    start_game_state = game.start()
-    await conn_manager.broadcast_game_state(room.id_, start_game_state)
+    """Listen and distribute websocket messages to the `inbound` handlers."""
+    await inbound.listen(InboundContext(player, conn_manager, game_manager))
 
-    wait_state = game.wait()
-    await conn_manager.broadcast_game_state(room.id_, wait_state)
-    await asyncio.sleep(get_config().GAME_START_DELAY)
 
-    while True:
-        start_turn_state = game.start_turn()
-        await conn_manager.broadcast_game_state(room.id_, start_turn_state)
+@inbound.handler(v.Message, ActionClassEnum.CHAT)
+async def handle_chat_message(chat_message: v.Message, context: InboundContext) -> None:
+    await save_and_broadcast_message(
+        chat_message.content,
+        chat_message.room_id,
+        context.conn_manager,
+        author=context.player,
+    )
 
-        try:
-            word_input = await asyncio.wait_for(
-                room.word_input_buffer.get(), game.time_left_in_turn
-            )
-        except asyncio.TimeoutError:
-            end_turn_state = game.end_turn_timed_out()
-        else:
-            end_turn_state = game.end_turn_in_time(word_input.word)
-        await conn_manager.broadcast_game_state(room.id_, end_turn_state)
-        await consume_game_events(game, conn_manager)
 
-        if game.is_finished():
-            break
+@inbound.handler(v.WordInput, ActionClassEnum.GAME_INPUT)
+async def handle_word_input(word_input: v.WordInput, context: InboundContext) -> None:
+    await submit_word_input(
+        context.player, word_input, context.conn_manager, context.game_manager
+    )
 
-        wait_state = game.wait()
-        await conn_manager.broadcast_game_state(room.id_, wait_state)
-        await asyncio.sleep(get_config().TURN_START_DELAY)
 
-    end_game_state = game.end()
-    await consume_game_events(game, conn_manager)
-    await conn_manager.broadcast_game_state(room.id_, end_game_state)
+@inbound.handler(v.LobbySubscription, ActionClassEnum.LOBBY)
+async def handle_lobby_subscription(
+    subscription: v.LobbySubscription, context: InboundContext
+) -> None:
+    context.conn_manager.subscribe_to_lobby(context.player.id_, subscription)
 
-    room.status = d.RoomStatusEnum.OPEN
-    await broadcast_single_room_state(room, conn_manager)
 
-    await export_and_persist_game(game)
+@inbound.handler(v.StateResync, ActionClassEnum.LOBBY)
+async def handle_state_resync(resync: v.StateResync, context: InboundContext) -> None:
+    context.conn_manager.resync(context.player.id_, resync)
 
 
-async def broadcast_full_lobby_state(
-    conn_manager: ConnectionManager,
-    removed_player_names: Iterable[str] | None = None,
-    removed_room_ids: Iterable[int] | None = None,
+async def broadcast_connected_player(
+    player: d.Player, conn_manager: ConnectionManager
 ) -> None:
-    lobby_players = conn_manager.pool.get_room_players(d.LOBBY.id_)
-    # Merge the players and the removed players to create a full state update
-    players_out = {
-        **{
-            lobby_player.name: v.LobbyPlayerOut.model_validate(lobby_player)
-            for lobby_player in lobby_players
-        },
-        **{player_name: None for player_name in removed_player_names or []},
-    }
-
-    # Merge the rooms and the removed rooms to create a full state update
-    rooms_out = {
-        **{
-            room.id_: v.RoomOut(
-                players_no=len(room.players),
-                owner_name=room.owner.name,
-                **room.to_dict(),
-            )
-            for room in conn_manager.pool.get_rooms()
-        },
-        **{room_id: None for room_id in removed_room_ids or []},
-    }
+    """Send the lobby to the newly connected player, and only the player to the lobby."""
+    conn_manager.send_lobby_snapshot(player.id_)
     lobby_state = v.LobbyState(
-        rooms=rooms_out, players=players_out, stats=get_current_stats(conn_manager)
+        players={player.name: v.LobbyPlayerOut.model_validate(player)},
+        stats=get_current_stats(conn_manager),
     )
     await conn_manager.broadcast_lobby_state(lobby_state)
 
 
-async def export_and_persist_game(game: Deathmatch) -> None:
-    """Gather game data designated to be persisted and issue a bulk insert."""
+def start_room_game(
+    game_id: int,
+    room: d.Room,
+    conn_manager: ConnectionManager,
+    game_manager: GameManager,
+) -> None:
+    """Start the game on the node owning the room, which might be another one."""
+    if not conn_manager.owns(room):
+        conn_manager.backplane.publish(
+            'start_game', target=room.node_id, game_id=game_id, room_id=room.id_
+        )
+        return
+
+    game_output = RoomGameOutput(game_id, room, conn_manager)
+    game_manager.start(
+        game_id, room.id_, room.rules, room.players.values(), game_output
+    )
+
+
+async def submit_word_input(
+    player: d.Player,
+    word_input: v.WordInput,
+    conn_manager: ConnectionManager,
+    game_manager: GameManager,
+) -> None:
+    """Pass the word input to the game, on the node owning the player's room."""
+    if not conn_manager.owns(player.room):
+        conn_manager.backplane.publish(
+            'word_input',
+            target=player.room.node_id,
+            player_id=str(player.id_),
+            word_input=word_input.model_dump(mode='json'),
+        )
+        return
+
+    await game_manager.submit_input(player.id_, word_input)
+
+
+def subscribe_to_game_messages(
+    conn_manager: ConnectionManager, game_manager: GameManager
+) -> None:
+    """Handle games routed to this node by the other nodes."""
+
+    async def on_start_game(message: dict[str, Any]) -> None:
+        room = conn_manager.pool.get_room(room_id=message['room_id'])
+        start_room_game(message['game_id'], room, conn_manager, game_manager)
+
+    async def on_word_input(message: dict[str, Any]) -> None:
+        word_input = v.WordInput.model_validate(message['word_input'])
+        await game_manager.submit_input(UUID(message['player_id']), word_input)
+
+    conn_manager.backplane.subscribe('start_game', on_start_game)
+    conn_manager.backplane.subscribe('word_input', on_word_input)
+
+
+class RoomGameOutput:
+    """`GameOutput` publishing the game to the players in its room."""
+
+    def __init__(
+        self, game_id: int, room: d.Room, conn_manager: ConnectionManager
+    ) -> None:
+        self.game_id = game_id
+        self.room = room
+        self.conn_manager = conn_manager
+
+    async def send_state(self, frame: str) -> None:
+        await self.conn_manager.broadcast_encoded(self.room.id_, frame)
+
+    async def send_events(self, events: list[d.GameEvent]) -> None:
+        await consume_game_events(self.room.id_, events, self.conn_manager)
+
+    async def finish(self, turn_rows: list[dict]) -> None:
+        self.conn_manager.pool.set_room_status(self.room, d.RoomStatusEnum.OPEN)
+        await broadcast_single_room_state(self.room, self.conn_manager)
+
+        await export_and_persist_game(self.game_id, turn_rows)
+
+    async def fail(self, reason: str) -> None:
+        for player in self.room.players.values():
+            player.in_game = False
+        self.conn_manager.pool.set_room_status(self.room, d.RoomStatusEnum.OPEN)
+        await broadcast_single_room_state(self.room, self.conn_manager)
+        await save_and_broadcast_message(
+            'Game was interrupted by a server error', self.room.id_, self.conn_manager
+        )
+
+        await end_failed_game(self.game_id)
+
+
+async def export_and_persist_game(game_id: int, turn_rows: list[dict]) -> None:
+    """Persist the game's data, bulk inserting its turns exported as `db.Turn` rows."""
     async with init_db_session() as db_session:
         game_db = cast(
             db.Game,
-            await db_session.scalar(select(db.Game).where(db.Game.id_ == game.id_)),
+            await db_session.scalar(select(db.Game).where(db.Game.id_ == game_id)),
         )
         game_db.ended_on = datetime.utcnow()
         game_db.status = db.GameStatusEnum.ENDED
         db_session.add(game_db)
 
-        turn_db_dicts = []
-        for turn in game.turns:
-            turn_db_dict = dict(
-                word=turn.word.content if turn.word else None,
-                is_correct=turn.word.is_correct if turn.word else None,
-                started_on=turn.started_on,
-                ended_on=turn.ended_on,
-                player_id=turn.player_id,
-                game_id=game.id_,
+        # Bulk insert
+        await db_session.execute(insert(db.Turn), turn_rows)
+
+        chain_length = sum(1 for turn_row in turn_rows if turn_row['word'] is not None)
+        game_time = int((game_db.ended_on - game_db.created_on).total_seconds())
+        await update_all_time_statistics(db_session, chain_length, game_time)
+    cache.invalidate(load_all_time_statistics)
+
+
+@cache.cache(ttl=30, stale_ttl=300)
+async def load_all_time_statistics() -> v.AllTimeStatistics:
+    async with init_db_session() as db_session:
+        stats_db = await db_session.get(
+            db.AllTimeStatistics, db.AllTimeStatistics.ROW_ID
+        )
+        if stats_db is None:  # No game has ended yet
+            return v.AllTimeStatistics(
+                longest_chain=0, longest_game_time=0, total_games=0
             )
-            turn_db_dicts.append(turn_db_dict)
+        return v.AllTimeStatistics.model_validate(stats_db)
 
-        # Bulk insert
-        await db_session.execute(insert(db.Turn), turn_db_dicts)
+
+@cache.cache(ttl=300, cache_none=False)
+async def load_player_profile(player_id: UUID) -> v.Player | None:
+    """Get the persisted player, invalidate it with `cache` when it changes."""
+    async with init_db_session() as db_session:
+        player_db = await db_session.scalar(
+            select(db.Player).where(db.Player.id_ == player_id)
+        )
+        return v.Player.model_validate(player_db) if player_db else None
+
+
+async def update_all_time_statistics(
+    db_session: AsyncSession, chain_length: int, game_time: int
+) -> None:
+    """Count in an ended game, in a single statement safe to run by many nodes at once."""
+    stats_insert = pg_insert(db.AllTimeStatistics).values(
+        id_=db.AllTimeStatistics.ROW_ID,
+        total_games=1,
+        longest_chain=chain_length,
+        longest_game_time=game_time,
+    )
+    stats = db.AllTimeStatistics.__table__.c
+    await db_session.execute(
+        stats_insert.on_conflict_do_update(
+            index_elements=[stats.id],
+            set_={
+                'total_games': stats.total_games + 1,
+                'longest_chain': func.greatest(
+                    stats.longest_chain, stats_insert.excluded.longest_chain
+                ),
+                'longest_game_time': func.greatest(
+                    stats.longest_game_time, stats_insert.excluded.longest_game_time
+                ),
+            },
+        )
+    )
+
+
+async def end_failed_game(game_id: int) -> None:
+    """Mark the game as failed, its turns are lost and it's not counted in the stats."""
+    async with init_db_session() as db_session:
+        await db_session.execute(
+            update(db.Game)
+            .where(db.Game.id_ == game_id)
+            .values(ended_on=datetime.utcnow(), status=db.GameStatusEnum.FAILED)
+        )
 
 
 async def broadcast_single_room_state(
@@ -356,7 +403,7 @@ async def broadcast_single_room_state(
     await conn_manager.broadcast_room_state(room.id_, room_state)
 
     room_out = v.RoomOut(
-        players_no=len(conn_manager.pool.get_room_players(room.id_)),
+        players_no=conn_manager.pool.count_room_players(room.id_),
         owner_name=room.owner.name,
         **room.to_dict(),
     )
@@ -370,6 +417,7 @@ def get_current_stats(conn_manager: ConnectionManager) -> v.CurrentStatistics:
     return v.CurrentStatistics(
         active_players=conn_manager.pool.active_players,
         active_rooms=conn_manager.pool.active_rooms,
+        open_rooms=conn_manager.pool.open_rooms,
     )
 
 
@@ -395,18 +443,26 @@ async def expire_inactive_rooms(conn_manager: ConnectionManager):
                 expired_rooms.append(db_room.id_)
                 continue
 
+            if not conn_manager.owns(room):
+                continue  # Expired by its owner, the removal is replicated here
+
             time_since_last_active = (current_date - room.last_active_on).seconds
             if (
                 not room.players
                 and time_since_last_active > get_config().ROOM_DELETION_DELAY
             ):
-                conn_manager.pool.remove_room(room.id_)
+                conn_manager.remove_room(room.id_)
                 db_room.ended_on = current_date
                 db_session.add(db_room)
                 expired_rooms.append(db_room.id_)
 
         await db_session.commit()
-        await broadcast_full_lobby_state(conn_manager, removed_room_ids=expired_rooms)
+        if expired_rooms:
+            lobby_state = v.LobbyState(
+                rooms={room_id: None for room_id in expired_rooms},
+                stats=get_current_stats(conn_manager),
+            )
+            await conn_manager.broadcast_lobby_state(lobby_state)
 
         logger = getLogger('uvicorn')
         if len(expired_rooms) > 0:
@@ -415,6 +471,42 @@ async def expire_inactive_rooms(conn_manager: ConnectionManager):
             logger.info('RECURRING ROOM CLEANUP: No rooms expired')
 
 
+async def log_runtime_stats(conn_manager: ConnectionManager):
+    """Log the counters of the pools, queues and caches, cumulative since the start."""
+    queue_depths = conn_manager.queue_depths().values()
+    decoding = ', '.join(
+        f'{payload_type} {stats.count} in {stats.mean_time * 1e6:.0f}us mean, '
+        f'{stats.max_time * 1e6:.0f}us max'
+        for payload_type, stats in inbound.stats.decoding.items()
+    )
+    lines = [
+        f'database pool: {pool_stats.checked_out} checked out, '
+        f'{pool_stats.overflow} overflow, {pool_stats.checkouts} checkouts, '
+        f'{pool_stats.timeouts} timeouts, waits {pool_stats.mean_wait * 1e3:.1f}ms '
+        f'mean, {pool_stats.max_wait * 1e3:.1f}ms max',
+        f'websockets: {len(queue_depths)} connected, {sum(queue_depths)} frames '
+        f'queued, {max(queue_depths, default=0)} in the longest queue',
+        f'inbound: {inbound.stats.oversized} oversized, '
+        f'{inbound.stats.rate_limited} rate limited, {inbound.stats.invalid} invalid, '
+        f'{inbound.stats.failed} failed, decoded {decoding or "nothing"}',
+        f'cache: {cache.stats.hit_ratio:.1%} hits ({cache.stats.hits} fresh, '
+        f'{cache.stats.stale_hits} stale), {cache.stats.misses} misses, '
+        f'{cache.stats.evictions} evictions, {cache.stats.invalidations} invalidations',
+        f'word cache: {word_cache.stats.hit_ratio:.1%} hits ({word_cache.stats.hits} '
+        f'in memory, {word_cache.stats.persisted_hits} persisted), '
+        f'{word_cache.stats.misses} misses, {word_cache.stats.evictions} evictions',
+        f'message writer: {message_writer.depth} queued, '
+        f'{message_writer.stats.messages_written} written, '
+        f'{message_writer.stats.messages_spilled} spilled, '
+        f'{message_writer.stats.messages_replayed} replayed, '
+        f'{message_writer.stats.messages_dropped} dropped, '
+        f'{message_writer.stats.batches_failed} failed batches',
+    ]
+    logger = getLogger('uvicorn')
+    for line in lines:
+        logger.info(f'RUNTIME STATS: {line}')
+
+
 def schedule_recurring_task(
     started_on: datetime,
     interval: int,
@@ -460,30 +552,15 @@ def schedule_recurring_task(
 
 
 async def consume_game_events(
-    game: Deathmatch, conn_manager: ConnectionManager
+    room_id: int, events: list[d.GameEvent], conn_manager: ConnectionManager
 ) -> None:
-    async with init_db_session() as db_session:
-        for event in game.events:
-            if isinstance(event, d.PlayerLostEvent):
-                message = db.Message(
-                    content=f'{event.player_name} lost the game',
-                    room_id=game.room_id,
-                    player_id=d.ROOT.id_,
-                )
-                await save_and_broadcast_message(message, db_session, conn_manager)
-            elif isinstance(event, d.PlayerWonEvent):
-                message = db.Message(
-                    content=f'{event.player_name} won the game',
-                    room_id=game.room_id,
-                    player_id=d.ROOT.id_,
-                )
-                await save_and_broadcast_message(message, db_session, conn_manager)
-            elif isinstance(event, d.GameFinishedEvent):
-                message = db.Message(
-                    content=f'game has finished - you created a word chain consisting of {event.chain_length} words',
-                    room_id=game.room_id,
-                    player_id=d.ROOT.id_,
-                )
-                await save_and_broadcast_message(message, db_session, conn_manager)
-            else:
-                raise NotImplementedError('Unsupported event type')
+    for event in events:
+        if isinstance(event, d.PlayerLostEvent):
+            content = f'{event.player_name} lost the game'
+        elif isinstance(event, d.PlayerWonEvent):
+            content = f'{event.player_name} won the game'
+        elif isinstance(event, d.GameFinishedEvent):
+            content = f'game has finished - you created a word chain consisting of {event.chain_length} words'
+        else:
+            raise NotImplementedError('Unsupported event type')
+        await save_and_broadcast_message(content, room_id, conn_manager)
@@ -0,0 +1,141 @@
+import time
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Any, Awaitable, Callable
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+from pydantic import TypeAdapter, ValidationError
+
+import src.schemas.domain as d
+import src.schemas.validation as v
+from config import get_config
+from src.connection_manager import ConnectionManager
+from src.game.game import GameManager
+from src.rate_limiter import ActionClassEnum, RateLimiter, rate_limiter
+
+# Built once, validating raw frames straight into the inbound message models
+inbound_message_adapter = TypeAdapter(v.InboundWebSocketMessage)
+
+
+@dataclass
+class InboundContext:
+    """
+    Everything the handlers of the player's messages might need. There's no database
+    session, as the connection lives for long, handlers needing one open their own
+    with `init_db_session`, for the single message.
+    """
+
+    player: d.Player
+    conn_manager: ConnectionManager
+    game_manager: GameManager
+
+
+@dataclass
+class DecodeStats:
+    count: int = 0
+    total_time: float = 0.0  # seconds
+    max_time: float = 0.0  # seconds
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+
+@dataclass
+class InboundStats:
+    oversized: int = 0  # Frames rejected before decoding
+    rate_limited: int = 0  # Messages dropped by the rate limiter
+    invalid: int = 0  # Frames failing the validation
+    failed: int = 0  # Messages whose handler raised
+    decoding: dict[str, DecodeStats] = field(default_factory=dict)  # By payload type
+
+
+InboundHandler = Callable[[Any, InboundContext], Awaitable[None]]
+
+
+class InboundDispatcher:
+    """
+    Decode the frames received from the players and pass them to the handler
+    registered for the payload's type, unless the player exceeded the rate limit of
+    the handler's action class.
+    """
+
+    def __init__(self, max_frame_size: int, rate_limiter: RateLimiter) -> None:
+        self.max_frame_size = max_frame_size
+        self.rate_limiter = rate_limiter
+        self.stats = InboundStats()
+        self._handlers: dict[type, tuple[InboundHandler, ActionClassEnum]] = {}
+
+    def handler(
+        self, payload_type: type, action: ActionClassEnum
+    ) -> Callable[[InboundHandler], InboundHandler]:
+        """Register the decorated coroutine function as the payload type's handler."""
+
+        def register(handler: InboundHandler) -> InboundHandler:
+            self._handlers[payload_type] = (handler, action)
+            return handler
+
+        return register
+
+    async def listen(self, context: InboundContext) -> None:
+        """Handle the player's messages until the websocket disconnects."""
+        websocket = context.player.websocket
+        assert websocket is not None
+        while True:
+            frame = await self._receive(websocket)
+            if len(frame) > self.max_frame_size:
+                self.stats.oversized += 1
+                await websocket.close(status.WS_1009_MESSAGE_TOO_BIG, 'Frame too large')
+                raise WebSocketDisconnect(status.WS_1009_MESSAGE_TOO_BIG)
+
+            try:
+                payload = self.decode(frame)
+            except ValidationError as e:
+                self.stats.invalid += 1
+                getLogger('uvicorn').warning(f'Invalid websocket message: {e}')
+                continue
+
+            handler, action = self._handlers[type(payload)]
+            if not self.rate_limiter.allow(context.player.id_, action):
+                self.stats.rate_limited += 1
+                await self._reject(context, action)
+                continue
+
+            try:
+                await handler(payload, context)
+            except Exception:
+                self.stats.failed += 1
+                getLogger('uvicorn').exception(
+                    f'Websocket message {type(payload).__name__} could not be handled'
+                )
+
+    def decode(self, frame: str | bytes) -> Any:
+        started_on = time.perf_counter()
+        payload = inbound_message_adapter.validate_json(frame).payload
+        elapsed = time.perf_counter() - started_on
+
+        stats = self.stats.decoding.setdefault(type(payload).__name__, DecodeStats())
+        stats.count += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        return payload
+
+    async def _reject(self, context: InboundContext, action: ActionClassEnum) -> None:
+        retry_after = self.rate_limiter.retry_after(context.player.id_, action)
+        connection_state = v.ConnectionState(
+            code=v.CustomWebsocketCodeEnum.RATE_LIMITED,
+            reason=f'Too many {action.value} messages, the message was dropped',
+            retry_after=round(retry_after, 2),
+        )
+        await context.conn_manager.send_player_connection_state(
+            context.player.id_, connection_state
+        )
+
+    async def _receive(self, websocket: WebSocket) -> str | bytes:
+        message = await websocket.receive()
+        if message['type'] == 'websocket.disconnect':
+            raise WebSocketDisconnect(message['code'], message.get('reason'))
+        return message['text'] if message.get('text') is not None else message['bytes']
+
+
+inbound = InboundDispatcher(get_config().WEBSOCKET_MAX_FRAME_SIZE, rate_limiter)
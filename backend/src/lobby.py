@@ -0,0 +1,184 @@
+from bisect import bisect_left, insort
+from typing import Iterator, Mapping
+from uuid import UUID
+
+import src.schemas.domain as d
+import src.schemas.validation as v
+
+RoomKey = tuple[float, ...]
+
+
+def sort_key(sort: v.LobbySortEnum, room: v.RoomOut) -> RoomKey:
+    """Key placing the room in the order, ascending keys are listed first."""
+    if sort == v.LobbySortEnum.FULLEST:
+        return (-room.players_no, -room.id_)
+    # Room IDs come in blocks reserved by each node, so they're not ordered by time
+    return (-room.created_on.timestamp(), -room.id_)
+
+
+class LobbyIndex:
+    """
+    Rooms as they were published to the lobby, kept sorted by each of the supported
+    orders, so a page of any view can be read without sorting all the rooms.
+    """
+
+    def __init__(self) -> None:
+        self.rooms: dict[int, v.RoomOut] = {}
+        self._orders: dict[v.LobbySortEnum, list[tuple[RoomKey, int]]] = {
+            sort: [] for sort in v.LobbySortEnum
+        }
+
+    def apply(
+        self, rooms: Mapping[int, v.RoomOut | None]
+    ) -> dict[int, tuple[v.RoomOut | None, v.RoomOut | None]]:
+        """Update the rooms with a `LobbyState` delta, returning their old and new state."""
+        changes = {}
+        for room_id, room in rooms.items():
+            old_room = self.rooms.pop(room_id, None)
+            for sort, order in self._orders.items():
+                if old_room is not None:
+                    del order[bisect_left(order, (sort_key(sort, old_room), room_id))]
+                if room is not None:
+                    insort(order, (sort_key(sort, room), room_id))
+            if room is not None:
+                self.rooms[room_id] = room
+            changes[room_id] = (old_room, room)
+        return changes
+
+    def iter_rooms(self, sort: v.LobbySortEnum) -> Iterator[v.RoomOut]:
+        for _, room_id in self._orders[sort]:
+            yield self.rooms[room_id]
+
+
+def matches(subscription: v.LobbySubscription, room: v.RoomOut) -> bool:
+    if subscription.open_only and room.status != d.RoomStatusEnum.OPEN:
+        return False
+    if subscription.free_seats_only and room.players_no >= room.capacity:
+        return False
+    if (
+        subscription.round_time is not None
+        and room.rules.round_time != subscription.round_time
+    ):
+        return False
+    return True
+
+
+class LobbyView:
+    """
+    Page of rooms seen by the players sharing the same subscription. Keeps the rooms
+    last sent to them, to push only the changes of what they can see.
+    """
+
+    def __init__(self, subscription: v.LobbySubscription, version: int) -> None:
+        self.subscription = subscription
+        self.player_ids: set[UUID] = set()
+        self.visible: dict[int, v.RoomOut] = {}
+        # Lobby version of the last delta sent to the view, the deltas not affecting
+        # it are skipped, so the view's deltas chain on top of this one
+        self.version = version
+        self._last_key: RoomKey | None = None  # Key of the last room of a full page
+
+    def snapshot(self, index: LobbyIndex) -> None:
+        self._set_page(self._read_page(index))
+
+    def refresh(
+        self,
+        index: LobbyIndex,
+        changes: Mapping[int, tuple[v.RoomOut | None, v.RoomOut | None]],
+    ) -> dict[int, v.RoomOut | None]:
+        """Get the rooms delta of the view, after the `changes` were applied to the index."""
+        if not self._is_affected(changes):
+            return {}
+
+        previous = self.visible
+        self._set_page(self._read_page(index))
+
+        delta: dict[int, v.RoomOut | None] = {
+            room_id: None for room_id in previous.keys() - self.visible.keys()
+        }
+        for room_id, room in self.visible.items():
+            if previous.get(room_id) is not room:
+                delta[room_id] = room
+        return delta
+
+    def _is_affected(
+        self, changes: Mapping[int, tuple[v.RoomOut | None, v.RoomOut | None]]
+    ) -> bool:
+        """
+        Check if any of the changed rooms can alter the page. When the page is full,
+        rooms sorted after its last room can't, unless they were on it before.
+        """
+        for room_id, rooms in changes.items():
+            if room_id in self.visible:
+                return True
+            for room in rooms:
+                if room is None:
+                    continue
+                if self._last_key is None:
+                    return True
+                if sort_key(self.subscription.sort, room) < self._last_key:
+                    return True
+        return False
+
+    def _set_page(self, page: list[v.RoomOut]) -> None:
+        self.visible = {room.id_: room for room in page}
+        is_full = len(page) == self.subscription.limit
+        self._last_key = sort_key(self.subscription.sort, page[-1]) if is_full else None
+
+    def _read_page(self, index: LobbyIndex) -> list[v.RoomOut]:
+        start = self.subscription.offset
+        stop = start + self.subscription.limit
+
+        page = []
+        matching = 0
+        for room in index.iter_rooms(self.subscription.sort):
+            if not matches(self.subscription, room):
+                continue
+            if matching >= start:
+                page.append(room)
+            matching += 1
+            if matching == stop:
+                break
+        return page
+
+
+class LobbyViews:
+    """Lobby views subscribed to by the players, shared by identical subscriptions."""
+
+    def __init__(self) -> None:
+        self.index = LobbyIndex()
+        self._views: dict[tuple, LobbyView] = {}
+        self._player_views: dict[UUID, LobbyView] = {}
+
+    def __iter__(self) -> Iterator[LobbyView]:
+        return iter(self._views.values())
+
+    def is_subscribed(self, player_id: UUID) -> bool:
+        return player_id in self._player_views
+
+    def get(self, player_id: UUID) -> LobbyView | None:
+        return self._player_views.get(player_id)
+
+    def subscribe(
+        self, player_id: UUID, subscription: v.LobbySubscription, version: int
+    ) -> LobbyView:
+        """Subscribe the player to the view, created at the lobby's current `version`."""
+        self.unsubscribe(player_id)
+
+        key = tuple(subscription.model_dump().values())
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = LobbyView(subscription, version)
+            view.snapshot(self.index)
+        view.player_ids.add(player_id)
+        self._player_views[player_id] = view
+        return view
+
+    def unsubscribe(self, player_id: UUID) -> None:
+        view = self._player_views.pop(player_id, None)
+        if view is None:
+            return
+
+        view.player_ids.discard(player_id)
+        if not view.player_ids:
+            del self._views[tuple(view.subscription.model_dump().values())]
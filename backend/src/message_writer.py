@@ -0,0 +1,310 @@
+import asyncio
+import json
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+import src.schemas.database as db
+import src.schemas.domain as d
+import src.schemas.validation as v
+from config import get_config
+from src.database import init_db_session
+from src.id_allocator import IdAllocator, id_allocator
+
+# Errors caused by the rows themselves, retrying them won't help
+ROW_ERRORS = (IntegrityError, DataError)
+
+
+@dataclass
+class MessageWriterStats:
+    messages_queued: int = 0
+    messages_written: int = 0
+    messages_dropped: int = 0  # Invalid, or failed to be spilled
+    messages_spilled: int = 0  # Over the queue size, or unwritten on stop
+    messages_replayed: int = 0  # Read back from the spill file
+    batches_written: int = 0
+    batches_failed: int = 0  # Failed attempts, retried later
+
+
+@dataclass(slots=True)
+class _Batch:
+    rows: list[dict[str, Any]]
+
+
+class MessageWriter:
+    """
+    Write-behind queue of the chat and system messages. Messages get their IDs and
+    timestamps on the spot, so they're broadcast without waiting for the database, and
+    are written in multi-row inserts once `batch_size` of them are queued, or
+    `flush_interval` passes.
+
+    IDs come from the `id_allocator`, so they're unique across nodes and restarts.
+    Inserts skip rows already written, so failed batches are retried safely, with
+    a backoff, for as long as the database is down. Once more than `max_queued`
+    messages wait for the database, the oldest ones are appended to the `spill_path`
+    file, as are the ones still not written when the writer is stopped. The file is
+    read back into the queue when the database accepts writes again, including after
+    a restart. Messages are dropped only if they are invalid, or can't be spilled.
+    """
+
+    STOP_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_queued: int,
+        max_retry_delay: float,
+        spill_path: Path,
+        id_allocator: IdAllocator,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queued = max_queued
+        self.max_retry_delay = max_retry_delay
+        self.spill_path = spill_path
+        self.id_allocator = id_allocator
+        self.stats = MessageWriterStats()
+
+        self._rows: list[dict[str, Any]] = []
+        self._retries: deque[_Batch] = deque()
+        self._retry_delay = 0.0  # Grows while the writes keep failing
+        self._flush_lock = asyncio.Lock()
+        self._spill_lock = asyncio.Lock()
+        # Spilled file taken for a replay, left over if the node stopped meanwhile
+        self._replay_path = spill_path.with_name(spill_path.name + '.replay')
+        self._has_spilled = spill_path.exists() or self._replay_path.exists()
+        self._has_rows = asyncio.Event()
+        self._is_full = asyncio.Event()
+        self._stop_requested = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._rows) + sum(len(batch.rows) for batch in self._retries)
+
+    def start(self) -> None:
+        self._stop_requested.clear()
+        if self._has_spilled:
+            self._has_rows.set()  # Replay the messages spilled before the restart
+        self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Write all the queued messages, spilling the ones that fail, then stop."""
+        self._stop_requested.set()
+        self._has_rows.set()
+        self._is_full.set()
+        if self._flusher is not None:
+            await self._flusher
+            self._flusher = None
+
+        for attempt_no in range(self.STOP_ATTEMPTS):
+            if not self.depth:
+                return
+            if attempt_no:
+                await asyncio.sleep(self._retry_delay)
+            await self.flush()
+
+        if self.depth:
+            rows = [row for batch in self._retries for row in batch.rows] + self._rows
+            self._retries.clear()
+            self._rows = []
+            await self._spill(rows, 'they could not be written before shutdown')
+
+    async def write(self, content: str, room_id: int, author: d.Player) -> v.Message:
+        """Queue the message to be written, returning it ready to be sent."""
+        message = v.Message(
+            id_=await self.id_allocator.next_id(db.Message),
+            created_on=datetime.utcnow(),
+            content=content,
+            player_name=author.name,
+            room_id=room_id,
+        )
+        self._rows.append(
+            {
+                'id_': message.id_,
+                'created_on': message.created_on,
+                'content': content,
+                'room_id': room_id,
+                'player_id': author.id_,
+            }
+        )
+        self.stats.messages_queued += 1
+        if self.depth > self.max_queued:
+            await self._spill_oldest()
+        self._has_rows.set()
+        if len(self._rows) >= self.batch_size:
+            self._is_full.set()
+        return message
+
+    async def flush(self) -> None:
+        """Write the queued messages, along with the earlier batches to be retried."""
+        async with self._flush_lock:
+            if self._has_spilled and not self._retries and not self._retry_delay:
+                # Database accepted the last writes, it can take the spilled ones
+                await self._replay_spilled()
+            batches = list(self._retries)
+            self._retries.clear()
+            while self._rows:
+                batches.append(_Batch(self._rows[: self.batch_size]))
+                self._rows = self._rows[self.batch_size :]
+            self._has_rows.clear()
+            self._is_full.clear()
+
+            for idx, batch in enumerate(batches):
+                if not await self._write_batch(batch):
+                    # Database is unavailable, don't hammer it with the other batches
+                    self._retries.extend(batches[idx + 1 :])
+                    self._has_rows.set()
+                    return
+
+    async def _flush_periodically(self) -> None:
+        while not self._stop_requested.is_set():
+            await self._has_rows.wait()
+            if self._retry_delay:
+                # Back off, unless stopped, the remaining messages are written on stop
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._stop_requested.wait(), self._retry_delay
+                    )
+            else:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._is_full.wait(), self.flush_interval)
+            if self._stop_requested.is_set():
+                return
+            await self.flush()
+
+    async def _write_batch(self, batch: _Batch) -> bool:
+        """Write the batch, returns False if it must be retried later."""
+        try:
+            await self._insert(batch.rows)
+        except ROW_ERRORS:
+            return await self._write_rows(batch.rows)
+        except Exception:
+            self._fail(batch)
+            return False
+
+        self._retry_delay = 0
+        self.stats.batches_written += 1
+        self.stats.messages_written += len(batch.rows)
+        return True
+
+    async def _write_rows(self, rows: list[dict[str, Any]]) -> bool:
+        """Write the rows one by one, so the invalid ones don't drop the others."""
+        for idx, row in enumerate(rows):
+            try:
+                await self._insert([row])
+            except ROW_ERRORS as e:
+                self._drop([row], f'they are invalid: {e.orig!r}')
+            except Exception:
+                self._fail(_Batch(rows[idx:]))
+                return False
+            else:
+                self.stats.messages_written += 1
+        self._retry_delay = 0
+        return True
+
+    def _fail(self, batch: _Batch) -> None:
+        self._retries.append(batch)
+        self.stats.batches_failed += 1
+        self._retry_delay = min(
+            max(self.flush_interval, self._retry_delay * 2), self.max_retry_delay
+        )
+        getLogger('uvicorn').exception(
+            f'Batch of {len(batch.rows)} messages could not be written, '
+            f'retrying in {self._retry_delay}s'
+        )
+
+    async def _spill_oldest(self) -> None:
+        """Move the batches waiting for a retry, the oldest messages, to the file."""
+        rows = [row for batch in self._retries for row in batch.rows]
+        self._retries.clear()
+        overflow = self.depth - self.max_queued
+        if overflow > 0:
+            rows += self._rows[:overflow]
+            self._rows = self._rows[overflow:]
+        await self._spill(rows, f'more than {self.max_queued} messages are queued')
+
+    async def _spill(self, rows: list[dict[str, Any]], reason: str) -> None:
+        lines = ''.join(
+            json.dumps(row, default=str, separators=(',', ':')) + '\n' for row in rows
+        )
+        try:
+            async with self._spill_lock:
+                await asyncio.to_thread(self._append_spilled, lines)
+        except OSError:
+            getLogger('uvicorn').exception(f'Spill file {self.spill_path} is unusable')
+            self._drop(rows, reason)
+            return
+
+        self._has_spilled = True
+        self.stats.messages_spilled += len(rows)
+        getLogger('uvicorn').warning(
+            f'{len(rows)} messages were spilled to {self.spill_path}, as {reason}'
+        )
+
+    def _append_spilled(self, lines: str) -> None:
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill_path.open('a', encoding='utf-8') as file:
+            file.write(lines)
+            file.flush()
+
+    async def _replay_spilled(self) -> None:
+        async with self._spill_lock:
+            lines = await asyncio.to_thread(self._take_spilled)
+            self._has_spilled = self.spill_path.exists()
+
+        rows = []
+        for line in lines:
+            # Last line is partial if the node was killed while spilling
+            with suppress(ValueError):
+                row = json.loads(line)
+                row['created_on'] = datetime.fromisoformat(row['created_on'])
+                if row['player_id'] is not None:
+                    row['player_id'] = UUID(row['player_id'])
+                rows.append(row)
+        for idx in range(0, len(rows), self.batch_size):
+            self._retries.append(_Batch(rows[idx : idx + self.batch_size]))
+        self.stats.messages_replayed += len(rows)
+        getLogger('uvicorn').info(
+            f'{len(rows)} messages were read back from {self.spill_path}'
+        )
+
+    def _take_spilled(self) -> list[str]:
+        # Renamed first, so the messages spilled meanwhile go to a new file
+        if not self._replay_path.exists():
+            self.spill_path.rename(self._replay_path)
+        lines = self._replay_path.read_text(encoding='utf-8').splitlines()
+        self._replay_path.unlink()
+        return lines
+
+    def _drop(self, rows: list[dict[str, Any]], reason: str) -> None:
+        self.stats.messages_dropped += len(rows)
+        getLogger('uvicorn').error(
+            f'{len(rows)} messages were dropped, as {reason}: '
+            + ', '.join(str(row['id_']) for row in rows)
+        )
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        async with init_db_session() as db_session:
+            await db_session.execute(
+                insert(db.Message).on_conflict_do_nothing(index_elements=['id']), rows
+            )
+
+
+message_writer = MessageWriter(
+    get_config().MESSAGE_BATCH_SIZE,
+    get_config().MESSAGE_FLUSH_INTERVAL,
+    get_config().MESSAGE_QUEUE_SIZE,
+    get_config().MESSAGE_RETRY_MAX_DELAY,
+    get_config().MESSAGE_SPILL_PATH,
+    id_allocator,
+)
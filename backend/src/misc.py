@@ -1,18 +1,30 @@
 import asyncio
 import functools
-from collections import defaultdict
-from datetime import datetime
-from typing import Any, Callable
+import inspect
+import time
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Awaitable, Callable, Coroutine, Hashable, TypeVar
 
 from fastapi import Request, Response, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_config
+
+T = TypeVar('T')
 
 
 class PlayerAlreadyConnectedError(Exception):
     pass
 
 
+class DictionaryUnavailableError(Exception):
+    pass
+
+
 async def request_validation_handler(
     request: Request, exc: RequestValidationError
 ) -> Response:
@@ -58,37 +70,234 @@ async def request_validation_handler(
         return JSONResponse(body, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
 
+_background_tasks: set[asyncio.Task] = set()
+
+
+def run_in_background(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """Run a fire-and-forget task, keeping a reference to it until it's done."""
+
+    def _on_done(task: asyncio.Task) -> None:
+        _background_tasks.discard(task)
+        if not task.cancelled() and (exc := task.exception()):
+            getLogger('uvicorn').error(f'BACKGROUND TASK: Failed with {exc!r}')
+
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_done)
+    return task
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Registry of in-flight calls, coalescing concurrent calls with the same key into
+    a single one. All the callers await the same result or exception. The shared call is
+    cancelled only if all of its callers are cancelled.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+        self.calls = 0  # Calls actually executed
+        self.saved_calls = 0  # Calls which joined an already in-flight call
+
+    async def do(self, key: Hashable, coro_func: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.ensure_future(coro_func()))
+            call.task.add_done_callback(lambda _: self._finish(key, call))
+            self.calls += 1
+        else:
+            self.saved_calls += 1
+
+        call.waiters += 1
+        try:
+            # Shield, so a single cancelled caller doesn't cancel the call for others
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1:
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _finish(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled():
+            call.task.exception()  # Mark as retrieved, even if all callers are gone
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # Served fresh
+    stale_hits: int = 0  # Served stale, while being refreshed in the background
+    misses: int = 0  # Not cached, expired, or invalidated
+    evictions: int = 0  # Entries pushed out of the LRU
+    invalidations: int = 0  # Entries dropped by `invalidate`, `invalidate_all`
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
 class AsyncCache:
-    def __init__(self, ttl: int) -> None:
+    """
+    Memoization of coroutine functions, keyed by the function and its arguments. Kept
+    in a bounded LRU, with the entries fresh for `ttl` seconds, then served stale for
+    another `stale_ttl` seconds while a single call refreshes them in the background.
+    Concurrent misses of the same key share a single call. Results of None are not
+    cached with `cache_none=False`, so a missing row is looked up again once it exists.
+
+    Database sessions are not a part of the key. Functions taking them are not
+    refreshed in the background, as the session is gone along with the request.
+    Results must be invalidated explicitly when the data behind them changes.
+    """
+
+    IGNORED_TYPES: tuple[type, ...] = (AsyncSession,)
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
         self.ttl = ttl
-        self._cache: dict[str, tuple[datetime, Any]] = {}
-        self._lock = asyncio.Lock()
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._in_flight = SingleFlight()
+        # Generations of the keys being loaded, bumped on invalidation of the key, so
+        # loads started before it are not stored. Dropped once the key is not loaded.
+        self._generations: dict[Hashable, int] = {}
+        self._loading: Counter[Hashable] = Counter()
+
+    def cache(
+        self, ttl: float | None = None, stale_ttl: float = 0, cache_none: bool = True
+    ) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+        ttl = self.ttl if ttl is None else ttl
 
-    def cache(self, ttl: int | None = None) -> Callable[..., Any]:
-        ttl = ttl or self.ttl
+        def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+            signature = inspect.signature(func)
 
-        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
             @functools.wraps(func)
-            async def wrapper(*args, **kwargs) -> Any:
-                async with self._lock:
-                    key = f'{func.__module__}.{func.__name__}'
-                    if key in self._cache:
-                        cached_on, result = self._cache[key]
-                        if (datetime.utcnow() - cached_on).seconds < ttl:
-                            return result
-
-                    result = await func(*args, **kwargs)
-                    cached_on = datetime.utcnow()
-                    self._cache[key] = (cached_on, result)
-                    return result
+            async def wrapper(*args: Any, **kwargs: Any) -> T:
+                key, has_ignored = self._make_key(func, signature, args, kwargs)
+
+                def call() -> Awaitable[T]:
+                    return func(*args, **kwargs)
+
+                entry = self._entries.get(key)
+                now = time.monotonic()
+                if entry is not None:
+                    if now < entry.fresh_until:
+                        self._entries.move_to_end(key)
+                        self.stats.hits += 1
+                        return entry.value
+                    if now < entry.stale_until and not has_ignored:
+                        self._entries.move_to_end(key)
+                        self.stats.stale_hits += 1
+                        run_in_background(
+                            self._load(key, call, ttl, stale_ttl, cache_none)
+                        )
+                        return entry.value
+
+                self.stats.misses += 1
+                return await self._load(key, call, ttl, stale_ttl, cache_none)
 
             return wrapper
 
         return decorator
 
-    async def purge(self) -> None:
-        async with self._lock:
-            self._cache = {}
+    def invalidate(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Drop the cached result of the call, the arguments are the ones of `func`."""
+        key, _ = self._make_key(func, inspect.signature(func), args, kwargs)
+        self._bump_generation(key)
+        if self._entries.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+    def invalidate_all(self, func: Callable[..., Any] | None = None) -> None:
+        """Drop all the cached results of the function, or of all the functions."""
+        name = func and self._get_name(func)
+        for key in list(self._loading):
+            if name is None or key[0] == name:  # type: ignore
+                self._bump_generation(key)
+        for key in list(self._entries):
+            if name is None or key[0] == name:  # type: ignore
+                del self._entries[key]
+                self.stats.invalidations += 1
+
+    async def _load(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[T]],
+        ttl: float,
+        stale_ttl: float,
+        cache_none: bool,
+    ) -> T:
+        generation = self._generations.get(key, 0)
+
+        async def load() -> T:
+            value = await call()
+            if self._generations.get(key, 0) != generation:  # Invalidated meanwhile
+                return value
+            if value is not None or cache_none:
+                self._store(key, value, ttl, stale_ttl)
+            return value
+
+        self._loading[key] += 1
+        try:
+            return await self._in_flight.do((key, generation), load)
+        finally:
+            self._loading[key] -= 1
+            if not self._loading[key]:
+                del self._loading[key]
+                self._generations.pop(key, None)
+
+    def _bump_generation(self, key: Hashable) -> None:
+        if key in self._loading:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _store(self, key: Hashable, value: Any, ttl: float, stale_ttl: float) -> None:
+        now = time.monotonic()
+        self._entries[key] = _Entry(value, now + ttl, now + ttl + stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _make_key(
+        self,
+        func: Callable[..., Any],
+        signature: inspect.Signature,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> tuple[Hashable, bool]:
+        """Get the key of the call, and if any of its arguments were left out of it."""
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key_args = []
+        has_ignored = False
+        for name, value in bound.arguments.items():
+            if isinstance(value, self.IGNORED_TYPES):
+                has_ignored = True
+                continue
+            if signature.parameters[name].kind is inspect.Parameter.VAR_KEYWORD:
+                value = tuple(sorted(value.items()))
+            key_args.append((name, value))
+        return (self._get_name(func), tuple(key_args)), has_ignored
+
+    @staticmethod
+    def _get_name(func: Callable[..., Any]) -> str:
+        return f'{func.__module__}.{func.__qualname__}'
 
 
-cache = AsyncCache(60)
+cache = AsyncCache(get_config().CACHE_TTL, get_config().CACHE_SIZE)
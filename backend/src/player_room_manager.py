@@ -1,29 +1,54 @@
+from types import MappingProxyType
+from typing import Any, Mapping, ValuesView
 from uuid import UUID
 
 import src.schemas.domain as d
 
 
 class PlayerRoomPool:
-    """Manages players and rooms currently active in the game."""
+    """
+    Manages players and rooms currently active in the game.
+
+    Besides the primary maps, the pool keeps secondary indexes up to date (players by
+    name, rooms by status, rooms with free seats), so it must be notified of changes
+    to the indexed fields through `set_room_status` and `update_room`. Accessors
+    return live, read-only views instead of copies.
+    """
 
     def __init__(self) -> None:
         self._room_map: dict[int, d.Room] = {d.LOBBY.id_: d.LOBBY}
         self._player_map: dict[UUID, d.Player] = {}
 
+        self._game_rooms: dict[int, d.Room] = {}  # All the rooms but the lobby
+        self._players_by_name: dict[str, d.Player] = {}
+        self._rooms_by_status: dict[d.RoomStatusEnum, dict[int, d.Room]] = {
+            status: {} for status in d.RoomStatusEnum
+        }
+        self._rooms_with_free_seats: dict[int, d.Room] = {}
+
     @property
     def active_players(self) -> int:
         return len(self._player_map)
 
     @property
     def active_rooms(self) -> int:
-        return len(self._room_map) - 1
+        return len(self._game_rooms)
+
+    @property
+    def open_rooms(self) -> int:
+        return len(self._rooms_by_status[d.RoomStatusEnum.OPEN])
 
     def get_player(self, player_id: UUID) -> d.Player:
         return self._player_map[player_id]
 
-    def get_room_players(self, room_id: int) -> set[d.Player]:
-        room_players = self._room_map[room_id].players
-        return set(room_players.values())
+    def get_player_by_name(self, name: str) -> d.Player:
+        return self._players_by_name[name]
+
+    def get_room_players(self, room_id: int) -> ValuesView[d.Player]:
+        return self._room_map[room_id].players.values()
+
+    def count_room_players(self, room_id: int) -> int:
+        return len(self._room_map[room_id].players)
 
     def add_player(self, player: d.Player, room_id: int) -> None:
         # TODO: Should the room be implicitly created if it doesn't exist?
@@ -31,10 +56,15 @@ class PlayerRoomPool:
         player.room = room
         room.players[player.id_] = player
         self._player_map[player.id_] = player
+        self._players_by_name[player.name] = player
+        self._index_free_seats(room)
 
     def remove_player(self, player_id: UUID) -> None:
         player = self._player_map.pop(player_id)
-        self._room_map[player.room.id_].players.pop(player_id)
+        self._players_by_name.pop(player.name, None)
+        room = self._room_map[player.room.id_]
+        room.players.pop(player_id)
+        self._index_free_seats(room)
 
     # ----------------------------------------------------------------------------------
 
@@ -52,13 +82,22 @@ class PlayerRoomPool:
             room = player.room
         return room
 
-    def get_rooms(self) -> set[d.Room]:
-        return set(self._room_map.values()) - {d.LOBBY}
+    def get_rooms(self) -> ValuesView[d.Room]:
+        return self._game_rooms.values()
+
+    def get_rooms_by_status(self, status: d.RoomStatusEnum) -> ValuesView[d.Room]:
+        return self._rooms_by_status[status].values()
+
+    def get_rooms_with_free_seats(self) -> Mapping[int, d.Room]:
+        return MappingProxyType(self._rooms_with_free_seats)
 
     def create_room(self, room: d.Room) -> None:
         if self.does_room_exist(room.id_):
             raise ValueError('Room already exists')
         self._room_map[room.id_] = room
+        self._game_rooms[room.id_] = room
+        self._rooms_by_status[room.status][room.id_] = room
+        self._index_free_seats(room)
 
     def remove_room(self, room_id: int) -> None:
         room = self.get_room(room_id=room_id)
@@ -66,9 +105,33 @@ class PlayerRoomPool:
             raise ValueError('Room is not empty')
 
         self._room_map.pop(room_id)
+        self._game_rooms.pop(room_id)
+        self._rooms_by_status[room.status].pop(room_id)
+        self._rooms_with_free_seats.pop(room_id, None)
+
+    def set_room_status(self, room: d.Room, status: d.RoomStatusEnum) -> None:
+        if room.id_ in self._game_rooms:
+            self._rooms_by_status[room.status].pop(room.id_)
+            self._rooms_by_status[status][room.id_] = room
+        room.status = status
+
+    def update_room(self, room: d.Room, **kwargs: Any) -> None:
+        """Update the room's fields, keeping the indexes of the pool up to date."""
+        if 'status' in kwargs:
+            self.set_room_status(room, kwargs.pop('status'))
+        room.update(**kwargs)
+        self._index_free_seats(room)
 
     def does_room_exist(self, room_id: int) -> bool:
         return room_id in self._room_map
 
+    def _index_free_seats(self, room: d.Room) -> None:
+        if room.id_ not in self._game_rooms:
+            return
+        if len(room.players) < room.capacity:
+            self._rooms_with_free_seats[room.id_] = room
+        else:
+            self._rooms_with_free_seats.pop(room.id_, None)
+
 
 player_room_pool = PlayerRoomPool()
@@ -0,0 +1,71 @@
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Mapping
+from uuid import UUID
+
+from config import get_config
+
+
+class ActionClassEnum(str, Enum):
+    CHAT = 'chat'  # chat messages sent over the websocket
+    GAME_INPUT = 'game_input'  # words sent over the websocket
+    LOBBY = 'lobby'  # lobby subscriptions and state resyncs sent over the websocket
+    ROOM = 'room'  # room REST endpoints
+
+
+@dataclass(slots=True)
+class _Bucket:
+    tokens: float
+    updated_on: float  # monotonic
+
+
+class RateLimiter:
+    """
+    Token buckets per player and action class. Each action takes a token, tokens are
+    refilled at a constant `rate` up to the bucket's `capacity`, which allows short
+    bursts while capping the sustained rate.
+    """
+
+    def __init__(self, limits: Mapping[ActionClassEnum, tuple[float, int]]) -> None:
+        self.limits = limits  # action class: (tokens per second, capacity)
+        self._buckets: dict[tuple[UUID, ActionClassEnum], _Bucket] = {}
+
+    def allow(self, player_id: UUID, action: ActionClassEnum) -> bool:
+        """Take a token from the player's bucket, if there is any."""
+        bucket = self._refill(player_id, action)
+        if bucket.tokens < 1:
+            return False
+        bucket.tokens -= 1
+        return True
+
+    def retry_after(self, player_id: UUID, action: ActionClassEnum) -> float:
+        """Get the seconds until the player can take the action again."""
+        bucket = self._refill(player_id, action)
+        rate, _ = self.limits[action]
+        return max(0.0, (1 - bucket.tokens) / rate)
+
+    def forget(self, player_id: UUID) -> None:
+        for action in self.limits:
+            self._buckets.pop((player_id, action), None)
+
+    def _refill(self, player_id: UUID, action: ActionClassEnum) -> _Bucket:
+        rate, capacity = self.limits[action]
+        now = time.monotonic()
+
+        bucket = self._buckets.get((player_id, action))
+        if bucket is None:
+            bucket = self._buckets[(player_id, action)] = _Bucket(capacity, now)
+        else:
+            elapsed = now - bucket.updated_on
+            bucket.tokens = min(capacity, bucket.tokens + elapsed * rate)
+            bucket.updated_on = now
+        return bucket
+
+
+rate_limiter = RateLimiter(
+    {
+        ActionClassEnum(action): limit
+        for action, limit in get_config().RATE_LIMITS.items()
+    }
+)
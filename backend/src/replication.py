@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import src.schemas.domain as d
+import src.schemas.validation as v
+from src.player_room_manager import PlayerRoomPool
+
+# Players and rooms are replicated between the nodes as plain, JSON-serializable
+# dicts. Replicas of players connected to other nodes have no websocket.
+
+
+def player_to_replica(player: d.Player) -> dict[str, Any]:
+    return {
+        'id': str(player.id_),
+        'name': player.name,
+        'created_on': player.created_on.isoformat(),
+        'room_id': player.room.id_,
+        'ready': player.ready,
+        'in_game': player.in_game,
+    }
+
+
+def player_from_replica(data: dict[str, Any], pool: PlayerRoomPool) -> d.Player:
+    """Get the player from the pool, or create its replica if it's not there."""
+    try:
+        return pool.get_player(UUID(data['id']))
+    except KeyError:
+        pass
+
+    return d.Player(
+        id_=UUID(data['id']),
+        name=data['name'],
+        created_on=datetime.fromisoformat(data['created_on']),
+        room=d.LOBBY,
+        ready=data['ready'],
+        in_game=data['in_game'],
+        websocket=None,
+    )
+
+
+def room_to_replica(room: d.Room) -> dict[str, Any]:
+    rules = room.rules.to_dict()
+    rules.pop('type_')  # The only game type is the default one
+    return {
+        'id': room.id_,
+        'name': room.name,
+        'status': room.status,
+        'capacity': room.capacity,
+        'created_on': room.created_on.isoformat(),
+        'rules': rules,
+        'owner': player_to_replica(room.owner),
+        'node_id': room.node_id,
+        'players': [player_to_replica(player) for player in room.players.values()],
+    }
+
+
+def room_from_replica(data: dict[str, Any], pool: PlayerRoomPool) -> d.Room:
+    return d.Room(
+        id_=data['id'],
+        name=data['name'],
+        status=d.RoomStatusEnum(data['status']),
+        capacity=data['capacity'],
+        created_on=datetime.fromisoformat(data['created_on']),
+        owner=player_from_replica(data['owner'], pool),
+        rules=d.DeathmatchRules(**data['rules']),
+        node_id=data['node_id'],
+    )
+
+
+def apply_room_state(
+    room: d.Room, room_state: v.RoomState, pool: PlayerRoomPool
+) -> None:
+    """Bring the room's replica up to date with a `RoomState` broadcast by another node."""
+    pool.update_room(
+        room,
+        status=room_state.status,
+        capacity=room_state.capacity,
+        rules=room_state.rules.model_dump(exclude={'type_'}),
+    )
+
+    for name, player_out in (room_state.players or {}).items():
+        if player_out is None:
+            continue
+        try:
+            player = pool.get_player_by_name(name)
+        except KeyError:
+            continue
+        player.ready = player_out.ready
+        player.in_game = player_out.in_game
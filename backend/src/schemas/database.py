@@ -64,6 +64,14 @@ class Player(Base):
 
 class Room(Base):
     __tablename__ = 'rooms'
+    __table_args__ = (
+        # Rooms not ended yet, checked periodically by `expire_inactive_rooms`
+        sa.Index(
+            'ix_rooms_id_not_ended',
+            'id',
+            postgresql_where=sa.text('ended_on IS NULL'),
+        ),
+    )
 
     id_: so.Mapped[int] = so.mapped_column('id', primary_key=True)
     name: so.Mapped[str] = so.mapped_column(sa.String(10), unique=True)
@@ -80,6 +88,7 @@ class GameStatusEnum(str, Enum):
 
     STARTED = d.GameStateEnum.STARTED
     ENDED = d.GameStateEnum.ENDED
+    FAILED = 'FAILED'  # Interrupted by a server error, not counted in the stats
 
 
 class Game(Base):
@@ -103,6 +112,10 @@ class Game(Base):
 # Acts as a Domain model as well as internal schema does not differ from the database schema
 class Message(Base):
     __tablename__ = 'messages'
+    __table_args__ = (
+        # Chat history of a room, in the order the messages were sent
+        sa.Index('ix_messages_room_id_created_on', 'room_id', 'created_on'),
+    )
 
     id_: so.Mapped[int] = so.mapped_column('id', primary_key=True)
     content: so.Mapped[str] = so.mapped_column(sa.String(255))
@@ -131,7 +144,45 @@ class Turn(Base):
     started_on: so.Mapped[datetime] = so.mapped_column(default=sa.func.now())
     ended_on: so.Mapped[datetime | None] = so.mapped_column(nullable=True)
 
-    game_id: so.Mapped[int] = so.mapped_column(sa.ForeignKey('games.id'))
+    # Unique constraint above leads with `word`, so it's no use for joins on games
+    game_id: so.Mapped[int] = so.mapped_column(sa.ForeignKey('games.id'), index=True)
     game: so.Mapped[Game] = so.relationship(back_populates='turns')
     player_id: so.Mapped[UUID] = so.mapped_column(sa.ForeignKey('players.id'))
     player: so.Mapped[Player] = so.relationship(back_populates='turns')
+
+
+class AllTimeStatistics(Base):
+    """
+    Statistics of all the ended games, in a single row updated as each game ends, so
+    they're never aggregated over all the games and their turns.
+    """
+
+    __tablename__ = 'all_time_statistics'
+
+    ROW_ID = 1
+
+    id_: so.Mapped[int] = so.mapped_column('id', primary_key=True)
+    total_games: so.Mapped[int] = so.mapped_column(default=0)
+    longest_chain: so.Mapped[int] = so.mapped_column(default=0)  # words
+    longest_game_time: so.Mapped[int] = so.mapped_column(default=0)  # seconds
+
+
+class WordDefinition(Base):
+    """Persisted tier of the dictionary lookup cache."""
+
+    __tablename__ = 'word_definitions'
+
+    word: so.Mapped[str] = so.mapped_column(sa.String(255), primary_key=True)
+    is_correct: so.Mapped[bool] = so.mapped_column()
+    definitions: so.Mapped[list | None] = so.mapped_column(sa.JSON)
+    fetched_on: so.Mapped[datetime] = so.mapped_column(default=sa.func.now())
+
+    def to_domain(self) -> d.Word:
+        definitions = (
+            [tuple(definition) for definition in self.definitions]  # JSON -> tuples
+            if self.definitions is not None
+            else None
+        )
+        return d.Word(
+            content=self.word, is_correct=self.is_correct, definitions=definitions
+        )
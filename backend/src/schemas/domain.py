@@ -47,7 +47,7 @@ class Player(DataclassMixin):
     ready: bool = False  # Flag necessary to start a game
     in_game: bool = False  # Flag denoting if the player is still in the game view (e.g. post-game statistics)
 
-    websocket: WebSocket
+    websocket: WebSocket | None = None  # None if connected to another node
 
     def __hash__(self) -> int:
         return self.id_.int
@@ -79,6 +79,14 @@ class Player(DataclassMixin):
         return result
 
 
+@dataclass(frozen=True, kw_only=True)
+class GameParticipant:
+    """Player as passed to a game, with no room or websocket, so it can cross to workers."""
+
+    id_: UUID
+    name: str
+
+
 @dataclass(kw_only=True)
 class GamePlayer(DataclassMixin):
     id_: UUID
@@ -93,7 +101,7 @@ class GamePlayer(DataclassMixin):
 
 
 class WordInputBuffer:
-    """Buffer for propagating WordInput from the message listening coroutine to `run_game` coroutine."""
+    """Buffer for propagating WordInput from the message listening coroutine to `run_game` coroutine of the game."""
 
     def __init__(self):
         self._lock = asyncio.Lock()
@@ -135,8 +143,7 @@ class Room(DataclassMixin):
     owner: Player
     rules: DeathmatchRules
     players: dict[UUID, Player] = field(default_factory=dict)
-
-    word_input_buffer: WordInputBuffer = WordInputBuffer()
+    node_id: str | None = None  # Node running the room's games and expiring it
 
     def __hash__(self) -> int:
         return hash(self.id_)
@@ -179,6 +186,7 @@ class GameStateEnum(str, Enum):
     WAITING = 'WAITING'
     STARTED_TURN = 'STARTED_TURN'
     ENDED_TURN = 'ENDED_TURN'
+    DEFINED_WORD = 'DEFINED_WORD'  # Not a game phase, follow-up to ENDED_TURN
 
 
 @dataclass(kw_only=True)
@@ -42,6 +42,7 @@ UTCDatetime = Annotated[
 class CurrentStatistics(GeneralBaseModel):
     active_players: int
     active_rooms: int
+    open_rooms: int
 
 
 class AllTimeStatistics(GeneralBaseModel):
@@ -107,6 +108,7 @@ class RoomOut(GeneralBaseModel):
     status: d.RoomStatusEnum
     rules: DeathmatchRules
     owner_name: str
+    created_on: UTCDatetime
 
 
 class RoomIn(GeneralBaseModel):
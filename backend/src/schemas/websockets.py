@@ -17,6 +17,8 @@ class WebSocketMessageTypeEnum(str, Enum):
     CONNECTION_STATE = 'connection_state'
     GAME_INPUT = 'game_input'  # player's input his turn
     ACTION = 'action'
+    LOBBY_SUBSCRIPTION = 'lobby_subscription'  # lobby view the player is interested in
+    STATE_RESYNC = 'state_resync'  # deltas the player missed, e.g. after a reconnect
 
 
 #################################### GAME INPUTS ####################################
@@ -75,10 +77,23 @@ class EndTurnState(_GameState, v.GeneralBaseModel):
     current_turn: v.TurnOut
 
 
+class DefinedWordState(_GameState, v.GeneralBaseModel):
+    """Definitions of a word from the already ended turn, fetched in the background."""
+
+    state: Literal[d.GameStateEnum.DEFINED_WORD] = d.GameStateEnum.DEFINED_WORD
+    turn_idx: int
+    word: d.Word
+
+
 # Pydantic's Discriminated Union
 # https://docs.pydantic.dev/latest/concepts/unions/#discriminated-unions-with-str-discriminators
 GameState = Annotated[
-    StartGameState | EndGameState | WaitState | StartTurnState | EndTurnState,
+    StartGameState
+    | EndGameState
+    | WaitState
+    | StartTurnState
+    | EndTurnState
+    | DefinedWordState,
     Field(discriminator='state'),
 ]
 
@@ -118,6 +133,35 @@ class LobbyState(v.GeneralBaseModel):
     rooms: Mapping[int, v.RoomOut | None] | None = None  # room_id: room
     players: Mapping[str, v.LobbyPlayerOut | None] | None = None  # player_name: player
     stats: v.CurrentStatistics | None = None
+    # If set, `rooms` (and `players`, if included) hold the whole subscribed view or
+    # lobby, and replace the client's ones instead of updating them
+    full_view: bool = False
+    # Position of the delta in the node's lobby stream, see `StateResync`
+    epoch: str | None = None
+    version: int | None = None
+    prev_version: int | None = None
+
+
+class LobbySortEnum(str, Enum):
+    NEWEST = 'newest'
+    FULLEST = 'fullest'
+
+
+class LobbySubscription(v.GeneralBaseModel):
+    """
+    Page of the room list the player is interested in. Subscribed players receive only
+    the rooms inside of it, the others receive all of them.
+    """
+
+    type_: Literal[WebSocketMessageTypeEnum.LOBBY_SUBSCRIPTION] = Field(
+        default=WebSocketMessageTypeEnum.LOBBY_SUBSCRIPTION
+    )
+    open_only: bool = False
+    free_seats_only: bool = False
+    round_time: int | None = None
+    sort: LobbySortEnum = LobbySortEnum.NEWEST
+    offset: int = Field(0, ge=0)
+    limit: int = Field(20, ge=1, le=100)
 
 
 class RoomState(v.GeneralBaseModel):
@@ -131,10 +175,39 @@ class RoomState(v.GeneralBaseModel):
     rules: v.DeathmatchRules
     owner_name: str
     players: Mapping[str, v.RoomPlayerOut | None] | None = None  # player_name: player
+    # If set, `players` holds all of the room's players and replaces the client's ones
+    full_view: bool = False
+    # Position of the delta in the node's stream of the room, see `StateResync`
+    epoch: str | None = None
+    version: int | None = None
+    prev_version: int | None = None
+
+
+class StateStreamEnum(str, Enum):
+    LOBBY = 'lobby'
+    ROOM = 'room'
+
+
+class StateResync(v.GeneralBaseModel):
+    """
+    Ask for the deltas of the lobby or the player's room following the given version,
+    sent by clients which received a delta not applying on top of their last one. The
+    missing deltas are sent merged into one, or a snapshot of the whole state if they
+    are not kept anymore.
+    """
+
+    type_: Literal[WebSocketMessageTypeEnum.STATE_RESYNC] = Field(
+        default=WebSocketMessageTypeEnum.STATE_RESYNC
+    )
+    stream: StateStreamEnum
+    room_id: int | None = None  # Required for the room stream
+    epoch: str | None = None
+    version: int = Field(0, ge=0)
 
 
 class CustomWebsocketCodeEnum(int, Enum):
     MULTIPLE_CLIENTS = 4001  # Player is already connected with another client
+    RATE_LIMITED = 4002  # Player sent too many messages, the message was dropped
 
 
 class ConnectionState(v.GeneralBaseModel):
@@ -143,6 +216,7 @@ class ConnectionState(v.GeneralBaseModel):
     )
     code: CustomWebsocketCodeEnum
     reason: str
+    retry_after: float | None = None  # seconds, when the action can be retried
 
 
 class WebSocketMessage(v.GeneralBaseModel):
@@ -154,4 +228,14 @@ class WebSocketMessage(v.GeneralBaseModel):
         | ConnectionState
         | GameInput
         | Action
+        | LobbySubscription
+        | StateResync
     ) = Field(discriminator='type_')
+
+
+class InboundWebSocketMessage(v.GeneralBaseModel):
+    """Websocket message sent by the client, a subset of `WebSocketMessage`."""
+
+    payload: Message | GameInput | LobbySubscription | StateResync = Field(
+        discriminator='type_'
+    )
@@ -0,0 +1,49 @@
+from collections import deque
+from typing import Generic, TypeVar
+
+import src.schemas.validation as v
+
+S = TypeVar('S', v.LobbyState, v.RoomState)
+
+
+class StateLog(Generic[S]):
+    """
+    Ring buffer of the latest deltas of a single state stream (the lobby, a room),
+    numbered with consecutive versions. Every delta carries the version it was
+    applied on top of (`prev_version`), so the clients can tell they missed one and
+    ask for the missing deltas, instead of the whole state.
+
+    Versions are assigned by the node sending the deltas, so they are valid within
+    its `epoch` only.
+    """
+
+    def __init__(self, epoch: str, size: int) -> None:
+        self.epoch = epoch
+        self.version = 0
+        self._deltas: deque[S] = deque(maxlen=size)
+
+    def append(self, state: S) -> S:
+        """Assign the next version to the delta and keep it."""
+        self.version += 1
+        state = state.model_copy(
+            update={
+                'epoch': self.epoch,
+                'version': self.version,
+                'prev_version': self.version - 1,
+            }
+        )
+        self._deltas.append(state)
+        return state
+
+    def since(self, epoch: str | None, version: int) -> list[S] | None:
+        """
+        Get the deltas following the version, oldest first. Returns None if some of
+        them are not kept anymore, or the version is not known at all.
+        """
+        if epoch != self.epoch or not 0 <= version <= self.version:
+            return None
+        if version == self.version:
+            return []
+        if not self._deltas or self._deltas[0].prev_version > version:  # type: ignore
+            return None
+        return [state for state in self._deltas if state.version > version]  # type: ignore
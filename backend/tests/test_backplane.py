@@ -0,0 +1,362 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any
+
+import asyncpg  # type: ignore[import-untyped]
+import pytest
+
+import src.backplane as backplane_module
+import src.schemas.domain as d
+import src.schemas.validation as v
+from src.backplane import LocalBackplane, LocalHub, PostgresBackplane
+from src.game.scheduler import scheduler
+from src.helpers import start_room_game
+from tests.conftest import create_node, create_player, settle
+
+
+def test_local_backplanes_round_trip() -> None:
+    async def run() -> None:
+        hub = LocalHub()
+        first, second = LocalBackplane(hub), LocalBackplane(hub)
+        received: dict[LocalBackplane, list[dict[str, Any]]] = {first: [], second: []}
+        for backplane in (first, second):
+
+            async def handler(message: dict[str, Any], backplane=backplane) -> None:
+                if message['n'] == 0:
+                    raise ValueError('Handler errors do not stop the dispatch')
+                received[backplane].append(message)
+
+            backplane.subscribe('test', handler)
+            await backplane.start()
+
+        first.publish('test', n=0)
+        first.publish('test', n=1)
+        first.publish('test', n=2)
+        first.publish('test', target=first.node_id, n=3)  # Not for the others
+        first.publish('other', n=4)  # No handler
+        second.publish('test', target=first.node_id, n=5)
+        await settle()
+
+        assert [message['n'] for message in received[second]] == [1, 2]
+        assert [message['n'] for message in received[first]] == [5]
+        assert received[first][0]['origin'] == second.node_id
+
+        for backplane in (first, second):
+            await backplane.stop()
+
+    asyncio.run(run())
+
+
+def test_single_local_backplane_is_not_distributed() -> None:
+    assert not LocalBackplane().is_distributed
+    assert LocalBackplane(LocalHub()).is_distributed is False
+
+
+def test_postgres_backplane_splits_and_reassembles_messages() -> None:
+    sender, other_sender = PostgresBackplane('', 'ch'), PostgresBackplane('', 'ch')
+    receiver = PostgresBackplane('', 'ch')
+    # Multi-byte characters, so the parts are limited by their size in bytes
+    big = '€' * (PostgresBackplane.MAX_PAYLOAD * 2) + '🙂' * 1000
+    sender.publish('big', text=big)
+    other_sender.publish('big', text='x' * PostgresBackplane.MAX_PAYLOAD * 2)
+    sender.publish('small', text='small')
+
+    payloads = [sender._outgoing.get_nowait() for _ in range(sender._outgoing.qsize())]
+    other_payloads = [
+        other_sender._outgoing.get_nowait()
+        for _ in range(other_sender._outgoing.qsize())
+    ]
+    assert len(payloads) > 2
+    assert len(other_payloads) > 1
+    assert all(
+        len(payload.encode()) < PostgresBackplane.MAX_PAYLOAD
+        for payload in payloads + other_payloads
+    )
+
+    # Parts of messages of different nodes arrive interleaved
+    for idx in range(max(len(payloads), len(other_payloads))):
+        for node_payloads in (payloads, other_payloads):
+            if idx < len(node_payloads):
+                receiver._on_notification(None, 0, 'ch', node_payloads[idx])  # type: ignore
+
+    messages = [
+        json.loads(receiver._incoming.get_nowait())
+        for _ in range(receiver._incoming.qsize())
+    ]
+    assert sorted(
+        (message['origin'], message['kind'], message['text']) for message in messages
+    ) == sorted(
+        [
+            (other_sender.node_id, 'big', 'x' * PostgresBackplane.MAX_PAYLOAD * 2),
+            (sender.node_id, 'big', big),
+            (sender.node_id, 'small', 'small'),
+        ]
+    )
+    assert not receiver._parts
+
+    # Own messages are skipped
+    sender._on_notification(None, 0, 'ch', payloads[-1])  # type: ignore
+    assert sender._incoming.empty()
+
+
+def test_postgres_backplane_drops_incomplete_messages() -> None:
+    sender, receiver = PostgresBackplane('', 'ch'), PostgresBackplane('', 'ch')
+    receiver.PARTS_TIMEOUT = 0.05
+    sender.publish('big', text='x' * PostgresBackplane.MAX_PAYLOAD)
+    sender.publish('big', text='y' * PostgresBackplane.MAX_PAYLOAD)
+    sender.publish('small', text='z')
+    payloads = [sender._outgoing.get_nowait() for _ in range(sender._outgoing.qsize())]
+    first_message, second_message = (
+        [payload for payload in payloads if payload.split(':')[1] == message_no]
+        for message_no in ('1', '2')
+    )
+    assert len(first_message) == len(second_message) > 2
+
+    # Message missing one of its middle parts is not reassembled
+    for payload in first_message[:1] + first_message[2:]:
+        receiver._on_notification(None, 0, 'ch', payload)  # type: ignore
+    assert not receiver._parts
+
+    # Message missing its last part is dropped, once the next one arrives late enough
+    for payload in second_message[:-1]:
+        receiver._on_notification(None, 0, 'ch', payload)  # type: ignore
+    assert receiver._parts
+    time.sleep(0.06)
+    receiver._on_notification(None, 0, 'ch', payloads[-1])  # type: ignore
+    assert not receiver._parts
+
+    messages = [
+        json.loads(receiver._incoming.get_nowait())
+        for _ in range(receiver._incoming.qsize())
+    ]
+    assert [message['kind'] for message in messages] == ['small']
+
+
+class FakeConnection:
+    """Stands in for `asyncpg.Connection`, the tests don't have a database."""
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.broken = False  # Dropped without the client noticing
+        self.listeners: list[Any] = []
+        self.termination_listeners: list[Any] = []
+        self.executed: list[tuple] = []
+
+    async def add_listener(self, channel: str, callback: Any) -> None:
+        self.listeners.append(callback)
+
+    def add_termination_listener(self, callback: Any) -> None:
+        self.termination_listeners.append(callback)
+
+    async def execute(self, query: str, *args: Any, timeout: float = 0) -> None:
+        if self.closed:
+            raise asyncpg.InterfaceError('connection is closed')
+        if self.broken:
+            raise asyncio.TimeoutError
+        self.executed.append(args)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def terminate(self) -> None:
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+    async def close(self) -> None:
+        self.terminate()
+
+
+def test_postgres_backplane_reconnects(monkeypatch: pytest.MonkeyPatch) -> None:
+    connections: list[FakeConnection] = []
+    failures = iter([False, False, True])  # Third connect, a reconnect, fails
+
+    async def connect(dsn: str) -> FakeConnection:
+        if next(failures, False):
+            raise OSError('Database is down')
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(backplane_module.asyncpg, 'connect', connect)
+
+    async def wait_for(condition: Any) -> None:
+        for _ in range(100):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError('Condition was not met')
+
+    async def run() -> None:
+        backplane = PostgresBackplane('dsn', 'ch')
+        backplane.RECONNECT_MAX_DELAY = 0.01
+        backplane.HEALTH_CHECK_INTERVAL = 0.01
+        reconnects: list[dict[str, Any]] = []
+
+        async def on_reconnected(message: dict[str, Any]) -> None:
+            reconnects.append(message)
+
+        backplane.subscribe('reconnected', on_reconnected)
+        await backplane.start()
+        listen_conn, notify_conn = connections
+
+        # Listening connection is reopened and listens again, despite a failed attempt
+        listen_conn.terminate()
+        await wait_for(lambda: len(reconnects) == 1)
+        assert backplane._listen_conn is connections[-1]
+        assert connections[-1].listeners == [backplane._on_notification]
+
+        # Dropped silently, so it's only found out by the health check
+        connections[-1].broken = True
+        await wait_for(lambda: len(reconnects) == 2)
+        assert len(connections) == 4
+
+        # Notification is sent again, on a new connection
+        notify_conn.closed = True
+        backplane.publish('test', n=1)
+        await wait_for(lambda: len(connections) == 5 and connections[-1].executed)
+        channel, payload = connections[-1].executed[0]
+        assert json.loads(payload.split(':', 4)[-1])['n'] == 1
+
+        await backplane.stop()
+        assert len(reconnects) == 2  # Closing the connections is not a connection loss
+
+    asyncio.run(run())
+
+
+def test_reconnected_node_resyncs() -> None:
+    async def run() -> None:
+        hub = LocalHub()
+        node_a, _, lobby_a = create_node(hub)
+        node_b, _, lobby_b = create_node(hub)
+        for node in (node_a, node_b):
+            await node.backplane.start()
+        player = create_player('b', lobby_b)
+        node_b.connect(player, d.LOBBY.id_)
+        await settle()
+        assert node_a.pool.get_player(player.id_).name == 'b'
+
+        # Node A missed the player while its channel was down
+        node_a.pool.remove_player(player.id_)
+        node_a.backplane._reconnected()
+        await settle()
+        assert node_a.pool.get_player(player.id_).name == 'b'
+        assert node_a.pool.active_players == 1
+
+        for node in (node_a, node_b):
+            await node.backplane.stop()
+
+    asyncio.run(run())
+
+
+def test_nodes_exchange_room_lobby_and_game_events() -> None:
+    async def run() -> None:
+        hub = LocalHub()
+        node_a, games_a, lobby_a = create_node(hub)
+        node_b, games_b, lobby_b = create_node(hub)
+        for node in (node_a, node_b):
+            await node.backplane.start()
+
+        # Lobby: players connected to either node are seen by both
+        player_a, player_b = create_player('a', lobby_a), create_player('b', lobby_b)
+        node_a.connect(player_a, d.LOBBY.id_)
+        node_b.connect(player_b, d.LOBBY.id_)
+        await settle()
+        assert node_a.pool.active_players == node_b.pool.active_players == 2
+
+        # Rooms: created on A and joined from B
+        room = d.Room(
+            id_=7,
+            name='room',
+            capacity=5,
+            created_on=datetime.utcnow(),
+            owner=player_a,
+            rules=d.DeathmatchRules(round_time=5, start_score=0, penalty=-5, reward=2),
+            node_id=node_a.backplane.node_id,
+        )
+        node_a.create_room(room)
+        node_a.move_player(player_a.id_, d.LOBBY.id_, room.id_)
+        await settle()
+        node_b.move_player(player_b.id_, d.LOBBY.id_, room.id_)
+        await settle()
+        for node in (node_a, node_b):
+            assert {player.name for player in node.pool.get_room_players(7)} == {
+                'a',
+                'b',
+            }
+
+        await node_b.broadcast_chat_message(
+            v.Message(content='hi', player_name='b', room_id=room.id_)
+        )
+        await settle()
+        assert player_a.websocket.sent[-1]['content'] == 'hi'  # type: ignore
+
+        # Games: started from B, run by A owning the room, relayed back to B
+        room_b = node_b.pool.get_room(room_id=room.id_)
+        start_room_game(99, room_b, node_b, games_b)
+        await settle()
+        assert 99 in games_a._local_games.games
+        assert not games_b._local_games.games
+        game_states = [
+            frame['state']
+            for frame in player_b.websocket.sent  # type: ignore
+            if frame['type_'] == 'game_state'
+        ]
+        assert game_states[0] == 'STARTED'
+
+        await node_a.disconnect(player_a.id_)
+        await settle()
+        assert node_b.pool.active_players == 1
+
+        await scheduler.stop()
+        for node in (node_a, node_b):
+            await node.backplane.stop()
+
+    asyncio.run(run())
+
+
+def test_synced_rooms_are_in_lobby_snapshots() -> None:
+    async def run() -> None:
+        hub = LocalHub()
+        node_a, _, lobby_a = create_node(hub)
+        await node_a.backplane.start()
+        owner = create_player('a', lobby_a)
+        node_a.connect(owner, d.LOBBY.id_)
+        room = d.Room(
+            id_=7,
+            name='room',
+            capacity=5,
+            created_on=datetime.utcnow(),
+            owner=owner,
+            rules=d.DeathmatchRules(round_time=5, start_score=0, penalty=-5, reward=2),
+            node_id=node_a.backplane.node_id,
+        )
+        node_a.create_room(room)
+        node_a.move_player(owner.id_, d.LOBBY.id_, room.id_)
+
+        # Node joins after the room was published to the lobby
+        node_b, _, lobby_b = create_node(hub)
+        await node_b.backplane.start()
+        node_b.request_sync()
+        await settle()
+
+        player = create_player('b', lobby_b)
+        node_b.connect(player, d.LOBBY.id_)
+        node_b.send_lobby_snapshot(player.id_)
+        node_b.subscribe_to_lobby(player.id_, v.LobbySubscription(open_only=True))
+        await settle()
+
+        snapshots = [
+            frame
+            for frame in player.websocket.sent  # type: ignore
+            if frame['type_'] == 'lobby_state' and frame['full_view']
+        ]
+        assert len(snapshots) == 2  # Whole lobby, then the subscribed view
+        for snapshot in snapshots:
+            assert snapshot['rooms']['7']['players_no'] == 1
+
+        for node in (node_a, node_b):
+            await node.backplane.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,163 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.misc import AsyncCache
+
+
+def test_concurrent_misses_share_a_call() -> None:
+    async def run() -> None:
+        cache = AsyncCache(ttl=60, maxsize=10)
+        calls: list[int] = []
+
+        @cache.cache()
+        async def load(x: int) -> int:
+            calls.append(x)
+            await asyncio.sleep(0.01)
+            return x * 10
+
+        assert await asyncio.gather(*(load(1) for _ in range(5))) == [10] * 5
+        assert await load(2) == 20
+        assert calls == [1, 2]
+        assert cache.stats.misses == 6
+
+    asyncio.run(run())
+
+
+def test_sessions_are_not_a_part_of_the_key() -> None:
+    async def run() -> None:
+        cache = AsyncCache(ttl=60, maxsize=10)
+        calls: list[int] = []
+
+        @cache.cache()
+        async def load(x: int, session: AsyncSession) -> int:
+            calls.append(x)
+            return x
+
+        await load(1, AsyncSession())
+        await load(1, AsyncSession())
+        assert calls == [1]
+
+    asyncio.run(run())
+
+
+def test_stale_entries_are_refreshed_in_background() -> None:
+    async def run() -> None:
+        cache = AsyncCache(ttl=60, maxsize=10)
+        calls: list[int] = []
+
+        @cache.cache(ttl=0.05, stale_ttl=1)
+        async def load(x: int) -> int:
+            calls.append(x)
+            return len(calls)
+
+        assert await load(1) == 1
+        await asyncio.sleep(0.06)
+        assert await load(1) == 1  # Served stale
+        await asyncio.sleep(0.01)
+        assert await load(1) == 2
+        assert cache.stats.stale_hits == 1
+
+    asyncio.run(run())
+
+
+def test_invalidation_is_per_key() -> None:
+    async def run() -> None:
+        cache = AsyncCache(ttl=60, maxsize=10)
+        calls: list[int] = []
+
+        @cache.cache()
+        async def load(x: int) -> int:
+            calls.append(x)
+            call_no = len(calls)
+            await asyncio.sleep(0.01)
+            return call_no
+
+        first, second = asyncio.ensure_future(load(1)), asyncio.ensure_future(load(2))
+        await asyncio.sleep(0)
+        cache.invalidate(load, 1)
+        assert await first == 1
+        assert await second == 2
+
+        # Load of 1 started before the invalidation is not stored, the one of 2 is
+        assert await load(2) == 2
+        assert await load(1) == 3
+        assert await load(1) == 3
+        assert not cache._generations
+        assert not cache._loading
+
+        cache.invalidate(load, 1)
+        assert await load(1) == 4
+        assert cache.stats.invalidations == 1
+
+    asyncio.run(run())
+
+
+def test_invalidate_all_drops_loads_of_the_function() -> None:
+    async def run() -> None:
+        cache = AsyncCache(ttl=60, maxsize=10)
+
+        @cache.cache()
+        async def load(x: int) -> int:
+            await asyncio.sleep(0.01)
+            return x
+
+        @cache.cache()
+        async def other(x: int) -> int:
+            return x
+
+        await other(1)
+        task = asyncio.ensure_future(load(1))
+        await asyncio.sleep(0)
+        cache.invalidate_all(load)
+        await task
+        assert list(cache._entries) == [
+            (f'{__name__}.{other.__qualname__}', (('x', 1),))
+        ]
+
+        cache.invalidate_all()
+        assert not cache._entries
+
+    asyncio.run(run())
+
+
+def test_none_is_not_cached_unless_asked() -> None:
+    async def run() -> None:
+        cache = AsyncCache(ttl=60, maxsize=10)
+        rows: dict[int, str] = {}
+
+        @cache.cache(cache_none=False)
+        async def load(x: int) -> str | None:
+            return rows.get(x)
+
+        assert await load(1) is None
+        rows[1] = 'a'
+        assert await load(1) == 'a'
+
+        @cache.cache()
+        async def load_cached(x: int) -> str | None:
+            return rows.get(x)
+
+        assert await load_cached(2) is None
+        rows[2] = 'b'
+        assert await load_cached(2) is None
+
+    asyncio.run(run())
+
+
+def test_least_recently_used_entries_are_evicted() -> None:
+    async def run() -> None:
+        cache = AsyncCache(ttl=60, maxsize=2)
+
+        @cache.cache()
+        async def load(x: int) -> int:
+            return x
+
+        await load(1)
+        await load(2)
+        await load(1)
+        await load(3)
+        assert [key[1] for key in cache._entries] == [(('x', 1),), (('x', 3),)]  # type: ignore
+        assert cache.stats.evictions == 1
+
+    asyncio.run(run())
@@ -0,0 +1,141 @@
+import asyncio
+import multiprocessing
+from uuid import uuid4
+
+import pytest
+
+import src.game.game as game_module
+import src.game.shards as shards_module
+import src.schemas.domain as d
+from src.game.game import LocalGames, create_game
+from src.game.shards import ShardPool
+
+RULES = d.DeathmatchRules(round_time=10, start_score=3, penalty=-1, reward=1)
+
+
+class RecordingOutput:
+    def __init__(self) -> None:
+        self.frames: list[str] = []
+        self.failed = asyncio.Event()
+        self.reason: str | None = None
+
+    async def send_state(self, frame: str) -> None:
+        self.frames.append(frame)
+
+    async def send_events(self, events: list[d.GameEvent]) -> None:
+        pass
+
+    async def finish(self, turn_rows: list[dict]) -> None:
+        pass
+
+    async def fail(self, reason: str) -> None:
+        self.reason = reason
+        self.failed.set()
+
+
+def create_participants() -> list[d.GameParticipant]:
+    return [d.GameParticipant(id_=uuid4(), name=name) for name in ('a', 'b')]
+
+
+def test_crashed_local_game_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def crash(*args: object) -> None:
+        raise RuntimeError('crash')
+
+    monkeypatch.setattr(game_module, 'run_game', crash)
+
+    async def run() -> None:
+        games, output = LocalGames(), RecordingOutput()
+        games.start(create_game(1, 2, RULES, create_participants()), output)
+        await asyncio.wait_for(output.failed.wait(), 1)
+        assert 'crash' in str(output.reason)
+        assert not games.games
+
+    asyncio.run(run())
+
+
+async def wait_for_frames(output: RecordingOutput) -> None:
+    for _ in range(100):  # Worker process takes a while to spawn
+        if output.frames:
+            return
+        await asyncio.sleep(0.1)
+    raise AssertionError('Game sent no states')
+
+
+def test_crashed_worker_is_respawned(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(shards_module, 'RESPAWN_DELAY', 0.5)
+
+    async def run() -> None:
+        shards, output = ShardPool(2), RecordingOutput()
+        shards.start()
+        try:
+            shards.start_game(1, 2, RULES, create_participants(), output)
+            await wait_for_frames(output)  # Game runs on the worker, states are relayed
+            crashed_process = shards._shards[0].process
+            crashed_process.kill()
+
+            await asyncio.wait_for(output.failed.wait(), 10)
+            assert 'exited' in str(output.reason)
+            assert not shards._channels
+
+            # Games of the room go to the other worker, until the crashed one is back
+            rerouted_output = RecordingOutput()
+            shards.start_game(3, 2, RULES, create_participants(), rerouted_output)
+            assert shards._game_shards[3] is shards._shards[1]
+            await wait_for_frames(rerouted_output)
+
+            await asyncio.sleep(0.6)
+            respawned_output = RecordingOutput()
+            shards.start_game(4, 4, RULES, create_participants(), respawned_output)
+            assert shards._shards[0].process is not crashed_process
+            assert shards._game_shards[4] is shards._shards[0]
+            await wait_for_frames(respawned_output)
+        finally:
+            await asyncio.wait_for(shards.stop(), 10)
+
+    asyncio.run(run())
+
+
+def test_games_fail_without_live_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(shards_module, 'RESPAWN_DELAY', 60)
+
+    async def run() -> None:
+        shards = ShardPool(1)
+        shards.start()
+        try:
+            shards._shards[0].process.kill()
+            for _ in range(100):
+                if not shards._shards[0].alive:
+                    break
+                await asyncio.sleep(0.1)
+
+            output = RecordingOutput()
+            shards.start_game(1, 2, RULES, create_participants(), output)
+            await asyncio.wait_for(output.failed.wait(), 1)
+            assert output.reason == 'No game worker is running'
+        finally:
+            await asyncio.wait_for(shards.stop(), 10)
+        assert not shards._respawns
+
+    asyncio.run(run())
+
+
+def test_worker_output_waits_for_pipe_off_the_loop() -> None:
+    async def run() -> None:
+        conn, reader_conn = multiprocessing.Pipe()
+        writer = shards_module._PipeWriter(conn, 'test')
+        output = shards_module.ShardOutput(writer, 1)
+        try:
+            # Way more than the pipe holds, the send blocks until the frame is read
+            task = asyncio.ensure_future(output.send_state('x' * 10_000_000))
+            await asyncio.sleep(0.1)  # Loop keeps running meanwhile
+            assert not task.done()
+
+            message = await asyncio.to_thread(reader_conn.recv)
+            await asyncio.wait_for(task, 1)
+            assert message[:2] == (shards_module.STATE, 1)
+        finally:
+            writer.close()
+            conn.close()
+            reader_conn.close()
+
+    asyncio.run(run())
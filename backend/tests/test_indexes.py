@@ -0,0 +1,102 @@
+import asyncio
+import os
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import src.helpers
+import src.schemas.database as db
+from src.backplane import LocalHub
+from src.commands import mark_legacy_failed_games, select_ended_games_stats
+from tests.conftest import create_node
+
+# Postgres database the query plans are checked against, tables are created in a schema
+# of their own, dropped along with them once the test ends
+TEST_DATABASE_URI = os.environ.get('TEST_DATABASE_URI')
+requires_postgres = pytest.mark.skipif(
+    not TEST_DATABASE_URI, reason='TEST_DATABASE_URI is not set'
+)
+
+
+def compile_sql(statement: Any) -> str:
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}
+        )
+    )
+
+
+async def explain(statement: Any) -> str:
+    """
+    Get the plan of the statement on empty tables. Scans of whole tables and joins not
+    driven by an index are priced out, so the plan uses any index the query can use.
+    """
+    schema = f'test_indexes_{uuid4().hex}'
+    engine = create_async_engine(TEST_DATABASE_URI)  # type: ignore[arg-type]
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text(f'CREATE SCHEMA {schema}'))
+            await conn.execute(text(f'SET LOCAL search_path TO {schema}'))
+            await conn.run_sync(db.Base.metadata.create_all)
+            for setting in ('enable_seqscan', 'enable_hashjoin', 'enable_mergejoin'):
+                await conn.execute(text(f'SET LOCAL {setting} = off'))
+            rows = await conn.execute(text(f'EXPLAIN {compile_sql(statement)}'))
+            plan = '\n'.join(row[0] for row in rows)
+            await conn.rollback()  # Drops the schema
+    finally:
+        await engine.dispose()
+    return plan
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.statements: list[Any] = []
+
+    async def scalars(self, statement: Any) -> list[db.Room]:
+        self.statements.append(statement)
+        return []
+
+    async def commit(self) -> None:
+        pass
+
+
+def capture_room_expiry_query(monkeypatch: pytest.MonkeyPatch) -> Any:
+    session = FakeSession()
+
+    @asynccontextmanager
+    async def init_db_session() -> AsyncGenerator[FakeSession, None]:
+        yield session
+
+    monkeypatch.setattr(src.helpers, 'init_db_session', init_db_session)
+    conn_manager, _, _ = create_node(LocalHub())
+    asyncio.run(src.helpers.expire_inactive_rooms(conn_manager))
+    [statement] = session.statements
+    return statement
+
+
+def test_room_expiry_query_matches_partial_index(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    statement = capture_room_expiry_query(monkeypatch)
+    # The planner only uses the partial index if the query implies its predicate
+    assert 'rooms.ended_on IS NULL' in compile_sql(statement.whereclause)
+
+
+@requires_postgres
+def test_room_expiry_query_uses_partial_index(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    statement = capture_room_expiry_query(monkeypatch)
+    assert 'ix_rooms_id_not_ended' in asyncio.run(explain(statement))
+
+
+@requires_postgres
+def test_stats_backfill_queries_use_turns_game_id_index() -> None:
+    assert 'ix_turns_game_id' in asyncio.run(explain(mark_legacy_failed_games()))
+    assert 'ix_turns_game_id' in asyncio.run(explain(select_ended_games_stats()))
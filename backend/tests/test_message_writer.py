@@ -0,0 +1,165 @@
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+import src.schemas.domain as d
+from src.message_writer import MessageWriter
+
+AUTHOR = d.Player(id_=uuid4(), name='a', created_on=None, room=None)  # type: ignore
+
+
+class FakeIdAllocator:
+    def __init__(self) -> None:
+        self.last_id = 0
+
+    async def next_id(self, model: Any) -> int:
+        self.last_id += 1
+        return self.last_id
+
+
+class FakeMessageWriter(MessageWriter):
+    def __init__(self, spill_path: Path, max_queued: int = 1000) -> None:
+        super().__init__(
+            batch_size=3,
+            flush_interval=0.01,
+            max_queued=max_queued,
+            max_retry_delay=0.05,
+            spill_path=spill_path,
+            id_allocator=FakeIdAllocator(),  # type: ignore
+        )
+        self.written: list[int] = []
+        self.written_rows: list[dict[str, Any]] = []
+        self.outages = 0  # Inserts failing before the database is back
+        self.invalid_ids: set[int] = set()
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        if self.outages:
+            self.outages -= 1
+            raise OperationalError('INSERT', {}, ConnectionError('down'))
+        if any(row['id_'] in self.invalid_ids for row in rows):
+            raise IntegrityError('INSERT', {}, ValueError('invalid'))
+        self.written += [row['id_'] for row in rows]
+        self.written_rows += rows
+
+
+async def write(writer: MessageWriter, count: int) -> None:
+    for _ in range(count):
+        await writer.write('hi', 1, AUTHOR)
+
+
+def test_messages_survive_database_outage(tmp_path: Path) -> None:
+    async def run() -> None:
+        writer = FakeMessageWriter(tmp_path / 'spill.jsonl')
+        writer.outages = 10  # Longer than any fixed number of attempts
+        writer.start()
+        await write(writer, 7)
+        for _ in range(200):
+            if len(writer.written) == 7:
+                break
+            await asyncio.sleep(0.01)
+        await writer.stop()
+
+        assert sorted(writer.written) == list(range(1, 8))
+        assert writer.stats.messages_dropped == 0
+        assert writer.stats.batches_failed == 10
+
+    asyncio.run(run())
+
+
+def test_invalid_rows_are_dropped_alone(tmp_path: Path) -> None:
+    async def run() -> None:
+        writer = FakeMessageWriter(tmp_path / 'spill.jsonl')
+        writer.invalid_ids = {2}
+        await write(writer, 3)
+        await writer.flush()
+
+        assert writer.written == [1, 3]
+        assert writer.stats.messages_dropped == 1
+
+    asyncio.run(run())
+
+
+def test_oldest_messages_are_spilled_past_queue_size(tmp_path: Path) -> None:
+    async def run() -> None:
+        writer = FakeMessageWriter(tmp_path / 'spill.jsonl', max_queued=4)
+        writer.outages = 1
+        await write(writer, 3)
+        await writer.flush()  # Fails, the batch is kept for a retry
+        await write(writer, 3)
+        assert writer.depth == 3
+        assert writer.stats.messages_spilled == 3
+
+        await writer.flush()  # Database is back, the spilled ones wait for the next
+        assert writer.written == [4, 5, 6]
+        await writer.flush()
+        assert writer.written == [4, 5, 6, 1, 2, 3]
+        assert writer.stats.messages_replayed == 3
+        assert writer.stats.messages_dropped == 0
+        assert not list(tmp_path.iterdir())
+
+    asyncio.run(run())
+
+
+def test_unwritten_messages_are_spilled_on_stop_and_replayed_on_start(
+    tmp_path: Path,
+) -> None:
+    async def run() -> None:
+        writer = FakeMessageWriter(tmp_path / 'spill.jsonl')
+        writer.outages = 1000
+        writer.start()
+        await write(writer, 5)
+        await writer.stop()
+        assert writer.depth == 0
+        assert writer.stats.messages_spilled == 5
+        assert writer.stats.messages_dropped == 0
+
+        restarted = FakeMessageWriter(tmp_path / 'spill.jsonl')
+        restarted.start()
+        for _ in range(100):
+            if len(restarted.written) == 5:
+                break
+            await asyncio.sleep(0.01)
+        await restarted.stop()
+
+        assert sorted(restarted.written) == list(range(1, 6))
+        row = restarted.written_rows[0]
+        assert isinstance(row['created_on'], datetime)
+        assert row['player_id'] == AUTHOR.id_
+        assert not list(tmp_path.iterdir())
+
+    asyncio.run(run())
+
+
+def test_partially_spilled_message_is_skipped(tmp_path: Path) -> None:
+    async def run() -> None:
+        spill_path = tmp_path / 'spill.jsonl'
+        writer = FakeMessageWriter(spill_path)
+        writer.outages = 1000
+        await write(writer, 1)
+        await writer.stop()
+        with spill_path.open('a') as file:
+            file.write('{"id_":2,"created_on":')  # Killed while spilling
+
+        restarted = FakeMessageWriter(spill_path)
+        await restarted.flush()
+        assert restarted.written == [1]
+
+    asyncio.run(run())
+
+
+def test_messages_are_dropped_if_they_cannot_be_spilled(tmp_path: Path) -> None:
+    async def run() -> None:
+        (tmp_path / 'file').touch()
+        writer = FakeMessageWriter(tmp_path / 'file' / 'spill.jsonl')
+        writer.outages = 1000
+        await write(writer, 5)
+        await writer.stop()
+
+        assert writer.depth == 0
+        assert writer.stats.messages_dropped == 5
+
+    asyncio.run(run())
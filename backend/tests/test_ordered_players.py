@@ -0,0 +1,166 @@
+import random
+from collections.abc import Callable
+from uuid import uuid4
+
+import pytest
+
+import src.schemas.domain as d
+from src.game.deathmatch import OrderedPlayers
+
+
+def create_players(monkeypatch: pytest.MonkeyPatch, names: str) -> OrderedPlayers:
+    monkeypatch.setattr(random, 'shuffle', lambda players: None)  # Keep the order
+    return OrderedPlayers(
+        [d.GamePlayer(id_=uuid4(), name=name, score=0) for name in names]
+    )
+
+
+def visit(players: OrderedPlayers, steps: int) -> str:
+    names = []
+    for _ in range(steps):
+        players.next()
+        names.append(players.current.name)
+    return ''.join(names)
+
+
+def test_next_wraps_around(monkeypatch: pytest.MonkeyPatch) -> None:
+    players = create_players(monkeypatch, 'abcd')
+    assert players.current.name == 'a'
+    assert visit(players, 5) == 'bcdab'
+
+
+def test_next_skips_eliminated_players(monkeypatch: pytest.MonkeyPatch) -> None:
+    players = create_players(monkeypatch, 'abcd')
+    players.next()
+    players.remove_current()  # b
+    assert visit(players, 2) == 'cd'
+    players.remove_current()  # d, the last one in the list
+    assert visit(players, 4) == 'acac'
+
+    assert players.players_in_game == 2
+    assert [player.name for player in players] == list('abcd')  # List is kept
+    assert [(player.in_game, player.place) for player in players] == [
+        (True, None),
+        (False, 4),
+        (True, None),
+        (False, 3),
+    ]
+
+
+def test_next_after_eliminating_first_player(monkeypatch: pytest.MonkeyPatch) -> None:
+    players = create_players(monkeypatch, 'abc')
+    players.remove_current()  # a
+    assert visit(players, 3) == 'bcb'
+
+
+def test_next_fails_with_one_player_left(monkeypatch: pytest.MonkeyPatch) -> None:
+    players = create_players(monkeypatch, 'ab')
+    players.remove_current()
+    assert players.players_in_game == 1
+    assert visit(players, 1) == 'b'
+    with pytest.raises(ValueError, match='All but one'):
+        players.next()
+
+
+def test_single_player(monkeypatch: pytest.MonkeyPatch) -> None:
+    players = create_players(monkeypatch, 'a')
+    assert visit(players, 2) == 'aa'
+    players.remove_current()
+    with pytest.raises(ValueError, match='All players are out'):
+        players.next()
+
+
+def test_matches_linear_scan(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = random.Random(0)
+    for _ in range(200):
+        size = rng.randint(2, 8)
+        players = create_players(monkeypatch, 'abcdefgh'[:size])
+        idx = 0
+        while players.players_in_game > 1:
+            if rng.random() < 0.3:
+                players.remove_current()
+            else:
+                players.next()
+                idx = (idx + 1) % size
+                while not players[idx].in_game:  # Scan, as the ring replaced
+                    idx = (idx + 1) % size
+                assert players.current_idx == idx
+            if not players.current.in_game:
+                players.next()
+                idx = (idx + 1) % size
+                while not players[idx].in_game:
+                    idx = (idx + 1) % size
+                assert players.current_idx == idx
+
+        assert sorted(player.place or 1 for player in players) == list(
+            range(1, size + 1)
+        )
+
+
+class ListPlayers(list):
+    """OrderedPlayers as it was before the ring, scanning the list for the next one."""
+
+    def __init__(self, players: list[d.GamePlayer]) -> None:
+        super().__init__(players)
+        self.current_idx = 0
+        self.current_place = len(self)
+
+    @property
+    def current(self) -> d.GamePlayer:
+        return self[self.current_idx]
+
+    def next(self) -> None:
+        start_idx = self.current_idx
+        while True:
+            self.current_idx = (self.current_idx + 1) % len(self)
+            if len(self) != 1 and self.current_idx == start_idx:
+                raise ValueError('All but one player are out of the game')
+            if self.current.in_game:
+                break
+            if all(not player.in_game for player in self):
+                raise ValueError('All players are out of the game')
+
+    def remove_current(self) -> None:
+        self.current.in_game = False
+        self.current.place = self.current_place
+        self.current_place -= 1
+
+
+def outcome(action: Callable[[], None]) -> str | None:
+    try:
+        action()
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def test_matches_list_implementation(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = random.Random(0)
+    for _ in range(500):
+        names = 'abcdefghij'[: rng.randint(1, 10)]
+        players = create_players(monkeypatch, names)
+        reference = ListPlayers(
+            [
+                d.GamePlayer(id_=player.id_, name=player.name, score=0)
+                for player in players
+            ]
+        )
+        # Played the way Deathmatch plays it, until it's finished
+        finished_at = 0 if len(names) == 1 else 1
+        for _ in range(rng.randint(0, 40)):
+            if players.players_in_game == finished_at:
+                break
+            if rng.random() < 0.3:
+                players.remove_current()
+                reference.remove_current()
+            if not reference.current.in_game or rng.random() < 0.7:
+                assert outcome(players.next) == outcome(reference.next)
+            assert players.current_idx == reference.current_idx
+            assert players.current_place == reference.current_place
+            assert players.players_in_game == sum(
+                player.in_game for player in reference
+            )
+
+        assert [(player.in_game, player.place) for player in players] == [
+            (player.in_game, player.place) for player in reference
+        ]
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import src.schemas.validation as v
+from src.connection_manager import OutboundStats, Outbox, encode_message
+
+
+class FakeWebSocket:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.sent: list[str] = []
+
+    async def send_text(self, text: str) -> None:
+        if self.fail:
+            raise RuntimeError('Connection is closed')
+        self.sent.append(text)
+
+    async def close(self, code: int, reason: str) -> None:
+        pass
+
+
+def lobby_delta(*names: str) -> v.LobbyState:
+    return v.LobbyState(players={name: v.LobbyPlayerOut(name=name) for name in names})
+
+
+def create_outbox(websocket: FakeWebSocket, maxsize: int = 3) -> Outbox:
+    return Outbox(websocket, maxsize, 1, OutboundStats())  # type: ignore
+
+
+def test_coalesced_delta_keeps_its_place() -> None:
+    outbox = create_outbox(FakeWebSocket())
+    outbox.put(encode_message(lobby_delta('a')), lobby_delta('a'))
+    outbox.put('chat')
+    outbox.put(encode_message(lobby_delta('b')), lobby_delta('b'))
+    outbox.put(encode_message(lobby_delta('c')), lobby_delta('c'))  # Overflow
+
+    frames = [frame.text for frame in outbox._frames]
+    assert frames[1] == 'chat'
+    assert len(frames) == 2
+    assert set(json.loads(frames[0])['payload']['players']) == {'a', 'b', 'c'}
+    assert outbox.stats.frames_coalesced == 2
+
+
+def test_overflow_with_nothing_to_merge_evicts() -> None:
+    outbox = create_outbox(FakeWebSocket(), maxsize=1)
+    outbox.put('chat')
+    outbox.put('chat')
+    assert outbox.depth == 0
+    assert outbox.stats.consumers_evicted == 1
+
+
+def test_failed_send_stops_queueing() -> None:
+    async def run() -> None:
+        outbox = create_outbox(FakeWebSocket(fail=True))
+        outbox.start()
+        outbox.put('first')
+        await asyncio.sleep(0.01)
+
+        outbox.put('second')
+        assert outbox.depth == 0
+        await outbox.close()
+
+    asyncio.run(run())
+
+
+def test_frames_are_sent_in_order() -> None:
+    async def run() -> None:
+        websocket = FakeWebSocket()
+        outbox = create_outbox(websocket, maxsize=10)
+        outbox.start()
+        for idx in range(5):
+            outbox.put(str(idx))
+        await asyncio.sleep(0.01)
+        assert websocket.sent == ['0', '1', '2', '3', '4']
+        await outbox.close()
+
+    asyncio.run(run())
@@ -0,0 +1,104 @@
+import copy
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+import src.schemas.domain as d
+from src.player_room_manager import PlayerRoomPool
+
+
+def create_pool() -> PlayerRoomPool:
+    pool = PlayerRoomPool()
+    lobby = copy.copy(d.LOBBY)  # Don't share the players with the other tests
+    lobby.players = {}
+    pool._room_map[lobby.id_] = lobby
+    return pool
+
+
+def create_player(name: str, pool: PlayerRoomPool) -> d.Player:
+    return d.Player(
+        id_=uuid4(),
+        name=name,
+        created_on=datetime.utcnow(),
+        room=pool.get_room(room_id=d.LOBBY.id_),
+    )
+
+
+def create_room(room_id: int, owner: d.Player, capacity: int) -> d.Room:
+    return d.Room(
+        id_=room_id,
+        name=str(room_id),
+        capacity=capacity,
+        created_on=datetime.utcnow(),
+        owner=owner,
+        rules=d.DeathmatchRules(round_time=5, start_score=0, penalty=-5, reward=2),
+    )
+
+
+def test_players_by_name() -> None:
+    pool = create_pool()
+    player = create_player('a', pool)
+    pool.add_player(player, d.LOBBY.id_)
+    assert pool.get_player_by_name('a') is player
+
+    pool.remove_player(player.id_)
+    with pytest.raises(KeyError):
+        pool.get_player_by_name('a')
+
+
+def test_rooms_with_free_seats() -> None:
+    pool = create_pool()
+    owner, other = create_player('a', pool), create_player('b', pool)
+    pool.create_room(create_room(2, owner, capacity=1))
+    free_rooms = pool.get_rooms_with_free_seats()  # Live view
+    assert set(free_rooms) == {2}
+
+    pool.add_player(owner, 2)
+    assert not free_rooms
+    room = pool.get_room(room_id=2)
+    pool.update_room(room, capacity=2)
+    assert set(free_rooms) == {2}
+    pool.add_player(other, 2)
+    assert not free_rooms
+
+    pool.remove_player(other.id_)
+    assert set(free_rooms) == {2}
+    pool.remove_player(owner.id_)
+    pool.remove_room(2)
+    assert not free_rooms
+    assert list(pool.get_rooms()) == []
+
+
+def test_rooms_by_status() -> None:
+    pool = create_pool()
+    owner = create_player('a', pool)
+    pool.create_room(create_room(2, owner, capacity=2))
+    pool.create_room(create_room(3, owner, capacity=2))
+    open_rooms = pool.get_rooms_by_status(d.RoomStatusEnum.OPEN)  # Live view
+    assert {room.id_ for room in open_rooms} == {2, 3}
+    assert pool.open_rooms == 2
+
+    room = pool.get_room(room_id=2)
+    pool.set_room_status(room, d.RoomStatusEnum.IN_PROGRESS)
+    assert room.status == d.RoomStatusEnum.IN_PROGRESS
+    assert [room.id_ for room in open_rooms] == [3]
+    in_progress = pool.get_rooms_by_status(d.RoomStatusEnum.IN_PROGRESS)
+    assert [room.id_ for room in in_progress] == [2]
+
+    # Replicas of other nodes' rooms are updated through `update_room`
+    pool.update_room(room, status=d.RoomStatusEnum.CLOSED, capacity=3)
+    assert not in_progress
+    assert room.capacity == 3
+    closed = pool.get_rooms_by_status(d.RoomStatusEnum.CLOSED)
+    assert [room.id_ for room in closed] == [2]
+
+    pool.remove_room(2)
+    assert not closed
+    assert pool.open_rooms == 1
+
+
+def test_lobby_status_is_not_indexed() -> None:
+    pool = create_pool()
+    pool.set_room_status(pool.get_room(room_id=d.LOBBY.id_), d.RoomStatusEnum.OPEN)
+    assert not pool.get_rooms_by_status(d.RoomStatusEnum.OPEN)
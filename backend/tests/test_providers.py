@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+import src.schemas.domain as d
+from src.game.providers import CircuitBreaker, GuardedProvider
+from src.misc import DictionaryUnavailableError
+
+
+class FakeProvider:
+    name = 'fake'
+
+    def __init__(self) -> None:
+        self.fail = False
+        self.delay = 0.0
+
+    async def lookup(self, word: str) -> d.Word:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise DictionaryUnavailableError('down')
+        return d.Word(content=word, is_correct=True)
+
+
+def create_provider() -> tuple[FakeProvider, GuardedProvider]:
+    provider = FakeProvider()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    return provider, GuardedProvider(provider, breaker, hedge_delay=1, max_attempts=1)
+
+
+def test_failure_opens_and_success_closes_circuit() -> None:
+    async def run() -> None:
+        provider, guarded = create_provider()
+        provider.fail = True
+        with pytest.raises(DictionaryUnavailableError):
+            await guarded.lookup('word')
+        assert guarded.breaker.is_open
+
+        provider.fail = False
+        assert (await guarded.lookup('word')).is_correct
+        assert not guarded.breaker.is_open
+
+    asyncio.run(run())
+
+
+def test_cancelled_trial_releases_circuit() -> None:
+    async def run() -> None:
+        provider, guarded = create_provider()
+        provider.fail = True
+        with pytest.raises(DictionaryUnavailableError):
+            await guarded.lookup('word')
+
+        # Half-open trial cancelled, e.g. by the turn's timer
+        provider.fail, provider.delay = False, 10
+        trial = asyncio.create_task(guarded.lookup('word'))
+        await asyncio.sleep(0)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        assert guarded.breaker.is_open
+
+        provider.delay = 0
+        assert (await guarded.lookup('word')).is_correct
+        assert not guarded.breaker.is_open
+
+    asyncio.run(run())
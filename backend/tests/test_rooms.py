@@ -0,0 +1,171 @@
+import asyncio
+import itertools
+from collections.abc import AsyncGenerator, Iterable
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+import src.helpers
+import src.schemas.database as db
+import src.schemas.domain as d
+import src.schemas.validation as v
+from src.api import rooms
+from src.backplane import LocalHub
+from src.game.game import GameOutput
+from tests.conftest import create_node, create_player, settle
+
+
+class FakeSession:
+    """Records the calls made by the endpoints, fails the chosen one."""
+
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.fail_on = fail_on
+        self.calls: list[str] = []
+        self.statements: list[Any] = []
+
+    async def scalar(self, statement: Any) -> None:
+        return None
+
+    def add(self, instance: Any) -> None:
+        self.calls.append('add')
+
+    async def execute(self, statement: Any) -> None:
+        self.statements.append(statement)
+        self._call('execute')
+
+    async def commit(self) -> None:
+        self._call('commit')
+
+    def _call(self, name: str) -> None:
+        self.calls.append(name)
+        if name == self.fail_on:
+            raise IntegrityError('statement', {}, Exception())
+
+
+class FakeGameManager:
+    def __init__(self, session: FakeSession) -> None:
+        self.session = session
+        self.started: list[int] = []
+
+    def start(
+        self,
+        game_id: int,
+        room_id: int,
+        rules: d.DeathmatchRules,
+        players: Iterable[d.Player],
+        output: GameOutput,
+    ) -> None:
+        assert 'commit' in self.session.calls
+        self.started.append(game_id)
+
+
+@pytest.fixture(autouse=True)
+def _fake_ids(monkeypatch: pytest.MonkeyPatch) -> None:
+    ids = itertools.count(1)
+
+    async def next_id(model: Any) -> int:
+        return next(ids)
+
+    monkeypatch.setattr(rooms.id_allocator, 'next_id', next_id)
+
+
+def test_room_failing_to_persist_is_not_published() -> None:
+    async def run() -> None:
+        conn_manager, _, lobby = create_node(LocalHub())
+        player = create_player('a', lobby)
+        conn_manager.connect(player, d.LOBBY.id_)
+        room_in = v.RoomIn(name='room', rules=v.DeathmatchRules())
+
+        with pytest.raises(HTTPException) as exc_info:
+            await rooms.create_room(
+                room_in, player, FakeSession(fail_on='commit'), conn_manager
+            )  # type: ignore
+        assert exc_info.value.status_code == 409
+        assert not conn_manager.pool.get_rooms()
+
+        room_out = await rooms.create_room(room_in, player, FakeSession(), conn_manager)  # type: ignore
+        assert conn_manager.pool.get_room(room_id=room_out.id_).name == 'room'
+
+    asyncio.run(run())
+
+
+def test_game_is_persisted_before_it_starts() -> None:
+    async def run() -> None:
+        conn_manager, _, lobby = create_node(LocalHub())
+        player = create_player('a', lobby)
+        conn_manager.connect(player, d.LOBBY.id_)
+        room = d.Room(
+            id_=7,
+            name='room',
+            capacity=5,
+            created_on=datetime.utcnow(),
+            owner=player,
+            rules=d.DeathmatchRules(round_time=5, start_score=0, penalty=-5, reward=2),
+            node_id=conn_manager.backplane.node_id,
+        )
+        conn_manager.create_room(room)
+        conn_manager.move_player(player.id_, d.LOBBY.id_, room.id_)
+
+        session = FakeSession(fail_on='execute')
+        game_manager = FakeGameManager(session)
+        with pytest.raises(IntegrityError):
+            await rooms.start_game(room, player, session, conn_manager, game_manager)  # type: ignore
+        assert room.status == d.RoomStatusEnum.OPEN
+        assert room in conn_manager.pool.get_rooms_by_status(d.RoomStatusEnum.OPEN)
+        assert not game_manager.started
+
+        session = FakeSession()
+        game_manager = FakeGameManager(session)
+        await rooms.start_game(room, player, session, conn_manager, game_manager)  # type: ignore
+        assert room.status == d.RoomStatusEnum.IN_PROGRESS
+        assert not conn_manager.pool.get_rooms_by_status(d.RoomStatusEnum.OPEN)
+        assert session.calls == ['execute', 'execute', 'commit']
+        assert len(game_manager.started) == 1
+
+        with pytest.raises(HTTPException) as exc_info:
+            await rooms.start_game(
+                room, player, FakeSession(), conn_manager, game_manager
+            )  # type: ignore
+        assert exc_info.value.detail == 'Game is already running'
+        await settle()
+
+    asyncio.run(run())
+
+
+def test_failed_game_is_marked_failed(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def run() -> None:
+        session = FakeSession()
+
+        @asynccontextmanager
+        async def init_db_session() -> AsyncGenerator[FakeSession, None]:
+            yield session
+
+        monkeypatch.setattr(src.helpers, 'init_db_session', init_db_session)
+        conn_manager, _, lobby = create_node(LocalHub())
+        player = create_player('a', lobby)
+        conn_manager.connect(player, d.LOBBY.id_)
+        room = d.Room(
+            id_=7,
+            name='room',
+            capacity=5,
+            created_on=datetime.utcnow(),
+            owner=player,
+            rules=d.DeathmatchRules(round_time=5, start_score=0, penalty=-5, reward=2),
+            node_id=conn_manager.backplane.node_id,
+        )
+        conn_manager.create_room(room)
+        conn_manager.pool.set_room_status(room, d.RoomStatusEnum.IN_PROGRESS)
+
+        await src.helpers.RoomGameOutput(3, room, conn_manager).fail('crashed')
+        assert room.status == d.RoomStatusEnum.OPEN
+        # Backfill of the stats counts in the ENDED games only
+        [statement] = session.statements
+        assert statement.table.name == 'games'
+        assert statement.compile().params['status'] == db.GameStatusEnum.FAILED
+        await settle()
+
+    asyncio.run(run())
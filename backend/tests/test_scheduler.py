@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from src.game.scheduler import TimerHandle, TimingWheel
+
+
+def fire_all(
+    wheel: TimingWheel, deadlines: list[int], ticks: int
+) -> dict[int, list[int]]:
+    """Advance the wheel tick by tick, returning ticks on which each timer fired."""
+    fired: dict[int, list[int]] = {deadline: [] for deadline in deadlines}
+    for deadline in deadlines:
+        wheel._insert(
+            TimerHandle(
+                deadline,
+                lambda deadline: fired[deadline].append(wheel._current_tick),
+                (deadline,),
+            )
+        )
+    for _ in range(ticks):
+        wheel._advance()
+    return fired
+
+
+@pytest.mark.parametrize('start_tick', [0, 1, 3, 15, 16, 47, 63, 64, 250])
+def test_timers_fire_on_their_deadline_tick(start_tick: int) -> None:
+    # Small wheels, so the deadlines wrap around all the levels, past the top one too
+    wheel = TimingWheel(tick=1, wheel_size=4, levels=3)
+    wheel._current_tick = start_tick
+    deadlines = list(range(start_tick + 1, start_tick + 300))
+
+    fired = fire_all(wheel, deadlines, 300)
+
+    assert fired == {deadline: [deadline] for deadline in deadlines}
+
+
+def test_cancelled_timers_do_not_fire() -> None:
+    wheel = TimingWheel(tick=1, wheel_size=4, levels=2)
+    fired = []
+    handles = [
+        TimerHandle(deadline, fired.append, (deadline,)) for deadline in (2, 9, 40)
+    ]
+    for handle in handles:
+        wheel._insert(handle)
+    handles[1].cancel()
+    for _ in range(5):
+        wheel._advance()
+    handles[2].cancel()  # Cascaded down meanwhile
+    for _ in range(50):
+        wheel._advance()
+
+    assert fired == [2]
+
+
+def test_sleep_and_wait_for() -> None:
+    async def run() -> None:
+        wheel = TimingWheel(tick=0.001)
+        try:
+            await wheel.sleep(0.01)
+            assert await wheel.wait_for(asyncio.sleep(0, 'done'), 1) == 'done'
+            with pytest.raises(asyncio.TimeoutError):
+                await wheel.wait_for(asyncio.sleep(1), 0.01)
+        finally:
+            await wheel.stop()
+
+    asyncio.run(run())
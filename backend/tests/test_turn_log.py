@@ -0,0 +1,126 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import src.schemas.domain as d
+from src.game.turn_log import TurnLog
+
+DEFINITIONS = [('noun', ['a definition'])]
+
+
+def create_log() -> tuple[TurnLog, list[d.Turn]]:
+    player_ids = [uuid4(), uuid4()]
+    turn_log = TurnLog(player_ids)
+    started_on = turn_log.now()
+    turns = [
+        d.Turn(
+            word=d.Word(content='apple', is_correct=True),
+            started_on=started_on,
+            ended_on=started_on + timedelta(seconds=1.5),
+            player_id=player_ids[0],
+        ),
+        d.Turn(
+            word=d.Word(content='egg', is_correct=False),
+            started_on=started_on + timedelta(seconds=2),
+            ended_on=started_on + timedelta(seconds=2.25),
+            info='Not a word',
+            player_id=player_ids[1],
+        ),
+        d.Turn(
+            started_on=started_on + timedelta(seconds=3),
+            ended_on=started_on + timedelta(seconds=13),
+            info='Turn time exceeded',
+            player_id=player_ids[0],
+        ),
+        d.Turn(
+            word=d.Word(content='apple', is_correct=True, definitions=DEFINITIONS),
+            started_on=started_on + timedelta(seconds=14),
+            player_id=player_ids[1],
+        ),
+    ]
+    for turn in turns:
+        turn_log.append(turn, player_ids.index(turn.player_id))
+    return turn_log, turns
+
+
+def test_append_and_get_word() -> None:
+    turn_log, _ = create_log()
+    assert len(turn_log) == 4
+    assert turn_log.get_word(1) == d.Word(content='egg', is_correct=False)
+    assert turn_log.get_word(2) is None
+    # Definitions of a later turn with the same word are shared with the earlier one
+    assert turn_log.get_word(0) == d.Word(
+        content='apple', is_correct=True, definitions=DEFINITIONS
+    )
+
+
+def test_words_and_infos_are_interned() -> None:
+    turn_log, _ = create_log()
+    assert turn_log._words == ['apple', 'egg']
+    assert list(turn_log._word_idxs) == [0, 1, -1, 0]
+    assert turn_log._infos == ['Not a word', 'Turn time exceeded']
+
+
+def test_last_word_is_the_last_correct_one() -> None:
+    turn_log = TurnLog([uuid4()])
+    started_on = turn_log.now()
+    for content, is_correct in [('apple', True), ('egg', False), (None, None)]:
+        word = (
+            None if content is None else d.Word(content=content, is_correct=is_correct)
+        )
+        turn_log.append(d.Turn(word=word, started_on=started_on, player_id=uuid4()), 0)
+    assert turn_log.last_word == 'apple'
+
+
+def test_set_definitions() -> None:
+    turn_log, _ = create_log()
+    definitions = [('verb', ['another definition'])]
+    turn_log.set_definitions(3, definitions)
+    assert turn_log.get_word(0).definitions == definitions  # type: ignore
+    assert turn_log.get_word(1).definitions is None  # type: ignore
+
+    # Incorrect turns don't get the definitions of their word
+    turn_log.append(
+        d.Turn(
+            word=d.Word(content='apple', is_correct=False),
+            started_on=turn_log.now(),
+            player_id=uuid4(),
+        ),
+        0,
+    )
+    assert turn_log.get_word(4).definitions is None  # type: ignore
+
+
+def test_to_turn_out() -> None:
+    turn_log, turns = create_log()
+    turn_out = turn_log.to_turn_out(1)
+    assert turn_out.word == turns[1].word
+    assert turn_out.started_on == turns[1].started_on
+    assert turn_out.ended_on == turns[1].ended_on
+    assert turn_out.info == 'Not a word'
+    assert turn_out.player_idx == 1
+    assert turn_log.to_turn_out(3).ended_on is None
+
+
+def test_to_db_dicts() -> None:
+    turn_log, turns = create_log()
+    rows = turn_log.to_db_dicts(game_id=7)
+    assert rows == [
+        {
+            'word': None if turn.word is None else turn.word.content,
+            'is_correct': None if turn.word is None else turn.word.is_correct,
+            'started_on': turn.started_on,
+            'ended_on': turn.ended_on,
+            'player_id': turn.player_id,
+            'game_id': 7,
+        }
+        for turn in turns
+    ]
+
+
+def test_datetime_offsets_are_exact_to_microseconds() -> None:
+    turn_log = TurnLog([uuid4()])
+    # Offsets are float seconds, even a long game must round-trip to the microsecond
+    started_on = turn_log.now() + timedelta(days=2, microseconds=123457)
+    turn_log.append(d.Turn(started_on=started_on, player_id=uuid4()), 0)
+    assert turn_log.to_db_dicts(game_id=1)[0]['started_on'] == started_on
+    assert turn_log.now() >= turn_log._started_on
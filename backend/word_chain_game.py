@@ -9,9 +9,24 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from config import LOGGING_CONFIG, get_config
 from src.api import main, rooms
-from src.database import create_root_objects, recreate_database
-from src.dependencies import get_connection_manager
-from src.helpers import expire_inactive_rooms, schedule_recurring_task, tags_metadata
+from src.backplane import backplane
+from src.database import (
+    create_missing_tables,
+    create_root_objects,
+    recreate_database,
+)
+from src.dependencies import get_connection_manager, get_game_manager
+from src.game.dictionary import get_dictionary
+from src.game.providers import close_dictionary_client
+from src.game.scheduler import scheduler
+from src.helpers import (
+    expire_inactive_rooms,
+    log_runtime_stats,
+    schedule_recurring_task,
+    subscribe_to_game_messages,
+    tags_metadata,
+)
+from src.message_writer import message_writer
 from src.misc import request_validation_handler
 
 
@@ -20,6 +35,16 @@ async def lifespan(app: FastAPI):
     if get_config().ENVIRONMENT == 'development':
         await recreate_database()
         await create_root_objects()
+    else:
+        await create_missing_tables()
+
+    get_dictionary()  # Map the local word index upfront, failing fast if it's invalid
+    get_game_manager().start_workers()
+
+    message_writer.start()
+    await backplane.start()
+    subscribe_to_game_messages(get_connection_manager(), get_game_manager())
+    get_connection_manager().request_sync()
 
     # Schedule recurring tasks
     started_on = datetime.utcnow().replace(second=0, microsecond=0)
@@ -29,8 +54,20 @@ async def lifespan(app: FastAPI):
         coro_func=expire_inactive_rooms,
         kwargs={'conn_manager': get_connection_manager()},
     )
+    schedule_recurring_task(
+        started_on,
+        interval=get_config().RUNTIME_STATS_INTERVAL,
+        coro_func=log_runtime_stats,
+        kwargs={'conn_manager': get_connection_manager()},
+    )
     yield
 
+    await backplane.stop()
+    await get_game_manager().stop_workers()
+    await scheduler.stop()
+    await message_writer.stop()  # Writes the messages still queued
+    await close_dictionary_client()
+
 
 def create_app() -> FastAPI:
     Path('./logs').mkdir(exist_ok=True)
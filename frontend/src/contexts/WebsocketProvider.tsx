@@ -1,4 +1,4 @@
-import React, { createContext, useContext, useEffect } from "react";
+import React, { createContext, useContext, useEffect, useRef } from "react";
 import useWebSocket from "react-use-websocket";
 
 import {
@@ -8,6 +8,7 @@ import {
     GameState,
     LobbyState,
     RoomState,
+    StateVersion,
     WebSocketMessage,
     WordInput,
 } from "@/types";
@@ -44,12 +45,51 @@ export function WebSocketProvider({ children }: { children: React.ReactNode }) {
     } = useStore();
     const gameId = _gameId as number;
     const { sendJsonMessage, lastJsonMessage } = useWebSocket(WEBSOCKET_URL, {});
+    // Last applied version of the lobby and room streams, to spot the missed deltas
+    const streamVersions = useRef<Record<string, StateVersion & { resyncing?: boolean }>>({});
+
+    function isInSequence(
+        stream: "lobby" | "room",
+        state: LobbyState | RoomState,
+        roomId?: number
+    ): boolean {
+        if (state.version == null) return true; // Unversioned state, e.g. from a REST response
+
+        const key = stream === "room" ? `room:${roomId}` : stream;
+        const last = streamVersions.current[key];
+        if (
+            state.full_view ||
+            last === undefined ||
+            (state.epoch === last.epoch && state.prev_version === last.version)
+        ) {
+            streamVersions.current[key] = { epoch: state.epoch, version: state.version };
+            return true;
+        }
+
+        // A delta was missed, ask for the missing ones once and drop the rest until they come
+        if (!last.resyncing) {
+            last.resyncing = true;
+            sendJsonMessage({
+                payload: {
+                    type_: "state_resync",
+                    stream: stream,
+                    room_id: roomId ?? null,
+                    epoch: last.epoch,
+                    version: last.version ?? 0,
+                },
+            } as WebSocketMessage);
+        }
+        return false;
+    }
 
     useEffect(
         function parseMessage() {
             if (lastJsonMessage === null) return;
 
-            const websocketMessage = JSON.parse(lastJsonMessage as string) as WebSocketMessage;
+            // Double encoded messages are still parsed, for servers running in compatibility mode
+            const websocketMessage = (
+                typeof lastJsonMessage === "string" ? JSON.parse(lastJsonMessage) : lastJsonMessage
+            ) as WebSocketMessage;
             switch (websocketMessage.payload.type_) {
                 case "action":
                     executeAction(websocketMessage.payload as Action);
@@ -60,11 +100,15 @@ export function WebSocketProvider({ children }: { children: React.ReactNode }) {
                     console.log("chat", websocketMessage.payload);
                     break;
                 case "lobby_state":
-                    updateLobbyState(websocketMessage.payload as LobbyState);
+                    const lobbyState = websocketMessage.payload as LobbyState;
+                    if (isInSequence("lobby", lobbyState)) updateLobbyState(lobbyState);
                     console.log("lobby", websocketMessage.payload);
                     break;
                 case "room_state":
-                    updateRoomState(websocketMessage.payload as RoomState);
+                    const newRoomState = websocketMessage.payload as RoomState;
+                    if (isInSequence("room", newRoomState, newRoomState.id)) {
+                        updateRoomState(newRoomState);
+                    }
                     console.log("room", websocketMessage.payload);
                     break;
                 case "game_state":
@@ -76,6 +120,9 @@ export function WebSocketProvider({ children }: { children: React.ReactNode }) {
                     if (connState.code === 4001) {
                         // TODO: Show toast saying that the player can only use one client at a time
                         logOut();
+                    } else if (connState.code === 4002) {
+                        // TODO: Show toast asking the player to slow down
+                        console.warn("rate limited", connState.reason, connState.retry_after);
                     }
                     console.log("connection", websocketMessage.payload);
                     break;
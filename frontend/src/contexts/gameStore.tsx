@@ -29,7 +29,10 @@ export default function GameStoreSlice(switchMode: (mode: "lobby" | "room" | "ga
     const [gameTurns, setGameTurns] = useState<Turn[] | undefined>(undefined);
 
     function updateGameState(newGameState: GameState) {
-        setGameState(newGameState.state);
+        // Word definitions arrive after the turn has ended and do not change the game phase
+        if (newGameState.state !== "DEFINED_WORD") {
+            setGameState(newGameState.state);
+        }
 
         switch (newGameState.state) {
             case "STARTED":
@@ -58,6 +61,12 @@ export default function GameStoreSlice(switchMode: (mode: "lobby" | "room" | "ga
                     newGameState.current_turn,
                 ]);
                 break;
+            case "DEFINED_WORD":
+                const { turn_idx: turnIdx, word } = newGameState;
+                setGameTurns((prevGameTurns) =>
+                    prevGameTurns?.map((turn, idx) => (idx === turnIdx ? { ...turn, word } : turn))
+                );
+                break;
             default:
                 console.log("Unknown game state", newGameState);
         }
@@ -160,10 +160,14 @@ export default function StoreProvider({ children }: { children: React.ReactNode
                 return {
                     ...prevLobbyState,
                     ...newLobbyState,
-                    rooms: newLobbyState.rooms
+                    rooms: newLobbyState.full_view
+                        ? _runDifferentialUpdate({}, newLobbyState.rooms ?? {})
+                        : newLobbyState.rooms
                         ? _runDifferentialUpdate(prevLobbyState.rooms, newLobbyState.rooms)
                         : prevLobbyState.rooms,
-                    players: newLobbyState.players
+                    players: newLobbyState.full_view
+                        ? _runDifferentialUpdate({}, newLobbyState.players ?? {})
+                        : newLobbyState.players
                         ? _runDifferentialUpdate(prevLobbyState.players, newLobbyState.players)
                         : prevLobbyState.players,
                     stats: newLobbyState.stats
@@ -186,7 +190,9 @@ export default function StoreProvider({ children }: { children: React.ReactNode
                 return {
                     ...prevRoomState,
                     ...newRoomState,
-                    players: newRoomState.players
+                    players: newRoomState.full_view
+                        ? _runDifferentialUpdate({}, newRoomState.players ?? {})
+                        : newRoomState.players
                         ? _runDifferentialUpdate(prevRoomState.players, newRoomState.players)
                         : prevRoomState.players,
                 };
@@ -58,6 +58,11 @@ export function Statistics() {
             value: lobbyState?.stats.active_rooms,
             tooltip: "Number of rooms currently active",
         },
+        {
+            symbol: "door_open",
+            value: lobbyState?.stats.open_rooms,
+            tooltip: "Number of rooms open to join",
+        },
         {
             symbol: "link",
             value: allTimeStatistics?.longest_chain,
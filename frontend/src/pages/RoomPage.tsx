@@ -735,7 +735,7 @@ function WordElement({ gameTurn, textStyle = {} }: { gameTurn: Turn; textStyle?:
                 <tbody>
                     <tbody>
                         {gameTurn.word?.is_correct ? (
-                            gameTurn.word?.definitions!.map((definition, index) => (
+                            (gameTurn.word?.definitions ?? []).map((definition, index) => (
                                 <tr key={index} className="">
                                     <td className="pe-2 pt-2 align-top">
                                         <h6>
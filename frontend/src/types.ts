@@ -8,6 +8,7 @@ export type RoomOut = {
     status: "Open" | "Closed" | "In progress";
     rules: DeathmatchRules;
     owner_name: string;
+    created_on: string;
 };
 
 export type RoomIn = {
@@ -105,7 +106,19 @@ type EndTurnState = {
     current_turn: Turn;
 };
 
-export type GameState = StartGameState | EndGameState | WaitState | StartTurnState | EndTurnState;
+type DefinedWordState = {
+    state: "DEFINED_WORD";
+    turn_idx: number;
+    word: Word;
+};
+
+export type GameState =
+    | StartGameState
+    | EndGameState
+    | WaitState
+    | StartTurnState
+    | EndTurnState
+    | DefinedWordState;
 
 export type WordInput = {
     input_type: "word_input";
@@ -115,10 +128,19 @@ export type WordInput = {
 
 export type GameInput = WordInput;
 
-export type RoomState = Omit<RoomOut, "players_no"> & {
-    players: Record<string, RoomPlayer>;
+// Position of a state delta in the stream of the node which sent it
+export type StateVersion = {
+    epoch?: string | null;
+    version?: number | null;
+    prev_version?: number | null; // version the delta applies on top of
 };
 
+export type RoomState = Omit<RoomOut, "players_no" | "created_on"> &
+    StateVersion & {
+        players: Record<string, RoomPlayer>;
+        full_view?: boolean; // players replace the current ones, instead of updating them
+    };
+
 export type DeathmatchRules = {
     type: "deathmatch";
     round_time: number;
@@ -131,11 +153,29 @@ export type LobbyState = {
     players: Record<string, Player>;
     rooms: Record<number, RoomOut>;
     stats: CurrentStatistics;
+    full_view?: boolean; // rooms and players replace the current ones, instead of updating them
+} & StateVersion;
+
+export type LobbySubscription = {
+    open_only?: boolean;
+    free_seats_only?: boolean;
+    round_time?: number | null;
+    sort?: "newest" | "fullest";
+    offset?: number;
+    limit?: number;
+};
+
+export type StateResync = {
+    stream: "lobby" | "room";
+    room_id?: number | null;
+    epoch?: string | null;
+    version: number;
 };
 
 export type CurrentStatistics = {
     active_players: number;
     active_rooms: number;
+    open_rooms: number;
 };
 
 export type AllTimeStatistics = {
@@ -147,6 +187,7 @@ export type AllTimeStatistics = {
 export type ConnectionState = {
     code: number;
     reason: string;
+    retry_after?: number | null;
 };
 
 export type KickPlayerAction = {
@@ -162,7 +203,9 @@ export type WebSocketMessage =
     | { payload: RoomState & { type_: "room_state" } }
     | { payload: ConnectionState & { type_: "connection_state" } }
     | { payload: GameInput & { type_: "game_input" } }
-    | { payload: Action & { type_: "action" } };
+    | { payload: Action & { type_: "action" } }
+    | { payload: LobbySubscription & { type_: "lobby_subscription" } }
+    | { payload: StateResync & { type_: "state_resync" } };
 
 export type ModalConfigs = {
     roomRules?: RoomRulesModalConfig;